@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+🔁 RoboSoccer Replay Determinism Check
+======================================
+
+Plays seeded matches, records them, and checks that every replay
+reproduces the match exactly:
+- replay_match ends in the recorded final state (verify_replay)
+- ReplayTimeline.seek reaches the same state digest as the original match at
+  checkpoints along the way, seeking forward, backward and from keyframes
+  taken by build_index
+- A replay saved to disk and loaded back still verifies, and a replay of
+  another simulation version is rejected by load_replay
+
+The matches cover bot vs bot and bot vs man (with scripted human input, a
+reset halfway and one after the last step), several ticks per step and a team size large enough for the
+spatial hash broadphase. A check that fails exits with status 1.
+
+Command line:
+- python benchmarks/determinism.py                  every scenario
+- python benchmarks/determinism.py --seed 7         ...other match seeds
+- python benchmarks/determinism.py --ticks 3600     ...longer matches
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+DEFAULT_SEED = 3
+DEFAULT_TICKS = 1800  # 30 seconds of match time
+CHECKPOINTS = 6  # ticks compared against the original match while seeking
+
+# (name, mode, team_size, ticks_per_step, reset after the last step)
+SCENARIOS = (
+    ("2v2 bot vs bot", "bot_vs_bot", 2, 1, False),
+    ("2v2 bot vs bot, 4 ticks/step", "bot_vs_bot", 2, 4, False),
+    ("11v11 bot vs bot, 3 ticks/step", "bot_vs_bot", 11, 3, False),
+    ("16v16 bot vs bot (broadphase)", "bot_vs_bot", 16, 1, False),
+    ("2v2 bot vs man, inputs + reset", "bot_vs_man", 2, 1, False),
+    ("2v2 bot vs man, reset at the end", "bot_vs_man", 2, 1, True),
+)
+
+def play(mode, team_size, ticks_per_step, seed, duration_ticks, final_reset=False):
+    """Play and record a match, return it and the state digest after each of the chosen checkpoint steps"""
+    from headless import Match
+    from physics import CONTROL_KEYS
+    match = Match(mode, seed=seed, team_size=team_size, ticks_per_step=ticks_per_step,
+                  duration_ticks=duration_ticks, record_step_times=False)
+    steps = -(-duration_ticks // ticks_per_step)
+    checkpoints = set(random.Random(seed).sample(range(1, steps), min(CHECKPOINTS, steps - 1)))
+    digests = {}
+
+    # Scripted human input: a new key mask every few steps, and one reset halfway
+    # (with ``final_reset``, one more after the last step)
+    script = random.Random(seed)
+    human = mode != "bot_vs_bot"
+    inputs = 0
+    reset_step = steps // 2 if human else None
+    while not match.finished:
+        if human and match.ticks_played % 23 == 0:
+            inputs = script.getrandbits(len(CONTROL_KEYS))
+        if match.ticks_played == reset_step:
+            match.reset()
+            reset_step = None
+        match.step(inputs)
+        if match.ticks_played in checkpoints:
+            digests[match.ticks_played] = match.state.digest()
+    if final_reset:
+        match.reset()
+    match.close()
+    return match, digests
+
+def check_scenario(mode, team_size, ticks_per_step, final_reset, seed, duration_ticks):
+    """Run every check on one scenario, return the names of those that failed"""
+    import replay as replays
+    match, digests = play(mode, team_size, ticks_per_step, seed, duration_ticks, final_reset)
+    recorded = match.replay()
+    failures = []
+
+    if not replays.verify_replay(recorded, replays.replay_match(recorded)):
+        failures.append("replay_match")
+
+    # Forward to the end, then back and forth over the checkpoints, then from indexed keyframes
+    timeline = replays.ReplayTimeline(recorded)
+    timeline.seek(timeline.ticks)
+    if timeline.state.digest() != recorded["final"]["digest"]:
+        failures.append("seek to the end")
+    for tick in sorted(digests, reverse=True) + sorted(digests):
+        timeline.seek(tick)
+        if timeline.state.digest() != digests[tick]:
+            failures.append(f"seek to {tick}")
+            break
+    indexed = replays.ReplayTimeline(recorded)
+    while not indexed.indexed:
+        indexed.build_index(timeline.keyframe_interval * 4)
+    for tick in sorted(digests, reverse=True):
+        indexed.seek(tick)
+        if indexed.state.digest() != digests[tick]:
+            failures.append(f"indexed seek to {tick}")
+            break
+    indexed.seek(indexed.ticks)
+    if indexed.state.digest() != recorded["final"]["digest"]:
+        failures.append("indexed seek to the end")
+
+    # Through a file and back
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "match.replay.json")
+        replays.save_replay(recorded, path)
+        if not replays.verify_replay(recorded, replays.replay_match(replays.load_replay(path))):
+            failures.append("saved replay")
+        replays.save_replay(dict(recorded, version=recorded["version"] - 1), path)
+        try:
+            replays.load_replay(path)
+            failures.append("older version accepted")
+        except ValueError:
+            pass
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that recorded matches replay and seek bit for bit")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"match seed (default {DEFAULT_SEED})")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS,
+                        help=f"ticks per match (default {DEFAULT_TICKS})")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    print(f"🔁 Replay determinism (seed {args.seed}, {args.ticks} ticks per match)")
+    failed = False
+    for name, mode, team_size, ticks_per_step, final_reset in SCENARIOS:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            failures = check_scenario(mode, team_size, ticks_per_step, final_reset, args.seed, args.ticks)
+        print(f"   {name:<34} {'❌ ' + ', '.join(failures) if failures else '✅'}")
+        failed = failed or bool(failures)
+
+    if failed:
+        sys.exit(1)
+    print("✅ Every replay reproduced its match")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+🏎️ RoboSoccer Hot Path Benchmarks
+=================================
+
+Times the functions the game runs every tick or every frame, one call per sample:
+- Simulation: move_ai (planning at 10 Hz and every tick), handle_ball_collision,
+  advance_ball (1 and 4 ticks), handle_out_of_bounds (ball in play, goal,
+  corner kick, throw-in) and collect_research_data
+- Rendering: draw_field (cached and rebuilt background), draw_players_and_ball
+- The full frame: one simulation tick plus everything the game loop draws and
+  pushes to the display
+
+Game states come from a headless bot_vs_bot match played with a fixed seed, so
+every run times the same inputs. Each benchmark reports operations per second
+(from the mean) and the median and 99th percentile of a single call, from the
+fastest of a few repeated runs to keep noise from other processes out.
+
+Command line:
+- python benchmarks/hotpaths.py                            Run every benchmark
+- python benchmarks/hotpaths.py --filter draw              ...only those whose name contains "draw"
+- python benchmarks/hotpaths.py --team-size 11             ...with 11 players per team
+- python benchmarks/hotpaths.py --save hotpaths.json       ...and store the results as JSON
+- python benchmarks/hotpaths.py --baseline hotpaths.json   Exit with status 1 when slower than a stored run
+
+Runs with SDL_VIDEODRIVER=dummy unless --window is given.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+DEFAULT_SEED = 2024
+DEFAULT_SAMPLES = 2000
+DEFAULT_REPEAT = 3  # runs per benchmark; the fastest is kept, as timeit recommends
+WARMUP_FRACTION = 0.1  # untimed calls before each benchmark, as a share of its samples
+
+def load_game(window=False):
+    """Import the game modules (creating the display) and return them as a namespace"""
+    if not window:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import game_config
+        import graphics
+        import physics
+        import game_rules
+        import data_analysis
+        import headless
+        import renderer
+        import main_game
+    return argparse.Namespace(config=game_config, graphics=graphics, physics=physics, rules=game_rules,
+                              data=data_analysis, headless=headless, renderer=renderer, main=main_game)
+
+def play_states(game, seed, count, team_size=2, every=5):
+    """Snapshots of a seeded bot_vs_bot match, one every ``every`` ticks (replays from the start if needed)"""
+    states = []
+    while len(states) < count:
+        match = game.headless.Match("bot_vs_bot", seed=seed, record_step_times=False, team_size=team_size)
+        while not match.finished and len(states) < count:
+            match.step()
+            if match.frame_count % every == 0:
+                states.append(match.state.snapshot())
+    return states
+
+def out_of_bounds_state(game, base, scenario):
+    """Copy of ``base`` with the ball just over a line: "goal", "corner" or "throw_in" """
+    c = game.config
+    state = base.snapshot()
+    state.set_piece_type = state.set_piece_team = None
+    ball = state.ball
+    if scenario == "goal":
+        ball.x, ball.y = c.FIELD_X + c.BALL_RADIUS - 2, c.FIELD_Y + c.FIELD_HEIGHT // 2
+    elif scenario == "corner":
+        ball.x, ball.y = c.FIELD_X + c.BALL_RADIUS - 2, c.FIELD_Y + 60
+        state.last_touch = "blue"
+    else:
+        ball.x, ball.y = c.WIDTH // 2 + 40, c.FIELD_Y - 2
+        state.last_touch = "red"
+    return state
+
+def time_calls(call, args_list, warmup):
+    """Call ``call(*args)`` for every entry of ``args_list`` after ``warmup`` untimed calls, return seconds per call.
+
+    The garbage collector is paused while timing, as timeit does.
+    """
+    perf_counter = time.perf_counter
+    for args in args_list[:warmup]:
+        call(*args)
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for args in args_list[warmup:]:
+            start = perf_counter()
+            call(*args)
+            samples.append(perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+def summarize(samples):
+    """ops/sec, mean, p50 and p99 (µs) of per-call times"""
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples)
+
+    def percentile(q):
+        return samples[max(0, math.ceil(q / 100 * len(samples)) - 1)]
+
+    return {
+        "samples": len(samples),
+        "ops_per_sec": 1 / mean if mean > 0 else math.inf,
+        "mean_us": mean * 1e6,
+        "p50_us": percentile(50) * 1e6,
+        "p99_us": percentile(99) * 1e6,
+    }
+
+def build_benchmarks(game, seed, samples, team_size=2):
+    """Map benchmark name -> function returning (call, args_list); each args tuple is used once.
+
+    States are copied before timing, so calls that change their state
+    (moving players, restarting play) always start from the same position.
+    """
+    warm = samples + int(samples * WARMUP_FRACTION)
+    physics, rules, graphics = game.physics, game.rules, game.graphics
+    screen = game.config.screen
+    pool = play_states(game, seed, warm, team_size)
+    in_play = [state for state in pool if state.set_piece_type is None]
+
+    def ball_inside(state):
+        """True when the ball touches no line, so handle_out_of_bounds returns "in_play" """
+        c, ball = game.config, state.ball
+        return (c.FIELD_X < ball.x - c.BALL_RADIUS and ball.x + c.BALL_RADIUS < c.FIELD_X + c.FIELD_WIDTH
+                and c.FIELD_Y < ball.y - c.BALL_RADIUS and ball.y + c.BALL_RADIUS < c.FIELD_Y + c.FIELD_HEIGHT)
+
+    def fresh(states):
+        """``warm`` independent copies, cycling through ``states``"""
+        return [states[i % len(states)].snapshot() for i in range(warm)]
+
+    def ai_tick(state, plan_interval=physics.AI_PLAN_INTERVAL):
+        physics.move_ai(state, state.blue_team, is_red=False, plan_interval=plan_interval)
+        physics.move_ai(state, state.red_team, is_red=True, plan_interval=plan_interval)
+
+    def out_of_bounds(scenario=None):
+        def setup():
+            game_stats = game.data.initialize_data_structures()[2]
+            if scenario is None:
+                states = fresh([state for state in in_play if ball_inside(state)])
+            else:
+                states = fresh([out_of_bounds_state(game, state, scenario) for state in in_play[:64]])
+            return rules.handle_out_of_bounds, [(state, game_stats) for state in states]
+        return setup
+
+    def collect():
+        _, movement, game_stats = game.data.initialize_data_structures(team_size)
+        states = fresh(pool)
+        return game.data.collect_research_data, [(state, movement, game_stats) for state in states]
+
+    def field_rebuilt():
+        # A new audience version every call: the background layer is redrawn (as after a goal)
+        state = pool[0]
+        return graphics.draw_field, [(screen, state.audience, -i - 1) for i in range(warm)]
+
+    def full_frame():
+        # Mirrors one gameplay frame of main_game.main at 1x speed
+        match = game.headless.Match("bot_vs_bot", seed=seed, team_size=team_size)
+        renderer = game.renderer.DirtyRectRenderer(screen)
+        time_data = match.time_data
+
+        def frame():
+            game.main.run_simulation(match, 0, 1)
+            state = match.state
+            renderer.begin_frame(graphics.get_background_layer(state.audience, state.audience_version),
+                                 state.audience_version, graphics.AUDIENCE_AREAS)
+            renderer.add_dynamic(graphics.draw_set_piece_indicator(screen, state))
+            renderer.add_dynamic(graphics.draw_players_and_ball(screen, state))
+            renderer.add_dynamic(graphics.draw_hud(screen, state, match.player_movement_data))
+            renderer.add_static(graphics.draw_controls_help(screen, match.mode))
+            renderer.add_dynamic(graphics.draw_time_complexity_graph(screen, time_data, match.mode))
+            renderer.end_frame()
+            if match.finished:
+                match.reset()
+        return frame, [()] * warm
+
+    return {
+        "move_ai": lambda: (ai_tick, [(state,) for state in fresh(pool)]),
+        "move_ai[plan every tick]": lambda: (ai_tick, [(state, 1) for state in fresh(pool)]),
+        "handle_ball_collision": lambda: (physics.handle_ball_collision, [(state,) for state in fresh(in_play)]),
+        "advance_ball": lambda: (physics.advance_ball, [(state,) for state in fresh(in_play)]),
+        "advance_ball[4 ticks]": lambda: (physics.advance_ball, [(state, 4) for state in fresh(in_play)]),
+        "handle_out_of_bounds[in_play]": out_of_bounds(),
+        "handle_out_of_bounds[goal]": out_of_bounds("goal"),
+        "handle_out_of_bounds[corner]": out_of_bounds("corner"),
+        "handle_out_of_bounds[throw_in]": out_of_bounds("throw_in"),
+        "collect_research_data": collect,
+        "draw_field": lambda: (graphics.draw_field, [(screen, pool[0].audience, 0)] * warm),
+        "draw_field[rebuilt]": field_rebuilt,
+        "draw_players_and_ball": lambda: (graphics.draw_players_and_ball, [(screen, state) for state in fresh(pool)]),
+        "full_frame": full_frame,
+    }
+
+def run_benchmark(seed=DEFAULT_SEED, samples=DEFAULT_SAMPLES, repeat=DEFAULT_REPEAT, name_filter=None,
+                  window=False, team_size=2):
+    """Run the selected benchmarks ``repeat`` times each and return the best value of each metric.
+
+    The repeats go round all the benchmarks in turn, so a burst of load from
+    another process slows one run of several benchmarks rather than every run of one.
+    """
+    game = load_game(window)
+    warmup = int(samples * WARMUP_FRACTION)
+    results = {}
+    # The rules print every goal and restart; keep the console (and its cost) out of the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        benchmarks = {name: setup for name, setup in build_benchmarks(game, seed, samples, team_size).items()
+                      if not name_filter or name_filter in name}
+        for _ in range(repeat):
+            for name, setup in benchmarks.items():
+                call, args_list = setup()
+                run = summarize(time_calls(call, args_list, warmup))
+                best = results.setdefault(name, run)
+                best["ops_per_sec"] = max(best["ops_per_sec"], run["ops_per_sec"])
+                for metric in ("mean_us", "p50_us", "p99_us"):
+                    best[metric] = min(best[metric], run[metric])
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "team_size": team_size,
+        "samples": samples,
+        "repeat": repeat,
+        "benchmarks": results,
+    }
+
+def print_results(results):
+    """Print a hot path benchmark result as a table"""
+    team_size = results.get("team_size", 2)
+    print(f"🏎️ Hot path benchmarks, {team_size}v{team_size} ({results['samples']} calls each, "
+          f"best of {results['repeat']} runs, seed {results['seed']}, Python {results['python']})")
+    print(f"   {'benchmark':<32} {'ops/sec':>12} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10}")
+    for name, r in results["benchmarks"].items():
+        print(f"   {name:<32} {r['ops_per_sec']:12,.0f} {r['mean_us']:10.2f} {r['p50_us']:10.2f} {r['p99_us']:10.2f}")
+
+def compare_to_baseline(results, baseline, tolerance, p99_tolerance):
+    """Print the change against a stored run, return the names of regressed benchmarks"""
+    regressions = []
+    for name, r in results["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"   {name:<32} (not in baseline)")
+            continue
+        throughput_change = r["ops_per_sec"] / before["ops_per_sec"] - 1
+        p99_change = r["p99_us"] / before["p99_us"] - 1
+        regressed = throughput_change < -tolerance or p99_change > p99_tolerance
+        print(f"   {name:<32} ops/sec {100 * throughput_change:+6.1f}%   p99 {100 * p99_change:+6.1f}%"
+              f"{'  ❌ REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the RoboSoccer simulation and rendering hot paths")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"match seed for the game states (default {DEFAULT_SEED})")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help=f"timed calls per benchmark (default {DEFAULT_SAMPLES})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs per benchmark, the fastest is kept (default {DEFAULT_REPEAT})")
+    parser.add_argument("--team-size", type=int, default=2, help="players per team (default 2)")
+    parser.add_argument("--filter", metavar="TEXT", help="only run benchmarks whose name contains TEXT")
+    parser.add_argument("--window", action="store_true", help="open a real window instead of the dummy video driver")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed drop in ops/sec against the baseline, as a fraction (default 0.25)")
+    parser.add_argument("--p99-tolerance", type=float, default=0.5,
+                        help="allowed rise in p99 against the baseline, as a fraction (default 0.5)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.seed, args.samples, args.repeat, args.filter, args.window, args.team_size)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"📏 Compared to {args.baseline}:")
+        if compare_to_baseline(results, baseline, args.tolerance, args.p99_tolerance):
+            sys.exit(1)
+        print("✅ No hot path regression")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+⚖️ RoboSoccer Batch/Scalar Parity Check
+=======================================
+
+Plays seeded bot_vs_bot matches with the scalar engine (headless.Match) and
+with BatchMatch, and checks that both engines agree on the outcomes:
+- Goals per match, within a fraction of the scalar average
+- Blue's share of possession, within a few percentage points
+
+Only the random restart kicks differ between the engines, so the averages
+differ by sampling noise alone: each limit is the tolerance plus twice the
+combined standard error of the two averages. A check that fails exits with
+status 1.
+--ticks-per-step plays the scalar matches several ticks per step, to check
+that stepping several ticks at once still plays the same game.
+
+Command line:
+- python benchmarks/parity.py                       200 batched vs 24 scalar 2v2 matches
+- python benchmarks/parity.py --team-size 11        ...11v11
+- python benchmarks/parity.py --ticks-per-step 4    ...scalar matches at 4 ticks per step
+- python benchmarks/parity.py --save parity.json    ...and store the results as JSON
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+DEFAULT_SEED = 0
+DEFAULT_MATCHES = 200
+DEFAULT_SCALAR_MATCHES = 24
+NOISE_ALLOWANCE = 2  # standard errors of the difference added to each tolerance
+
+def summarize(goals, possession):
+    """Mean and standard error of goals per match and of blue's possession share"""
+    return {
+        "matches": len(goals),
+        "goals": statistics.mean(goals),
+        "goals_stderr": statistics.stdev(goals) / len(goals) ** 0.5 if len(goals) > 1 else 0.0,
+        "possession": statistics.mean(possession),
+        "possession_stderr": statistics.stdev(possession) / len(possession) ** 0.5 if len(possession) > 1 else 0.0,
+    }
+
+def possession_share(blue, red):
+    """Blue's share of the possession time (even when nobody touched the ball)"""
+    return blue / (blue + red) if blue + red else 0.5
+
+def play_scalar(team_size, seed, count, ticks_per_step):
+    """Play ``count`` scalar matches with seeds from ``seed`` on, return their summary"""
+    from headless import Match
+    goals, possession = [], []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for match_seed in range(seed, seed + count):
+            match = Match("bot_vs_bot", seed=match_seed, team_size=team_size, record_step_times=False,
+                          ticks_per_step=ticks_per_step)
+            stats = match.run()
+            goals.append(match.state.blue_score + match.state.red_score)
+            possession.append(possession_share(stats["possession_time"]["blue"], stats["possession_time"]["red"]))
+    return summarize(goals, possession)
+
+def play_batched(team_size, seed, count):
+    """Play ``count`` matches in one BatchMatch seeded with ``seed``, return their summary"""
+    from batch_match import BatchMatch
+    results = BatchMatch(count, team_size=team_size, seed=seed).run()
+    possession = [possession_share(int(blue), int(red)) for blue, red in results["possession_time"]]
+    return summarize([int(goals) for goals in results["goals"]], possession)
+
+def run_check(team_size, seed, matches, scalar_matches, ticks_per_step):
+    """Play both engines, return the results"""
+    # Imported here, after the dummy driver is set, and without pygame's greeting
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import headless  # noqa: F401
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "team_size": team_size,
+        "seed": seed,
+        "ticks_per_step": ticks_per_step,
+        "scalar": play_scalar(team_size, seed, scalar_matches, ticks_per_step),
+        "batched": play_batched(team_size, seed, matches),
+    }
+
+def compare(results, goal_tolerance, possession_tolerance):
+    """Print both engines' outcomes side by side, return the names of the checks that failed"""
+    scalar, batched = results["scalar"], results["batched"]
+    print(f"⚖️ Batch/scalar parity ({results['team_size']}v{results['team_size']}, seed {results['seed']}, "
+          f"scalar at {results['ticks_per_step']} tick(s) per step, Python {results['python']})")
+    print(f"   {'metric':<12} {'scalar':>16} {'batched':>16} {'limit':>8}")
+
+    failures = []
+    checks = (("goals", scalar["goals"] * goal_tolerance, "{:.2f}"),
+              ("possession", possession_tolerance, "{:.3f}"))
+    for metric, tolerance, number in checks:
+        difference = abs(batched[metric] - scalar[metric])
+        noise = (scalar[metric + "_stderr"] ** 2 + batched[metric + "_stderr"] ** 2) ** 0.5
+        limit = tolerance + NOISE_ALLOWANCE * noise
+        failed = difference > limit
+        cells = [f"{number.format(r[metric])} ±{number.format(r[metric + '_stderr'])}" for r in (scalar, batched)]
+        print(f"   {metric:<12} {cells[0]:>16} {cells[1]:>16} {number.format(limit):>8}"
+              f"{'  ❌ MISMATCH' if failed else ''}")
+        if failed:
+            failures.append(metric)
+    print(f"   ({scalar['matches']} scalar and {batched['matches']} batched matches, ± standard error)")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that BatchMatch and the scalar engine agree on match outcomes")
+    parser.add_argument("--team-size", type=int, default=2, help="players per team (default 2)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"first scalar match seed and the batch seed (default {DEFAULT_SEED})")
+    parser.add_argument("--matches", type=int, default=DEFAULT_MATCHES,
+                        help=f"batched matches (default {DEFAULT_MATCHES})")
+    parser.add_argument("--scalar-matches", type=int, default=DEFAULT_SCALAR_MATCHES,
+                        help=f"scalar matches (default {DEFAULT_SCALAR_MATCHES})")
+    parser.add_argument("--ticks-per-step", type=int, default=1,
+                        help="ticks per step of the scalar matches (default 1)")
+    parser.add_argument("--goal-tolerance", type=float, default=0.1,
+                        help="allowed difference in goals per match beyond sampling noise, "
+                             "as a fraction of the scalar average (default 0.1)")
+    parser.add_argument("--possession-tolerance", type=float, default=0.05,
+                        help="allowed difference in blue's possession share beyond sampling noise (default 0.05)")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = run_check(args.team_size, args.seed, args.matches, args.scalar_matches, args.ticks_per_step)
+    failures = compare(results, args.goal_tolerance, args.possession_tolerance)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+    if failures:
+        sys.exit(1)
+    print("✅ BatchMatch agrees with the scalar engine")
+
+if __name__ == "__main__":
+    main()
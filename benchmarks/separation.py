@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+🧲 RoboSoccer Player Separation Benchmark
+=========================================
+
+Times the player-player separation solver and reports how many touching
+pairs it resolves per second:
+- Scalar: physics.separate_players on the players of one headless match,
+  as the game and run_tournament.py step them (one call per tick)
+- Batched: the BatchMatch solve, one call per tick for many matches at once
+
+Positions come from seeded bot_vs_bot matches, taken after the AI moved the
+players and before they were pushed apart, so every call resolves the
+contacts of a real tick. The fastest of a few runs is kept.
+
+Command line:
+- python benchmarks/separation.py                          2v2, 11v11 and 50v50
+- python benchmarks/separation.py --team-sizes 11 22       ...other team sizes
+- python benchmarks/separation.py --matches 1000           ...matches per batched call
+- python benchmarks/separation.py --save separation.json   ...and store the results as JSON
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+from hotpaths import time_calls
+
+DEFAULT_SEED = 2024
+DEFAULT_TEAM_SIZES = (2, 11, 50)
+DEFAULT_MATCHES = 256
+DEFAULT_SAMPLES = 500
+DEFAULT_REPEAT = 3
+
+def scalar_ticks(team_size, seed, count):
+    """(state, grid) pairs of a headless match, each as separate_players was about to see it"""
+    import headless
+    ticks = []
+    separate_players = headless.separate_players
+
+    def capture(state, grid=None):
+        if len(ticks) < count:
+            # The grid (large teams only) is rebuilt for the copy, as its players are new objects
+            snapshot = state.snapshot()
+            snapshot_grid = None
+            if grid is not None:
+                snapshot_grid = headless.SpatialHash(grid.cell_size)
+                snapshot_grid.rebuild(snapshot.players, grid.slack)
+            ticks.append((snapshot, snapshot_grid))
+        return separate_players(state, grid)
+
+    headless.separate_players = capture
+    try:
+        while len(ticks) < count:
+            match = headless.Match("bot_vs_bot", seed=seed, record_step_times=False, team_size=team_size)
+            while not match.finished and len(ticks) < count:
+                match.step()
+    finally:
+        headless.separate_players = separate_players
+    return ticks
+
+def batched_ticks(team_size, seed, count, matches, every=10):
+    """(players, ball_pos) arrays of a BatchMatch every ``every`` ticks, as _separate_players was about to see them"""
+    from batch_match import BatchMatch
+    batch = BatchMatch(matches, team_size=team_size, seed=seed)
+    ticks = []
+    separate = batch._separate_players
+
+    def capture():
+        if batch.frame_count % every == every - 1:
+            ticks.append((batch.players.copy(), batch.ball_pos.copy()))
+        return separate()
+
+    batch._separate_players = capture
+    while len(ticks) < count:
+        batch.step()
+    batch._separate_players = separate
+    return batch, ticks
+
+def measure(call, args_list, repeat):
+    """Best seconds per call over ``repeat`` runs, and the pairs resolved by one run"""
+    best = None
+    for _ in range(repeat):
+        # Every run starts from untouched positions
+        fresh = copy.deepcopy(args_list)
+        pairs = sum(call(*args) for args in fresh)
+        fresh = copy.deepcopy(args_list)
+        seconds = sum(time_calls(call, fresh, 0)) / len(fresh)
+        best = seconds if best is None else min(best, seconds)
+    return best, pairs
+
+def run_benchmark(team_sizes=DEFAULT_TEAM_SIZES, seed=DEFAULT_SEED, samples=DEFAULT_SAMPLES,
+                  repeat=DEFAULT_REPEAT, matches=DEFAULT_MATCHES):
+    """Time the scalar and batched solver for every team size, return the results"""
+    import physics
+    results = {}
+    # The rules print every goal and restart
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for team_size in team_sizes:
+            ticks = scalar_ticks(team_size, seed, samples)
+            seconds, pairs = measure(physics.separate_players, ticks, repeat)
+            results[f"scalar[{team_size}v{team_size}]"] = summarize(seconds, pairs, samples, 1)
+
+            batch, ticks = batched_ticks(team_size, seed, max(1, samples // 10), matches)
+
+            def solve(players, ball_pos):
+                batch.players, batch.ball_pos = players, ball_pos
+                return batch._separate_players()
+
+            seconds, pairs = measure(solve, ticks, repeat)
+            results[f"batched[{team_size}v{team_size} x{matches}]"] = summarize(seconds, pairs, len(ticks), matches)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "samples": samples,
+        "repeat": repeat,
+        "benchmarks": results,
+    }
+
+def summarize(seconds, pairs, calls, matches):
+    """Per-call time, pairs resolved per call and per second, and match-ticks per second"""
+    return {
+        "calls": calls,
+        "mean_us": seconds * 1e6,
+        "pairs_per_call": pairs / calls,
+        "pairs_per_sec": pairs / calls / seconds if seconds > 0 else 0.0,
+        "ticks_per_sec": matches / seconds if seconds > 0 else 0.0,
+    }
+
+def print_results(results):
+    """Print a separation benchmark result as a table"""
+    print(f"🧲 Player separation ({results['samples']} ticks, best of {results['repeat']} runs, "
+          f"seed {results['seed']}, Python {results['python']})")
+    print(f"   {'solver':<26} {'mean µs':>10} {'pairs/call':>11} {'pairs/sec':>13} {'match-ticks/sec':>16}")
+    for name, r in results["benchmarks"].items():
+        print(f"   {name:<26} {r['mean_us']:10.1f} {r['pairs_per_call']:11.1f} {r['pairs_per_sec']:13,.0f} "
+              f"{r['ticks_per_sec']:16,.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the player-player separation solver")
+    parser.add_argument("--team-sizes", type=int, nargs="+", default=list(DEFAULT_TEAM_SIZES),
+                        help="players per team to benchmark (default 2 11 50)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"match seed (default {DEFAULT_SEED})")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help=f"ticks timed per scalar benchmark, a tenth of that batched (default {DEFAULT_SAMPLES})")
+    parser.add_argument("--matches", type=int, default=DEFAULT_MATCHES,
+                        help=f"matches per batched call (default {DEFAULT_MATCHES})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs per benchmark, the fastest is kept (default {DEFAULT_REPEAT})")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.team_sizes, args.seed, args.samples, args.repeat, args.matches)
+    print_results(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+if __name__ == "__main__":
+    main()
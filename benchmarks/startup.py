@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+⏱️ RoboSoccer Startup Benchmark
+===============================
+
+Measures how long the game takes to start, each run in a fresh interpreter:
+- Import time of every game module and of the heaviest packages,
+  parsed from the output of `python -X importtime`
+- Time to first frame: from launching the interpreter until the mode
+  selection screen is flipped to the display
+
+Command line:
+- python benchmarks/startup.py                          Print the medians of 5 runs
+- python benchmarks/startup.py --save startup.json      ...and store them as JSON
+- python benchmarks/startup.py --baseline startup.json  Exit with status 1 when slower than a stored run
+
+The game runs with SDL_VIDEODRIVER=dummy unless --window is given.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+GAME_MODULES = sorted(name[:-3] for name in os.listdir(SRC_DIR) if name.endswith(".py"))
+
+# Child process: start the game, report its first frame on screen, then quit
+# through the game's own shutdown path (which also stops the export worker)
+FIRST_FRAME_SCRIPT = """
+import sys
+sys.path.insert(0, {src_dir!r})
+import pygame
+_flip = pygame.display.flip
+def _first_flip():
+    _flip()
+    pygame.display.flip = _flip
+    print("FIRST_FRAME", flush=True)
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+pygame.display.flip = _first_flip
+from main_game import main
+main()
+"""
+FIRST_FRAME_MARKER = "FIRST_FRAME"
+
+def child_env(window=False):
+    """Environment for the measured interpreters"""
+    env = dict(os.environ)
+    if not window:
+        env["SDL_VIDEODRIVER"] = "dummy"
+    return env
+
+def parse_importtime(output):
+    """Map module name -> (self µs, cumulative µs) from `-X importtime` output"""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+def measure_imports(env):
+    """Import main_game (and everything it pulls in) once, return ms per module"""
+    code = f"import sys; sys.path.insert(0, {SRC_DIR!r}); import main_game"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing main_game failed:\n{result.stderr[-2000:]}")
+    return {name: cumulative / 1000 for name, (self_us, cumulative) in parse_importtime(result.stderr).items()}
+
+def measure_first_frame(env, timeout=60):
+    """Seconds from launching the game until its first frame is flipped"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", FIRST_FRAME_SCRIPT.format(src_dir=SRC_DIR)],
+                               env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in process.stdout:
+            if line.strip() == FIRST_FRAME_MARKER:
+                return time.perf_counter() - start
+            if time.perf_counter() - start > timeout:
+                break
+        raise RuntimeError("the game exited or timed out before drawing its first frame")
+    finally:
+        process.stdout.close()
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+def run_benchmark(runs=5, window=False, top=10):
+    """Run the startup measurements ``runs`` times and return the medians"""
+    env = child_env(window)
+    imports = [measure_imports(env) for _ in range(runs)]
+    first_frames = [measure_first_frame(env) for _ in range(runs)]
+
+    def median_ms(name):
+        return statistics.median(run.get(name, 0.0) for run in imports)
+
+    # Heaviest third-party packages, by the time their top-level import took
+    packages = {name for run in imports for name in run if "." not in name and name not in GAME_MODULES}
+    heaviest = sorted(packages, key=median_ms, reverse=True)[:top]
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "first_frame_ms": statistics.median(first_frames) * 1000,
+        "import_ms": median_ms("main_game"),
+        "game_modules_ms": {name: median_ms(name) for name in GAME_MODULES
+                            if any(name in run for run in imports)},
+        "heaviest_packages_ms": {name: median_ms(name) for name in heaviest},
+    }
+
+def print_results(results):
+    """Print a startup benchmark result"""
+    print(f"⏱️ Startup benchmark (median of {results['runs']} runs, Python {results['python']})")
+    print(f"   Time to first frame:  {results['first_frame_ms']:8.1f} ms")
+    print(f"   Import of main_game:  {results['import_ms']:8.1f} ms")
+    print("   Game modules (cumulative import time):")
+    for name, ms in sorted(results["game_modules_ms"].items(), key=lambda item: -item[1]):
+        print(f"     {name:<20} {ms:8.1f} ms")
+    print("   Heaviest packages:")
+    for name, ms in results["heaviest_packages_ms"].items():
+        print(f"     {name:<20} {ms:8.1f} ms")
+
+def compare_to_baseline(results, baseline, tolerance, slack_ms):
+    """Print the change against a stored run, return the names of regressed metrics"""
+    regressions = []
+    for metric in ("first_frame_ms", "import_ms"):
+        before, after = baseline[metric], results[metric]
+        limit = before * (1 + tolerance) + slack_ms
+        regressed = after > limit
+        print(f"   {metric:<16} {before:8.1f} ms -> {after:8.1f} ms "
+              f"({100 * (after - before) / before:+.0f}%){'  ❌ REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(metric)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure RoboSoccer startup time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement (default 5)")
+    parser.add_argument("--top", type=int, default=10, help="number of heaviest packages to list")
+    parser.add_argument("--window", action="store_true", help="open a real window instead of the dummy video driver")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (default 0.25)")
+    parser.add_argument("--slack-ms", type=float, default=20.0,
+                        help="allowed absolute slowdown on top of the tolerance (default 20 ms)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs, args.window, args.top)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"📏 Compared to {args.baseline}:")
+        if compare_to_baseline(results, baseline, args.tolerance, args.slack_ms):
+            sys.exit(1)
+        print("✅ No startup regression")
+
+if __name__ == "__main__":
+    main()
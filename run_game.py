@@ -15,7 +15,17 @@ Game Features:
 Controls:
 - Blue Team: WASD (Player 1), Arrow Keys (Player 2)  
 - Red Team: IJKL (Player 1), YUOP (Player 2)
-- SPACE: Pause, R: Reset, E: Export Reports, ESC: Mode Select
+- SPACE: Pause, R: Reset, E: Export Reports, F: Fast-forward, ESC: Mode Select
+- F3: Frame profiler overlay (time spent in each subsystem)
+
+Command line:
+- python run_game.py --fast-forward   Start with uncapped simulation speed
+- python run_game.py --headless       Simulate one bot_vs_bot match without a window
+- python run_game.py --headless --archive match.match   ...and archive its telemetry
+- python run_game.py --headless --profile                ...and print the time per tick of each subsystem
+- python run_game.py --profile        Start with the frame profiler overlay on
+- python run_game.py --team-size 11   Play 11v11 (also with --headless)
+- python run_game.py --replay FILE.replay.json           Re-simulate a recorded match at full speed
 
 Reports are automatically exported to:
 - reports/ folder - Comparison analysis
@@ -24,12 +34,78 @@ Reports are automatically exported to:
 
 import sys
 import os
+import time
+import argparse
 
 # Add the src directory to Python path so we can import our modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+def run_headless(archive_path=None, profile=False, team_size=2):
+    """Simulate a single bot_vs_bot match without opening a window"""
+    from headless import Match, MATCH_TICKS
+    from profiler import FrameProfiler
+    print(f"🖥️ Running headless {team_size}v{team_size} bot_vs_bot match...")
+    profiler = FrameProfiler(enabled=True, window=MATCH_TICKS) if profile else None
+    match = Match(mode="bot_vs_bot", archive_path=archive_path, profiler=profiler, team_size=team_size)
+    start = time.perf_counter()
+    stats = match.run()
+    elapsed = time.perf_counter() - start
+    print(f"✅ Match finished: Blue {match.state.blue_score} - Red {match.state.red_score}")
+    print(f"   {match.frame_count} ticks ({stats['match_duration']:.0f}s of match time) "
+          f"simulated in {elapsed:.3f}s")
+    print(f"   Possession (frames): Blue {stats['possession_time']['blue']} - Red {stats['possession_time']['red']}")
+    if archive_path:
+        print(f"   Telemetry archived to {archive_path}")
+    if profile:
+        print("⏱️ " + profiler.report(unit="tick"))
+
+def run_replay(replay_path, archive_path=None):
+    """Re-simulate a recorded match headlessly and check it ends in the recorded state"""
+    from replay import load_replay, replay_match, verify_replay
+    try:
+        replay = load_replay(replay_path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"🔁 Replaying {replay['mode']} match (seed {replay['seed']}, {replay['ticks']} ticks)...")
+    start = time.perf_counter()
+    match = replay_match(replay, archive_path=archive_path)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Replay finished: Blue {match.state.blue_score} - Red {match.state.red_score} "
+          f"in {elapsed:.3f}s")
+    if verify_replay(replay, match):
+        print("   State is bit-identical to the recording")
+    else:
+        print("❌ Replay diverged from the recording")
+        sys.exit(1)
+    if archive_path:
+        print(f"   Telemetry archived to {archive_path}")
+
 def main():
     """Launch the RoboSoccer game"""
+    parser = argparse.ArgumentParser(description="RoboSoccer game launcher")
+    parser.add_argument("--fast-forward", action="store_true",
+                        help="start with uncapped simulation speed (press F in game to change)")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate one bot_vs_bot match without a window and print the result")
+    parser.add_argument("--archive", metavar="PATH",
+                        help="with --headless or --replay, record the match telemetry into a binary archive at PATH")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="re-simulate a recorded match (.replay.json) without a window")
+    parser.add_argument("--team-size", type=int, default=2,
+                        help="players per team (default 2; recorded replays keep their own)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each subsystem per frame (per tick with --headless); F3 toggles it in game")
+    args = parser.parse_args()
+
+    if args.replay:
+        run_replay(args.replay, args.archive)
+        return
+
+    if args.headless:
+        run_headless(args.archive, args.profile, args.team_size)
+        return
+
     print("🚀 Starting RoboSoccer...")
     print("📁 Loading modular game components...")
     
@@ -38,7 +114,7 @@ def main():
         from main_game import main as run_game
         print("✅ All modules loaded successfully!")
         print("🎮 Launching game window...")
-        run_game()
+        run_game(sim_speed=None if args.fast_forward else 1, profile=args.profile, team_size=args.team_size)
         
     except ImportError as e:
         print(f"❌ Error importing game modules: {e}")
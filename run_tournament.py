@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+🏟️ RoboSoccer Tournament Runner
+===============================
+
+Plays many seeded bot_vs_bot matches headlessly across a process pool and
+aggregates goals, possession, per-tick frame-time statistics and outcomes.
+
+Usage:
+    python run_tournament.py --matches 200 --workers 8 --seed 42
+    python run_tournament.py --matches 200 --archive-dir recordings/   # keep every match on disk
+    python run_tournament.py --matches 20 --team-size 11                # 11v11 matches
+
+Progress and per-worker throughput are printed while the tournament runs.
+"""
+
+import sys
+import os
+import time
+import json
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add the src directory to Python path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from headless import Match, MATCH_TICKS, AI_PLAN_INTERVAL
+
+def play_match(seed, duration_ticks=MATCH_TICKS, archive_dir=None, team_size=2, ticks_per_step=1,
+               ai_plan_interval=AI_PLAN_INTERVAL):
+    """Play one seeded bot_vs_bot match and return its result (runs in a worker process)"""
+    archive_path = os.path.join(archive_dir, f"match_{seed:06d}.match") if archive_dir else None
+    match = Match(mode="bot_vs_bot", duration_ticks=duration_ticks, record_step_times=False,
+                  archive_path=archive_path, seed=seed, team_size=team_size, ticks_per_step=ticks_per_step,
+                  ai_plan_interval=ai_plan_interval)
+
+    start = time.perf_counter()
+    tick_times = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        while not match.finished:
+            tick_start = time.perf_counter()
+            match.step()
+            tick_times.append((time.perf_counter() - tick_start) / ticks_per_step)  # per simulated tick
+    stats = match.finish()
+    elapsed = time.perf_counter() - start
+
+    tick_times.sort()
+    if match.state.blue_score > match.state.red_score:
+        outcome = "blue"
+    elif match.state.red_score > match.state.blue_score:
+        outcome = "red"
+    else:
+        outcome = "draw"
+
+    return {
+        "seed": seed,
+        "worker": os.getpid(),
+        "elapsed": elapsed,
+        "ticks": match.frame_count,
+        "blue_score": match.state.blue_score,
+        "red_score": match.state.red_score,
+        "outcome": outcome,
+        "goals": stats["goals"],
+        "possession_time": dict(stats["possession_time"]),
+        "tick_time": {
+            "mean": sum(tick_times) / len(tick_times),
+            "min": tick_times[0],
+            "max": tick_times[-1],
+            "p99": tick_times[int(0.99 * (len(tick_times) - 1))],
+        },
+    }
+
+def aggregate_results(results, wall_time):
+    """Combine per-match results into one tournament summary"""
+    outcomes = {"blue": 0, "red": 0, "draw": 0}
+    possession = {"blue": 0, "red": 0}
+    workers = {}
+    for result in results:
+        outcomes[result["outcome"]] += 1
+        possession["blue"] += result["possession_time"]["blue"]
+        possession["red"] += result["possession_time"]["red"]
+        worker = workers.setdefault(result["worker"], {"matches": 0, "busy_time": 0.0})
+        worker["matches"] += 1
+        worker["busy_time"] += result["elapsed"]
+
+    n = len(results)
+    total_possession = possession["blue"] + possession["red"]
+    total_ticks = sum(r["ticks"] for r in results)
+    return {
+        "matches": n,
+        "wall_time": wall_time,
+        "matches_per_second": n / wall_time if wall_time > 0 else 0.0,
+        "ticks_per_second": total_ticks / wall_time if wall_time > 0 else 0.0,
+        "outcomes": outcomes,
+        "total_goals": sum(r["goals"] for r in results),
+        "avg_goals_per_match": sum(r["goals"] for r in results) / n if n else 0.0,
+        "blue_possession_pct": 100.0 * possession["blue"] / total_possession if total_possession else 0.0,
+        "red_possession_pct": 100.0 * possession["red"] / total_possession if total_possession else 0.0,
+        "tick_time": {
+            "mean": sum(r["tick_time"]["mean"] * r["ticks"] for r in results) / total_ticks if total_ticks else 0.0,
+            "min": min((r["tick_time"]["min"] for r in results), default=0.0),
+            "max": max((r["tick_time"]["max"] for r in results), default=0.0),
+            "worst_match_p99": max((r["tick_time"]["p99"] for r in results), default=0.0),
+        },
+        "workers": {
+            str(pid): {
+                "matches": w["matches"],
+                "matches_per_second": w["matches"] / w["busy_time"] if w["busy_time"] > 0 else 0.0,
+            }
+            for pid, w in workers.items()
+        },
+    }
+
+def run_tournament(n_matches, workers=None, base_seed=0, duration_ticks=MATCH_TICKS, report_every=None,
+                   archive_dir=None, team_size=2, ticks_per_step=1, ai_plan_interval=AI_PLAN_INTERVAL):
+    """Play ``n_matches`` seeded matches on a process pool and return (summary, results).
+
+    With ``archive_dir`` every match is recorded in full there (match_archive.iter_archives reads them back).
+    """
+    workers = workers or os.cpu_count() or 1
+    report_every = report_every or max(1, n_matches // 20)
+    results = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_match, base_seed + i, duration_ticks, archive_dir, team_size, ticks_per_step,
+                               ai_plan_interval)
+                   for i in range(n_matches)]
+        for future in as_completed(futures):
+            results.append(future.result())
+            done = len(results)
+            if done % report_every == 0 or done == n_matches:
+                elapsed = time.perf_counter() - start
+                print(f"⏱️  {done}/{n_matches} matches | {elapsed:.1f}s | {done / elapsed:.2f} matches/s")
+                per_worker = {}
+                for result in results:
+                    per_worker.setdefault(result["worker"], []).append(result["elapsed"])
+                print("   per worker: " + ", ".join(
+                    f"{pid}: {len(times)} ({len(times) / sum(times):.2f}/s)" for pid, times in sorted(per_worker.items())
+                ))
+
+    results.sort(key=lambda r: r["seed"])
+    return aggregate_results(results, time.perf_counter() - start), results
+
+def print_summary(summary):
+    """Print the aggregated tournament result"""
+    print("\n" + "="*60)
+    print("🏆 TOURNAMENT RESULTS")
+    print("="*60)
+    print(f"Matches: {summary['matches']} in {summary['wall_time']:.2f}s "
+          f"({summary['matches_per_second']:.2f} matches/s, {summary['ticks_per_second']:.0f} ticks/s)")
+    outcomes = summary["outcomes"]
+    print(f"Outcomes: Blue {outcomes['blue']} | Red {outcomes['red']} | Draw {outcomes['draw']}")
+    print(f"Goals: {summary['total_goals']} total, {summary['avg_goals_per_match']:.2f} per match")
+    print(f"Possession: Blue {summary['blue_possession_pct']:.1f}% - Red {summary['red_possession_pct']:.1f}%")
+    tick = summary["tick_time"]
+    print(f"Tick time: mean {tick['mean']*1e6:.1f}us | min {tick['min']*1e6:.1f}us | "
+          f"max {tick['max']*1e6:.1f}us | worst p99 {tick['worst_match_p99']*1e6:.1f}us")
+    print(f"Workers: {len(summary['workers'])}")
+    print("="*60)
+
+def main():
+    """Parse arguments and run the tournament"""
+    parser = argparse.ArgumentParser(description="Run a headless bot_vs_bot tournament on a process pool")
+    parser.add_argument("--matches", type=int, default=100, help="number of matches to play")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first match; match i uses seed + i")
+    parser.add_argument("--ticks", type=int, default=MATCH_TICKS, help="simulation ticks per match")
+    parser.add_argument("--team-size", type=int, default=2, help="players per team (default 2)")
+    parser.add_argument("--ticks-per-step", type=int, default=1,
+                        help="simulation ticks per match step; same outcomes, recorded once per step (default 1)")
+    parser.add_argument("--ai-plan-interval", type=int, default=AI_PLAN_INTERVAL,
+                        help=f"ticks between AI plans (default {AI_PLAN_INTERVAL}, 10 Hz)")
+    parser.add_argument("--output", default=None, help="write the summary and per-match results to this JSON file")
+    parser.add_argument("--archive-dir", default=None, help="record every match into a binary archive in this directory")
+    args = parser.parse_args()
+    if args.ticks < 1:
+        parser.error("--ticks must be at least 1")
+
+    print(f"🏟️ Starting tournament: {args.matches} matches on {args.workers or os.cpu_count()} workers")
+    summary, results = run_tournament(args.matches, args.workers, args.seed, args.ticks,
+                                      archive_dir=args.archive_dir, team_size=args.team_size,
+                                      ticks_per_step=args.ticks_per_step,
+                                      ai_plan_interval=args.ai_plan_interval)
+    print_summary(summary)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "matches": results}, f, indent=2)
+        print(f"Results written to: {args.output}")
+    if args.archive_dir:
+        print(f"Match recordings written to: {args.archive_dir}")
+
+if __name__ == "__main__":
+    main()
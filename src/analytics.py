@@ -0,0 +1,68 @@
+"""
+Analytics Module
+Vectorized movement analytics (distance, speed, acceleration) over recorded telemetry.
+Shared by the text comparison report and the matplotlib performance report.
+"""
+
+import numpy as np
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+
+def movement_analytics(telemetry):
+    """Compute player movement statistics from a telemetry recording in one pass.
+
+    ``telemetry`` provides ``player_x`` / ``player_y`` arrays of shape
+    (n_players, n_frames) with the blue team first, a ``time`` column and
+    ``team_size`` (a TelemetryBuffer, for example). Returns None with fewer
+    than two frames, otherwise a dict of NumPy arrays and totals:
+
+        step_distance    (n_players, n_frames - 1) pixels moved each frame
+        speed            (n_players, n_frames - 1) pixels per second
+        acceleration     (n_players, n_frames - 2) pixels per second squared
+        frame_distance   (n_frames - 1,) pixels moved by all players each frame
+        player_distance  (n_players,) total pixels moved by each player
+        team_distance    {"blue": ..., "red": ...} total pixels moved per team
+        mean_speed / max_speed            per player
+        team_mean_speed / team_max_speed  per team
+        total_distance   pixels moved by every player together
+    """
+    # Accumulate in float64 even when the recording stores float32 (match archives)
+    player_x = np.asarray(telemetry.player_x, dtype=np.float64)
+    player_y = np.asarray(telemetry.player_y, dtype=np.float64)
+    if player_x.shape[1] < 2:
+        return None
+
+    step_distance = np.hypot(np.diff(player_x), np.diff(player_y))
+
+    # Time between samples; fall back to the tick length where the clock was reset
+    dt = np.diff(np.asarray(telemetry.time, dtype=np.float64))
+    dt = np.where(dt > 0, dt, 1 / FPS)
+    speed = step_distance / dt
+    acceleration = np.diff(speed) / dt[1:]
+
+    player_distance = step_distance.sum(axis=1)
+    mean_speed = speed.mean(axis=1)
+    max_speed = speed.max(axis=1)
+
+    teams = {"blue": slice(0, telemetry.team_size), "red": slice(telemetry.team_size, None)}
+    return {
+        "step_distance": step_distance,
+        "speed": speed,
+        "acceleration": acceleration,
+        "frame_distance": step_distance.sum(axis=0),
+        "player_distance": player_distance,
+        "team_distance": {team: float(player_distance[rows].sum()) for team, rows in teams.items()},
+        "mean_speed": mean_speed,
+        "max_speed": max_speed,
+        "team_mean_speed": {team: float(mean_speed[rows].mean()) for team, rows in teams.items()},
+        "team_max_speed": {team: float(max_speed[rows].max()) for team, rows in teams.items()},
+        "total_distance": float(player_distance.sum()),
+    }
+
+def analyze_all_modes(player_movement_data):
+    """Movement analytics for every mode with at least two recorded frames"""
+    return {mode: movement_analytics(telemetry) for mode, telemetry in player_movement_data.items()}
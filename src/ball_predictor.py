@@ -0,0 +1,146 @@
+"""
+Ball Predictor Module
+Closed-form prediction of the free ball's path, for AI interception.
+"""
+
+import math
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+
+# A ball slower than this (pixels per tick) counts as stopped: it rolls less than 2.5 pixels further
+STOP_SPEED = 0.05
+
+# Fixed-point iterations intercept() spends looking for the meeting tick
+INTERCEPT_ITERATIONS = 3
+
+# Lowest and highest ball center inside the field, and the room between them
+BALL_MIN_X, BALL_MAX_X = FIELD_X + BALL_RADIUS, FIELD_X + FIELD_WIDTH - BALL_RADIUS
+BALL_MIN_Y, BALL_MAX_Y = FIELD_Y + BALL_RADIUS, FIELD_Y + FIELD_HEIGHT - BALL_RADIUS
+ROOM_X, ROOM_Y = BALL_MAX_X - BALL_MIN_X, BALL_MAX_Y - BALL_MIN_Y
+
+LOG_FRICTION = math.log(FRICTION)
+
+_last = (None, None)  # (ball x, y, vx, vy), its BallPrediction
+
+def fold(offset, room):
+    """Where a ball ``offset`` pixels along an axis from the low wall ends up between walls ``room`` apart"""
+    offset %= 2 * room
+    return offset if offset <= room else 2 * room - offset
+
+class BallPrediction:
+    """Where the ball goes from now on if nobody touches it, every query O(1).
+
+    Each tick the ball moves by its velocity, which is then multiplied by
+    FRICTION, so after t ticks it has rolled speed * (1 - FRICTION**t) /
+    (1 - FRICTION) pixels along a straight line, unfolded across walls:
+    a bounce mirrors the path, like handle_ball_collision. Bounces are
+    taken as elastic (the engine also takes FRICTION off the bouncing
+    component, once per bounce). Ticks may be fractions.
+
+    The rules stop play as soon as the ball touches a border line, which
+    ``line_tick`` tells; the path beyond it is what the physics alone would do.
+    """
+
+    __slots__ = ("x", "y", "ux", "uy", "speed", "stop_tick", "line_tick")
+
+    def __init__(self, ball):
+        self.x, self.y = ball.x, ball.y
+        self.speed = speed = math.hypot(ball.vx, ball.vy)
+        if speed < STOP_SPEED:
+            self.ux = self.uy = 0.0
+            self.stop_tick = 0.0
+            self.line_tick = math.inf
+            return
+        self.ux, self.uy = ball.vx / speed, ball.vy / speed
+        self.stop_tick = math.log(STOP_SPEED / speed) / LOG_FRICTION
+
+        # Distance rolled until the ball's edge first reaches a line (none to start with when touching it)
+        distance = math.inf
+        if self.ux:
+            distance = ((BALL_MAX_X if self.ux > 0 else BALL_MIN_X) - self.x) / self.ux
+        if self.uy:
+            distance = min(distance, ((BALL_MAX_Y if self.uy > 0 else BALL_MIN_Y) - self.y) / self.uy)
+        self.line_tick = self.tick_at(max(distance, 0.0))
+
+    def distance(self, t):
+        """Pixels rolled in the first ``t`` ticks"""
+        return self.speed * (1 - FRICTION ** t) / (1 - FRICTION)
+
+    def tick_at(self, distance):
+        """Tick at which the ball has rolled ``distance`` pixels, inf if it stops short of that"""
+        left = 1 - distance * (1 - FRICTION) / self.speed
+        return math.log(left) / LOG_FRICTION if left > 0 else math.inf
+
+    def position(self, t):
+        """Ball center (x, y) after ``t`` ticks, bouncing off the walls"""
+        if not self.stop_tick or t <= 0:
+            return self.x, self.y
+        rolled = self.distance(min(t, self.stop_tick))
+        if t <= self.line_tick:
+            # No wall reached yet: nothing to fold
+            return self.x + self.ux * rolled, self.y + self.uy * rolled
+        return (BALL_MIN_X + fold(self.x - BALL_MIN_X + self.ux * rolled, ROOM_X),
+                BALL_MIN_Y + fold(self.y - BALL_MIN_Y + self.uy * rolled, ROOM_Y))
+
+    def rest(self):
+        """Where the ball stops (bouncing off the walls)"""
+        return self.position(self.stop_tick)
+
+    def goal_line_crossing(self):
+        """(tick, side, y, goal) of the ball's edge first reaching the left or right line, or None.
+
+        ``side`` is "left" (blue's goal line) or "right", ``y`` the ball's
+        center then, after bouncing off the top and bottom lines, and ``goal``
+        whether that is inside the goal mouth. A crossing later than
+        line_tick comes after the rules stopped play at another line.
+        """
+        if not self.ux:
+            return None
+        side, line = ("right", BALL_MAX_X) if self.ux > 0 else ("left", BALL_MIN_X)
+        distance = max((line - self.x) / self.ux, 0.0)
+        tick = self.tick_at(distance)
+        if tick > self.stop_tick:
+            return None
+        y = BALL_MIN_Y + fold(self.y - BALL_MIN_Y + self.uy * distance, ROOM_Y)
+        return tick, side, y, GOAL_TOP < y < GOAL_BOTTOM
+
+    def intercept(self, x, y, step, horizon=math.inf, iterations=INTERCEPT_ITERATIONS):
+        """(tick, ball x, ball y) where a player at (x, y) moving ``step`` per axis per tick meets the ball.
+
+        The earliest tick the player can be on the ball's center, no later
+        than ``horizon`` or the ball stopping, found by fixed-point
+        iterations: the time to reach where the ball will be by then. One
+        iteration aims where the ball will be when the player would reach it
+        now; a player re-aiming every tick converges on the meeting point.
+        """
+        horizon = min(horizon, self.stop_tick)
+        x0, y0, ux, uy = self.x, self.y, self.ux, self.uy
+        scale = self.speed / (1 - FRICTION)
+        t = 0.0
+        bx, by = x0, y0
+        for _ in range(iterations):
+            reach = max(abs(bx - x), abs(by - y)) / step
+            if reach <= t:
+                break
+            t = reach if reach < horizon else horizon
+            if t <= self.line_tick:
+                # position(t), inlined: this runs for most players every tick
+                rolled = scale * (1 - FRICTION ** t)
+                bx, by = x0 + ux * rolled, y0 + uy * rolled
+            else:
+                bx, by = self.position(t)
+            if t == horizon:
+                break
+        return t, bx, by
+
+def predict(ball):
+    """BallPrediction of ``ball``, reused while the ball stays put (both teams' AI ask every tick)"""
+    global _last
+    key = (ball.x, ball.y, ball.vx, ball.vy)
+    if _last[0] != key:
+        _last = (key, BallPrediction(ball))
+    return _last[1]
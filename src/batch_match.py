@@ -0,0 +1,461 @@
+"""
+Batch Simulation Module
+Steps many bot_vs_bot matches at once with NumPy array operations.
+Mirrors move_ai (plan_ai and steer_ai), separate_players, advance_ball (with
+handle_ball_collision and touch_ball), handle_out_of_bounds and
+execute_set_piece from the scalar path at one tick per step, using float
+center coordinates.
+"""
+
+import numpy as np
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+from game_state import team_start_position
+from ball_predictor import STOP_SPEED, LOG_FRICTION, BALL_MIN_X, BALL_MAX_X, BALL_MIN_Y, BALL_MAX_Y
+from collision import all_pair_indices, separate_circles, PLAYER_MIN, PLAYER_MAX
+
+# Team codes used for last_touch and set_piece_team arrays
+NO_TEAM, BLUE_TEAM, RED_TEAM = 0, 1, 2
+
+# Set piece codes used for the set_piece_type array
+NO_SET_PIECE, KICK_OFF, CORNER_KICK, GOAL_KICK, THROW_IN = 0, 1, 2, 3, 4
+SET_PIECE_NAMES = {KICK_OFF: "kick_off", CORNER_KICK: "corner_kick",
+                   GOAL_KICK: "goal_kick", THROW_IN: "throw_in"}
+
+# Codes used for the red_pass array: the red striker's pass decision, made when red plans
+PASS_UNDECIDED, NO_PASS, PASS = -1, 0, 1
+
+# Rect-overlap distance between a player and the ball (colliderect on centers)
+CONTACT_DISTANCE = PLAYER_RADIUS + BALL_RADIUS
+AI_STEP = PLAYER_SPEED - 1
+
+def team_start_positions(team_size=2):
+    """Starting player centers for both teams as a (2*team_size, 2) array (blue first)"""
+    blue = [team_start_position(i, False, team_size) for i in range(team_size)]
+    red = [team_start_position(i, True, team_size) for i in range(team_size)]
+    return np.array(blue + red, dtype=np.float64)
+
+class BatchMatch:
+    """N independent bot_vs_bot matches stepped together.
+
+    State lives in float arrays:
+      ball_pos (N, 2), ball_vel (N, 2)  ball center and velocity
+      players  (N, P, 2)                player centers, blue team first
+      scores   (N, 2)                   blue, red
+      possession (N, 2)                 frames of blue / red possession
+      last_touch, set_piece_team, set_piece_type (N,) int codes
+      ai_targets (N, P, 2), ai_follow (N, P)  AI targets, offsets from the ball where ai_follow
+      plan_ticks (N, 2)                 tick each team last planned, -1: plan next tick
+      red_pass (N,)                     red striker's pass decision code
+
+    The AI plans every ``ai_plan_interval`` ticks, as Match does.
+    """
+
+    def __init__(self, n_matches, team_size=2, seed=None, duration_ticks=MATCH_DURATION * FPS,
+                 ai_plan_interval=AI_PLAN_INTERVAL):
+        self.n = n_matches
+        self.team_size = team_size
+        self.ai_plan_interval = ai_plan_interval
+        self.duration_ticks = duration_ticks
+        self.rng = np.random.default_rng(seed)
+
+        self.start_positions = team_start_positions(team_size)
+        self.players = np.repeat(self.start_positions[None], n_matches, axis=0)
+        self.ball_pos = np.tile(np.array([WIDTH//2, HEIGHT//2], dtype=np.float64), (n_matches, 1))
+        self.ball_vel = self.rng.choice([-BALL_SPEED, BALL_SPEED], size=(n_matches, 2)).astype(np.float64)
+
+        self.scores = np.zeros((n_matches, 2), dtype=np.int64)
+        self.possession = np.zeros((n_matches, 2), dtype=np.int64)
+        self.last_touch = np.zeros(n_matches, dtype=np.int8)
+        self.set_piece_team = np.zeros(n_matches, dtype=np.int8)
+        self.set_piece_type = np.zeros(n_matches, dtype=np.int8)
+        self.ai_targets = np.zeros((n_matches, 2 * team_size, 2), dtype=np.float64)
+        self.ai_follow = np.ones((n_matches, 2 * team_size), dtype=bool)
+        self.plan_ticks = np.full((n_matches, 2), -1, dtype=np.int64)
+        self.red_pass = np.full(n_matches, PASS_UNDECIDED, dtype=np.int8)
+        self.frame_count = 0
+
+    @classmethod
+    def from_matches(cls, matches, seed=None):
+        """Build a batch whose state copies a list of scalar headless Match objects"""
+        batch = cls(len(matches), team_size=len(matches[0].state.blue_team), seed=seed,
+                    duration_ticks=matches[0].duration_ticks, ai_plan_interval=matches[0].ai_plan_interval)
+        team_codes = {None: NO_TEAM, "blue": BLUE_TEAM, "red": RED_TEAM}
+        type_codes = {None: NO_SET_PIECE, "kick_off": KICK_OFF, "corner_kick": CORNER_KICK,
+                      "goal_kick": GOAL_KICK, "throw_in": THROW_IN}
+        for i, match in enumerate(matches):
+            state = match.state
+            batch.ball_pos[i] = (state.ball.x, state.ball.y)
+            batch.ball_vel[i] = (state.ball.vx, state.ball.vy)
+            batch.players[i] = [(p.x, p.y) for p in state.players]
+            batch.scores[i] = (state.blue_score, state.red_score)
+            batch.last_touch[i] = team_codes[state.last_touch]
+            batch.set_piece_team[i] = team_codes[state.set_piece_team]
+            batch.set_piece_type[i] = type_codes[state.set_piece_type]
+            batch.ai_targets[i] = [target[:2] for target in state.ai_targets]
+            batch.ai_follow[i] = [target[2] for target in state.ai_targets]
+            batch.plan_ticks[i] = [-1 if tick is None else tick for tick in state.ai_plan_ticks]
+            batch.red_pass[i] = PASS_UNDECIDED if state.red_pass is None else int(state.red_pass)
+        batch.frame_count = matches[0].frame_count
+        return batch
+
+    @property
+    def finished(self):
+        """True once every match has played its full duration"""
+        return self.frame_count >= self.duration_ticks
+
+    def step(self):
+        """Advance every match by one simulation tick"""
+        in_set_piece = self.set_piece_team != NO_TEAM
+        self._execute_set_pieces(in_set_piece)
+        self._handle_out_of_bounds(~in_set_piece)
+        self._move_ai()
+        self._separate_players()
+
+        # Ball movement with friction and collisions, only during normal play
+        live = self.set_piece_team == NO_TEAM
+        self.ball_vel[~live] = 0.0
+        self._advance_ball(live)
+
+        # Possession: one frame for whichever team touched the ball last
+        has_touch = self.last_touch != NO_TEAM
+        self.possession[has_touch, self.last_touch[has_touch] - 1] += 1
+        self.frame_count += 1
+
+    def run(self):
+        """Step until all matches are over and return aggregate results"""
+        while not self.finished:
+            self.step()
+        return {
+            "matches": self.n,
+            "goals": self.scores.sum(axis=1),
+            "scores": self.scores.copy(),
+            "possession_time": self.possession.copy(),
+            "match_duration": self.frame_count / FPS,
+        }
+
+    def _reset_team(self, mask, red):
+        """Send one team back to its starting positions in the masked matches"""
+        team = slice(self.team_size, None) if red else slice(0, self.team_size)
+        self.players[:, team] = np.where(mask[:, None, None], self.start_positions[team], self.players[:, team])
+
+    def _place_player(self, mask, index, offset):
+        """Put player ``index`` at the ball position plus ``offset`` in the masked matches"""
+        self.players[:, index] = np.where(mask[:, None], self.ball_pos + offset, self.players[:, index])
+
+    def _execute_set_pieces(self, in_set_piece):
+        """Keep the ball still until the team in possession touches it"""
+        self.ball_vel[in_set_piece] = 0.0
+
+        blue_touch = self._touching(slice(0, self.team_size))
+        red_touch = self._touching(slice(self.team_size, None))
+        resume_blue = in_set_piece & (self.set_piece_team == BLUE_TEAM) & blue_touch
+        resume_red = in_set_piece & (self.set_piece_team == RED_TEAM) & red_touch
+
+        kick_x = self.rng.uniform(1, 3, size=self.n)
+        kick_y = self.rng.uniform(-2, 2, size=self.n)
+        self.ball_vel[:, 0] = np.where(resume_blue, kick_x, np.where(resume_red, -kick_x, self.ball_vel[:, 0]))
+        self.ball_vel[:, 1] = np.where(resume_blue | resume_red, kick_y, self.ball_vel[:, 1])
+
+        resumed = resume_blue | resume_red
+        self.set_piece_team[resumed] = NO_TEAM
+        self.set_piece_type[resumed] = NO_SET_PIECE
+        self.plan_ticks[resumed] = -1
+
+    def _touching(self, team):
+        """(N,) mask of matches where any player of ``team`` overlaps the ball"""
+        delta = np.abs(self.players[:, team] - self.ball_pos[:, None])
+        return np.any((delta[..., 0] < CONTACT_DISTANCE) & (delta[..., 1] < CONTACT_DISTANCE), axis=1)
+
+    def _handle_out_of_bounds(self, active):
+        """Goals, corners, goal kicks and throw-ins for matches where the ball touches a border"""
+        bx, by = self.ball_pos[:, 0].copy(), self.ball_pos[:, 1].copy()
+        left = bx - BALL_RADIUS <= FIELD_X
+        right = bx + BALL_RADIUS >= FIELD_X + FIELD_WIDTH
+        top = by - BALL_RADIUS <= FIELD_Y
+        bottom = by + BALL_RADIUS >= FIELD_Y + FIELD_HEIGHT
+        out = active & (left | right | top | bottom)
+        if not out.any():
+            return
+
+        in_mouth = (GOAL_TOP < by) & (by < GOAL_BOTTOM)
+        out_left = out & left
+        out_right = out & ~left & right
+        out_top = out & ~left & ~right & (by <= FIELD_Y)
+        out_bottom = out & ~left & ~right & ~out_top & (by >= FIELD_Y + FIELD_HEIGHT)
+        blue_last = self.last_touch == BLUE_TEAM
+        red_last = self.last_touch == RED_TEAM
+        upper_half = by < FIELD_Y + FIELD_HEIGHT // 2
+
+        # Goals: score, reset everyone, conceding team kicks off from the center
+        red_goal = out_left & in_mouth
+        blue_goal = out_right & in_mouth
+        self.scores[:, 1] += red_goal
+        self.scores[:, 0] += blue_goal
+        goal = red_goal | blue_goal
+        self._reset_team(goal, red=False)
+        self._reset_team(goal, red=True)
+        self.ball_pos[goal] = (WIDTH//2, HEIGHT//2)
+        self._start_set_piece(red_goal, BLUE_TEAM, KICK_OFF)
+        self._start_set_piece(blue_goal, RED_TEAM, KICK_OFF)
+
+        # Ball over the left goal line
+        blue_goal_kick = out_left & ~in_mouth & red_last
+        red_corner = out_left & ~in_mouth & ~red_last
+        self.ball_pos[blue_goal_kick] = (FIELD_X + 30, FIELD_Y + FIELD_HEIGHT // 2)
+        self._reset_team(blue_goal_kick, red=True)
+        self._place_player(blue_goal_kick, 0, (0, -30))
+        self._start_set_piece(blue_goal_kick, BLUE_TEAM, GOAL_KICK)
+        self.ball_pos[red_corner, 0] = FIELD_X + 15
+        self.ball_pos[red_corner, 1] = np.where(upper_half, FIELD_Y + 15, FIELD_Y + FIELD_HEIGHT - 15)[red_corner]
+        self._reset_team(red_corner, red=False)
+        self._place_player(red_corner, self.team_size, (20, 0))
+        self._start_set_piece(red_corner, RED_TEAM, CORNER_KICK)
+
+        # Ball over the right goal line
+        red_goal_kick = out_right & ~in_mouth & blue_last
+        blue_corner = out_right & ~in_mouth & ~blue_last
+        self.ball_pos[red_goal_kick] = (FIELD_X + FIELD_WIDTH - 30, FIELD_Y + FIELD_HEIGHT // 2)
+        self._reset_team(red_goal_kick, red=False)
+        self._place_player(red_goal_kick, self.team_size, (0, -30))
+        self._start_set_piece(red_goal_kick, RED_TEAM, GOAL_KICK)
+        self.ball_pos[blue_corner, 0] = FIELD_X + FIELD_WIDTH - 15
+        self.ball_pos[blue_corner, 1] = np.where(upper_half, FIELD_Y + 15, FIELD_Y + FIELD_HEIGHT - 15)[blue_corner]
+        self._reset_team(blue_corner, red=True)
+        self._place_player(blue_corner, 0, (-20, 0))
+        self._start_set_piece(blue_corner, BLUE_TEAM, CORNER_KICK)
+
+        # Throw-ins: the team that did not touch the ball last takes it
+        throw_in = out_top | out_bottom
+        self.ball_pos[throw_in, 0] = np.clip(bx, FIELD_X + BALL_RADIUS, FIELD_X + FIELD_WIDTH - BALL_RADIUS)[throw_in]
+        self.ball_pos[out_top, 1] = FIELD_Y + BALL_RADIUS + 15
+        self.ball_pos[out_bottom, 1] = FIELD_Y + FIELD_HEIGHT - BALL_RADIUS - 15
+        red_throw = throw_in & blue_last
+        blue_throw = throw_in & ~blue_last
+        self._reset_team(red_throw, red=False)
+        self._reset_team(blue_throw, red=True)
+        taker_offset = np.where(out_top, -(PLAYER_RADIUS + BALL_RADIUS + 10), PLAYER_RADIUS + BALL_RADIUS + 10)
+        offset = np.stack([np.zeros(self.n), taker_offset], axis=1)
+        self._place_player(red_throw, self.team_size, offset)
+        self._place_player(blue_throw, 0, offset)
+        self._start_set_piece(red_throw, RED_TEAM, THROW_IN)
+        self._start_set_piece(blue_throw, BLUE_TEAM, THROW_IN)
+
+        # Any border contact stops the ball
+        self.ball_vel[out] = 0.0
+
+    def _start_set_piece(self, mask, team, set_piece_type):
+        """Record a set piece for the masked matches, where both teams plan again next tick"""
+        self.set_piece_team[mask] = team
+        self.set_piece_type[mask] = set_piece_type
+        self.plan_ticks[mask] = -1
+
+    def _move_ai(self):
+        """Vectorized move_ai for both teams: plan when due, steer toward the targets, keep_players_in_bounds"""
+        is_red = np.arange(2 * self.team_size) >= self.team_size
+
+        # During a set piece only the team taking it may move
+        blue_moves = (self.set_piece_team == NO_TEAM) | (self.set_piece_team == BLUE_TEAM)
+        red_moves = (self.set_piece_team == NO_TEAM) | (self.set_piece_team == RED_TEAM)
+
+        for team, moves in enumerate((blue_moves, red_moves)):
+            planned = self.plan_ticks[:, team]
+            since = self.frame_count - planned
+            due = moves & ((planned < 0) | (since >= self.ai_plan_interval))
+            rows = np.flatnonzero(due)
+            if rows.size:
+                self._plan_ai(rows, red=team == 1)
+                # On schedule, as move_ai records it (the tick itself after a restart)
+                self.plan_ticks[rows, team] = np.where(planned[rows] < 0, self.frame_count,
+                                                       self.frame_count - since[rows] % self.ai_plan_interval)
+
+        # Targets are aimed at the ball's top-left corner, as the AI always has
+        ball_corner = self.ball_pos - BALL_RADIUS
+        target = np.where(self.ai_follow[..., None], self.ai_targets + ball_corner[:, None], self.ai_targets)
+        may_move = np.where(is_red, red_moves[:, None], blue_moves[:, None])
+        step = np.sign(target - self.players) * AI_STEP
+        self.players += np.where(may_move[..., None], step, 0.0)
+        self.players[..., 0].clip(FIELD_X + PLAYER_RADIUS, FIELD_X + FIELD_WIDTH - PLAYER_RADIUS, out=self.players[..., 0])
+        self.players[..., 1].clip(FIELD_Y + PLAYER_RADIUS, FIELD_Y + FIELD_HEIGHT - PLAYER_RADIUS, out=self.players[..., 1])
+
+    def _plan_ai(self, rows, red):
+        """Vectorized plan_ai of one team in the matches ``rows``: targets and, for red, the pass decision.
+
+        Players near the ball follow it; the others aim where they first meet
+        it on its path (one iteration of BallPrediction.intercept), which ends
+        where the ball stops or touches a line; a ball at rest is chased.
+        """
+        team = slice(self.team_size, None) if red else slice(0, self.team_size)
+        players = self.players[rows, team]
+        ball = self.ball_pos[rows]
+        velocity = self.ball_vel[rows]
+        speed = np.hypot(velocity[:, 0], velocity[:, 1])
+        moving = speed >= STOP_SPEED
+        speed = np.where(moving, speed, 1.0)
+        direction = velocity / speed[:, None]
+
+        # Ticks until the ball stops, or its edge first reaches a line if that comes first
+        stop_tick = np.where(moving, np.log(STOP_SPEED / speed) / LOG_FRICTION, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            line_x = np.where(direction[:, 0] > 0, BALL_MAX_X, BALL_MIN_X)
+            line_y = np.where(direction[:, 1] > 0, BALL_MAX_Y, BALL_MIN_Y)
+            to_x = np.where(direction[:, 0] != 0, (line_x - ball[:, 0]) / direction[:, 0], np.inf)
+            to_y = np.where(direction[:, 1] != 0, (line_y - ball[:, 1]) / direction[:, 1], np.inf)
+        left = 1 - np.maximum(np.minimum(to_x, to_y), 0.0) * (1 - FRICTION) / speed
+        line_tick = np.where(left > 0, np.log(np.where(left > 0, left, 1.0)) / LOG_FRICTION, np.inf)
+        horizon = np.minimum(line_tick, stop_tick)
+
+        # Where the ball is by the time the player could reach where it is now
+        t = np.minimum(np.max(np.abs(ball[:, None] - players), axis=2) / AI_STEP, horizon[:, None])
+        rolled = speed[:, None] / (1 - FRICTION) * (1 - FRICTION ** t)
+        meet = ball[:, None] + direction[:, None] * rolled[..., None] - BALL_RADIUS
+
+        near = np.abs(players - ball[:, None]).sum(axis=2) < 50
+        push = np.array([-30.0 if red else 30.0, 0.0])
+        self.ai_targets[rows, team] = np.where(near[..., None], push, np.where(moving[:, None, None], meet, 0.0))
+        self.ai_follow[rows, team] = near | ~moving[:, None]
+
+        if red:
+            # The striker passes when the midfielder is ahead and not too far in y
+            passes = np.zeros(rows.size, dtype=bool)
+            if self.team_size > 1:
+                midfielder = players[:, 1]
+                passes = (midfielder[:, 0] > ball[:, 0] + 50) & (np.abs(midfielder[:, 1] - ball[:, 1]) < 100)
+            self.red_pass[rows] = np.where(passes, PASS, NO_PASS)
+
+    def _separate_players(self):
+        """Vectorized separate_players: one batched solve over every pair of every match"""
+        first, second = all_pair_indices(2 * self.team_size)
+        # Players both on the ball may overlap
+        on_ball = np.all(np.abs(self.players - self.ball_pos[:, None]) < CONTACT_DISTANCE, axis=2)
+        return separate_circles(self.players, first, second, low=PLAYER_MIN, high=PLAYER_MAX,
+                                skip=on_ball[:, first] & on_ball[:, second])
+
+    def _advance_ball(self, live):
+        """Vectorized advance_ball for one tick in the ``live`` matches, then _handle_ball_collision.
+
+        The ball sweeps its path: it is kicked by the first player circle it
+        runs into and carries on for the rest of the tick, or stops exactly
+        touching the first line its edge reaches.
+        """
+        rows = np.flatnonzero(live)
+        remaining = np.ones(rows.size)
+        for _ in range(SWEEP_MAX_CONTACTS):
+            velocity = self.ball_vel[rows]
+            speed = np.hypot(velocity[:, 0], velocity[:, 1])
+            moving = speed > 0
+            if not moving.all():
+                rows, remaining, velocity, speed = rows[moving], remaining[moving], velocity[moving], speed[moving]
+            if not rows.size:
+                break
+            ball = self.ball_pos[rows]
+            decay = FRICTION ** remaining
+            travel = speed * (1 - decay) / (1 - FRICTION)  # distance left to travel this tick
+            direction = velocity / speed[:, None]
+
+            # First border line the ball's edge reaches
+            with np.errstate(divide="ignore", invalid="ignore"):
+                line_x = np.where(direction[:, 0] > 0, BALL_MAX_X, BALL_MIN_X)
+                line_y = np.where(direction[:, 1] > 0, BALL_MAX_Y, BALL_MIN_Y)
+                to_x = np.where(direction[:, 0] != 0, (line_x - ball[:, 0]) / direction[:, 0], np.inf)
+                to_y = np.where(direction[:, 1] != 0, (line_y - ball[:, 1]) / direction[:, 1], np.inf)
+            hit_x = to_x < travel
+            travel = np.where(hit_x, to_x, travel)
+            hit_y = to_y < travel
+            travel = np.maximum(np.where(hit_y, to_y, travel), 0.0)
+
+            # First player circle on the way (one the ball already overlaps counts if it moves further in)
+            offset = ball[:, None] - self.players[rows]
+            approach = offset[..., 0] * direction[:, None, 0] + offset[..., 1] * direction[:, None, 1]
+            gap = (offset ** 2).sum(axis=2) - CONTACT_DISTANCE ** 2
+            disc = approach * approach - gap
+            contact = np.where(gap <= 0, 0.0, -approach - np.sqrt(np.maximum(disc, 0.0)))
+            contact[(approach >= 0) | ((gap > 0) & (disc < 0))] = np.inf
+            first = contact.argmin(axis=1)
+            nearest = contact[np.arange(rows.size), first]
+            hit_player = nearest < travel
+            travel = np.where(hit_player, nearest, travel)
+
+            # Exactly touching the line, for _handle_ball_collision and the rules
+            hit_line = (hit_x | hit_y) & ~hit_player
+            ball = ball + direction * travel[:, None]
+            ball[:, 0] = np.where(hit_line & ~hit_y, line_x, ball[:, 0])
+            ball[:, 1] = np.where(hit_line & hit_y, line_y, ball[:, 1])
+            self.ball_pos[rows] = ball
+
+            # Slow down for the distance covered (speed drops linearly with distance)
+            slowed = np.maximum(speed - travel * (1 - FRICTION), 0.0)
+            self.ball_vel[rows] = velocity * np.where(hit_line | hit_player, slowed / speed, decay)[:, None]
+
+            if not hit_player.any():
+                break
+            rows, first, remaining = rows[hit_player], first[hit_player], remaining[hit_player]
+            slowed, speed = slowed[hit_player], speed[hit_player]
+            self._touch_ball(rows, first)
+            remaining -= np.log(np.where(slowed > 0, slowed / speed, 1.0)) / LOG_FRICTION
+            carry_on = remaining > 0
+            rows, remaining = rows[carry_on], remaining[carry_on]
+
+        self._handle_ball_collision(live)
+
+    def _handle_ball_collision(self, live):
+        """Vectorized handle_ball_collision: wall bounces, then touches by each player in order"""
+        bx, by = self.ball_pos[:, 0], self.ball_pos[:, 1]
+        vx, vy = self.ball_vel[:, 0], self.ball_vel[:, 1]
+
+        # Bounce off walls with friction
+        hit_top = live & (by - BALL_RADIUS <= FIELD_Y)
+        hit_bottom = live & ~hit_top & (by + BALL_RADIUS >= FIELD_Y + FIELD_HEIGHT)
+        by[hit_top] = FIELD_Y + BALL_RADIUS
+        vy[hit_top] = np.abs(vy[hit_top]) * FRICTION
+        by[hit_bottom] = FIELD_Y + FIELD_HEIGHT - BALL_RADIUS
+        vy[hit_bottom] = -np.abs(vy[hit_bottom]) * FRICTION
+        hit_left = live & (bx - BALL_RADIUS <= FIELD_X)
+        hit_right = live & ~hit_left & (bx + BALL_RADIUS >= FIELD_X + FIELD_WIDTH)
+        bx[hit_left] = FIELD_X + BALL_RADIUS
+        vx[hit_left] = np.abs(vx[hit_left]) * FRICTION
+        bx[hit_right] = FIELD_X + FIELD_WIDTH - BALL_RADIUS
+        vx[hit_right] = -np.abs(vx[hit_right]) * FRICTION
+
+        # Players touch the ball in the same order as the scalar loop (blue then red)
+        for i in range(2 * self.team_size):
+            px, py = self.players[:, i, 0], self.players[:, i, 1]
+            hit = live & (np.abs(bx - px) < CONTACT_DISTANCE) & (np.abs(by - py) < CONTACT_DISTANCE)
+            if hit.any():
+                self._touch_ball(np.flatnonzero(hit), i)
+
+    def _touch_ball(self, rows, index):
+        """Vectorized touch_ball: player ``index`` (one, or one per row) touches the ball in the matches ``rows``.
+
+        Records the touch in last_touch. The red striker passes as red
+        planned (red_pass), or on the spot if red has not planned yet; anyone
+        else kicks the ball away and pushes it clear of themselves.
+        """
+        self.last_touch[rows] = np.where(index >= self.team_size, RED_TEAM, BLUE_TEAM)
+        ball = self.ball_pos[rows]
+        player = self.players[rows, index]
+
+        kicks = np.ones(rows.size, dtype=bool)
+        striker = index == self.team_size
+        if self.team_size > 1 and np.any(striker):
+            midfielder = self.players[rows, self.team_size + 1]
+            to_midfielder = midfielder - ball
+            on_the_spot = (to_midfielder[:, 0] > 50) & (np.abs(to_midfielder[:, 1]) < 100)
+            decided = self.red_pass[rows]
+            pass_dist = np.hypot(to_midfielder[:, 0], to_midfielder[:, 1])
+            passes = striker & np.where(decided == PASS_UNDECIDED, on_the_spot, decided == PASS) & (pass_dist > 0)
+            pass_dist[pass_dist == 0] = 1
+            self.ball_vel[rows[passes]] = (to_midfielder / pass_dist[:, None] * BALL_SPEED * 1.2)[passes]
+            kicks = ~passes
+
+        # Normal kick away from the player, then push the ball clear of them
+        away = (ball - player)[kicks]
+        distance = np.maximum(1, np.hypot(away[:, 0], away[:, 1]))
+        away /= distance[:, None]
+        self.ball_vel[rows[kicks]] = away * BALL_SPEED * 1.5
+        overlap = np.maximum(CONTACT_DISTANCE - distance, 0.0)
+        self.ball_pos[rows[kicks]] = ball[kicks] + away * overlap[:, None]
@@ -0,0 +1,167 @@
+"""
+Collision Module
+Batched NumPy collision solvers shared by the scalar (headless / windowed)
+and the batch engines.
+"""
+
+import math
+import numpy as np
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+
+# Player-player separation: two players touch when their centers are closer
+# than PLAYER_CONTACT_DISTANCE; each relaxation iteration pushes every touching
+# pair apart by its overlap, half each
+PLAYER_CONTACT_DISTANCE = 2 * PLAYER_RADIUS
+SEPARATION_ITERATIONS = 3
+SEPARATION_TOLERANCE = 0.01  # overlap left unresolved, in pixels
+MIN_GAP = 1e-9
+
+# Lowest and highest player center (x, y) inside the field
+PLAYER_MIN = np.array([FIELD_X + PLAYER_RADIUS, FIELD_Y + PLAYER_RADIUS], dtype=np.float64)
+PLAYER_MAX = np.array([FIELD_X + FIELD_WIDTH - PLAYER_RADIUS, FIELD_Y + FIELD_HEIGHT - PLAYER_RADIUS],
+                      dtype=np.float64)
+
+_XY = np.array([0, 1])  # offsets of x and y within a body's interleaved floats
+
+_all_pairs = {}  # body count -> list of (i, j)
+_all_pair_indices = {}  # body count -> (first, second) index arrays
+
+def all_pairs(count):
+    """Every (i, j) index pair, i < j, of ``count`` bodies (cached; do not modify)"""
+    pairs = _all_pairs.get(count)
+    if pairs is None:
+        pairs = _all_pairs[count] = [(i, j) for i in range(count) for j in range(i + 1, count)]
+    return pairs
+
+def all_pair_indices(count):
+    """all_pairs() as (first, second) index arrays (cached; do not modify)"""
+    indices = _all_pair_indices.get(count)
+    if indices is None:
+        indices = _all_pair_indices[count] = np.triu_indices(count, 1)
+    return indices
+
+def separate_circles(positions, first, second, distance=PLAYER_CONTACT_DISTANCE,
+                     iterations=SEPARATION_ITERATIONS, low=None, high=None, skip=None):
+    """Push overlapping circles apart in place, return how many pairs were touching.
+
+    ``positions`` is a C-contiguous (P, 2) array of centers, or (N, P, 2) for
+    N independent groups (matches) sharing the candidate pairs ``first[k]``,
+    ``second[k]``. The candidates closer than ``distance`` are found once;
+    then every iteration solves all of those contacts at once (Jacobi
+    relaxation): each pair is pushed apart along the line between its centers
+    by its overlap, half each, and a body gets the average of its pushes.
+    Iterations stop early once every contact is resolved. ``low`` / ``high``
+    clamp the centers (x, y) after every iteration, so bodies pushed into a
+    wall are pushed back by the other iterations.
+
+    ``skip`` optionally marks candidates to leave alone, shaped like the
+    pairs ((K,), or (N, K) to differ between groups).
+    """
+    flat = positions.view()
+    flat.shape = (-1, 2)  # raises instead of copying a non-contiguous array
+    size = len(flat)
+    if positions.ndim == 3 and len(first):
+        # Flat body indices across all groups
+        count = positions.shape[1]
+        offsets = (np.arange(positions.shape[0]) * count)[:, None]
+        first, second = (offsets + first).ravel(), (offsets + second).ravel()
+    centers = flat.view(np.complex128)[:, 0]  # x + iy of every body, sharing positions' memory
+
+    delta = centers[second] - centers[first]
+    touching = np.abs(delta) < distance
+    if skip is not None:
+        touching &= ~skip.ravel()
+    contacts = int(np.count_nonzero(touching))
+    if not contacts:
+        return 0
+    first, second = first[touching], second[touching]
+    coincident = delta[touching] == 0
+    if coincident.any():
+        # No direction to push along: start them apart along x
+        flat[second[coincident], 0] += MIN_GAP
+
+    # Pushes are scattered into the interleaved (x, y) floats of flat
+    first_xy = (2 * first[:, None] + _XY).ravel()
+    second_xy = (2 * second[:, None] + _XY).ravel()
+    touches = np.bincount(first, minlength=size) + np.bincount(second, minlength=size)
+    share = (1.0 / np.maximum(touches, 1))[:, None]
+
+    for _ in range(iterations):
+        delta = centers[second] - centers[first]
+        gap = np.abs(delta)
+        np.maximum(gap, MIN_GAP, out=gap)
+        overlap = distance - gap
+        if overlap.max() < SEPARATION_TOLERANCE:
+            break
+        np.maximum(overlap, 0.0, out=overlap)
+        push = (delta * (overlap / (2 * gap))).view(np.float64)
+        moves = np.bincount(second_xy, push, 2 * size) - np.bincount(first_xy, push, 2 * size)
+        moves.shape = (size, 2)
+        moves *= share
+        flat += moves
+        if low is not None:
+            np.maximum(flat, low, out=flat)
+            np.minimum(flat, high, out=flat)
+
+    return contacts
+
+def separate_bodies(bodies, pairs, distance=PLAYER_CONTACT_DISTANCE, iterations=SEPARATION_ITERATIONS,
+                    low=None, high=None):
+    """separate_circles for a few Body objects and (i, j) candidate pairs, in plain Python.
+
+    Same solver and result (up to float rounding) without the NumPy call
+    overhead, which dominates for a handful of bodies.
+    """
+    xs = [body.x for body in bodies]
+    ys = [body.y for body in bodies]
+    count = len(bodies)
+    limit = distance * distance
+    contacts = []
+    for i, j in pairs:
+        dx, dy = xs[j] - xs[i], ys[j] - ys[i]
+        if dx * dx + dy * dy < limit:
+            if dx == 0 and dy == 0:
+                xs[j] += MIN_GAP
+            contacts.append((i, j))
+    if not contacts:
+        return 0
+
+    if low is not None:
+        # Plain floats: NumPy scalars would leak into the bodies
+        (low_x, low_y), (high_x, high_y) = map(float, low), map(float, high)
+    touches = [0] * count
+    for i, j in contacts:
+        touches[i] += 1
+        touches[j] += 1
+    for _ in range(iterations):
+        moves = [None] * len(contacts)
+        worst = 0.0
+        for k, (i, j) in enumerate(contacts):
+            dx, dy = xs[j] - xs[i], ys[j] - ys[i]
+            gap = max(math.hypot(dx, dy), MIN_GAP)
+            overlap = distance - gap
+            if overlap > worst:
+                worst = overlap
+            scale = overlap / (2 * gap) if overlap > 0 else 0.0
+            moves[k] = (dx * scale, dy * scale)
+        if worst < SEPARATION_TOLERANCE:
+            break
+        for (i, j), (px, py) in zip(contacts, moves):
+            xs[i] -= px / touches[i]
+            ys[i] -= py / touches[i]
+            xs[j] += px / touches[j]
+            ys[j] += py / touches[j]
+        if low is not None:
+            for i in range(count):
+                xs[i] = min(max(xs[i], low_x), high_x)
+                ys[i] = min(max(ys[i], low_y), high_y)
+
+    for body, x, y in zip(bodies, xs, ys):
+        body.x = x
+        body.y = y
+    return len(contacts)
@@ -4,39 +4,37 @@ Handles performance tracking, report generation, and data export functionality.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg
 import csv
+import copy
+import hashlib
 import os
 import time
-import math
 import pygame
 from datetime import datetime
-from collections import deque
 import sys
 
 # Import from the same directory
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from game_config import *
+from game_constants import *
+from telemetry import TelemetryBuffer
+from frame_stats import FrameTimes
+from analytics import analyze_all_modes
+from match_archive import ArchiveWriter, MatchArchive
 
-def initialize_data_structures():
+def initialize_data_structures(team_size=2):
     """Initialize all data collection structures"""
+    # Frame times: last 200 for the live graph, whole-match statistics for the reports
     time_data = {
-        "man_vs_man": deque(maxlen=200),
-        "bot_vs_man": deque(maxlen=200),
-        "bot_vs_bot": deque(maxlen=200)
+        "man_vs_man": FrameTimes(200),
+        "bot_vs_man": FrameTimes(200),
+        "bot_vs_bot": FrameTimes(200)
     }
 
+    # Player and ball telemetry, last 1000 frames per mode
     player_movement_data = {
-        "man_vs_man": deque(maxlen=1000),
-        "bot_vs_man": deque(maxlen=1000),
-        "bot_vs_bot": deque(maxlen=1000)
-    }
-
-    ball_position_data = {
-        "man_vs_man": deque(maxlen=1000),
-        "bot_vs_man": deque(maxlen=1000),
-        "bot_vs_bot": deque(maxlen=1000)
+        "man_vs_man": TelemetryBuffer(1000, team_size),
+        "bot_vs_man": TelemetryBuffer(1000, team_size),
+        "bot_vs_bot": TelemetryBuffer(1000, team_size)
     }
 
     game_stats = {
@@ -63,40 +61,80 @@ def initialize_data_structures():
         }
     }
     
-    return time_data, player_movement_data, ball_position_data, game_stats
+    return time_data, player_movement_data, game_stats
 
-def collect_research_data(ball, blue_team, red_team, current_mode, frame_count, match_start_time,
-                         player_movement_data, ball_position_data, game_stats, last_touch, 
-                         possession_timer, last_possession):
+def collect_research_data(state, player_movement_data, game_stats):
     """Collect player movement and ball position data for research"""
-    
-    # Track possession
+    track_possession(state, game_stats)
+
+    # Record player and ball centers and ball velocity into the preallocated columns
+    player_movement_data[state.mode].record(state)
+
+def track_possession(state, game_stats):
+    """Count this tick towards the possession of the team that touched the ball last"""
+    last_touch = state.last_touch
     if last_touch:
-        if last_possession != last_touch:
+        if state.last_possession != last_touch:
             # Add previous possession time
-            if last_possession:
-                game_stats[current_mode]["possession_time"][last_possession] += possession_timer
-            possession_timer = 0
-            last_possession = last_touch
-        possession_timer += 1
-    
-    # Collect player positions
-    player_data = {
-        "frame": frame_count,
-        "time": time.time() - match_start_time,
-        "blue_players": [(p.x, p.y) for p in blue_team],
-        "red_players": [(p.x, p.y) for p in red_team],
-        "ball_position": (ball.x, ball.y),
-        "ball_velocity": (0, 0)  # Note: ball_vel not passed to this function
-    }
-    
-    player_movement_data[current_mode].append(player_data)
-    ball_position_data[current_mode].append((ball.x, ball.y))
-    
-    return possession_timer, last_possession
+            if state.last_possession:
+                game_stats[state.mode]["possession_time"][state.last_possession] += state.possession_timer
+            state.possession_timer = 0
+            state.last_possession = last_touch
+        state.possession_timer += 1
+
+def snapshot_data(time_data, player_movement_data, game_stats, recordings=None):
+    """Copy the collected data so it can be exported while the match keeps running.
+
+    ``recordings`` maps modes to the ArchiveWriter recording their latest match;
+    those modes are exported from the full recording (pinned to the frames
+    written so far) instead of the last frames held in memory.
+    """
+    telemetry = {mode: data.copy() for mode, data in player_movement_data.items()}
+    for mode, recording in (recordings or {}).items():
+        recording.flush()
+        telemetry[mode] = MatchArchive(recording.path, recording.n_frames)
+    return (copy.deepcopy(time_data),
+            telemetry,
+            copy.deepcopy(game_stats))
+
+def data_version(time_data, player_movement_data, game_stats):
+    """Key that changes whenever the collected data changes, for memoizing reports and exports.
 
-def generate_comparison_report(time_data, game_stats, player_movement_data):
-    """Generate a comprehensive comparison report in text format"""
+    Match archives only ever grow, so their path and frame count identify
+    their contents; frame times, in-memory telemetry and stats are hashed.
+    """
+    digest = hashlib.sha1(repr(sorted(game_stats.items())).encode())
+    for mode in sorted(time_data):
+        times = time_data[mode]
+        digest.update(repr((mode, list(times), times.stats.count, times.stats.mean, times.stats.max)).encode())
+        telemetry = player_movement_data[mode]
+        if isinstance(telemetry, MatchArchive):
+            digest.update(f"{telemetry.path}:{len(telemetry)}".encode())
+        else:
+            for column in (telemetry.frame, telemetry.time, telemetry.player_x, telemetry.player_y,
+                           telemetry.ball_x, telemetry.ball_y, telemetry.ball_vx, telemetry.ball_vy):
+                digest.update(np.ascontiguousarray(column).tobytes())
+    return digest.hexdigest()
+
+def export_all(time_data, player_movement_data, game_stats, analytics=None):
+    """Export the CSV data and the comparison report, return the export timestamp.
+
+    Raises IOError when either export fails (the details are printed).
+    """
+    timestamp = export_performance_data(time_data, player_movement_data, game_stats)
+    archive_timestamp = export_match_archives(player_movement_data, game_stats, timestamp)
+    report_file = export_comparison_report(time_data, game_stats, player_movement_data, analytics)
+    if timestamp is None or archive_timestamp is None or report_file is None:
+        raise IOError("could not write report files")
+    return timestamp
+
+def generate_comparison_report(time_data, game_stats, player_movement_data, analytics=None):
+    """Generate a comprehensive comparison report in text format.
+
+    ``analytics`` takes precomputed analyze_all_modes() results to share with other reports.
+    """
+    if analytics is None:
+        analytics = analyze_all_modes(player_movement_data)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     report = f"ROBOSOCCER PERFORMANCE COMPARISON REPORT\n"
@@ -108,17 +146,24 @@ def generate_comparison_report(time_data, game_stats, player_movement_data):
             report += f"MODE: {mode.upper().replace('_', ' ')}\n"
             report += "-" * 40 + "\n"
             
-            # Basic statistics
-            avg_time = np.mean(time_data[mode])
-            max_time = np.max(time_data[mode])
-            min_time = np.min(time_data[mode])
-            total_frames = len(time_data[mode])
+            # Frame time statistics over the whole match (streamed, not just the last frames)
+            frame_stats = time_data[mode].stats.summary()
             
             report += f"Performance Metrics:\n"
-            report += f"  Average Frame Time: {avg_time:.6f} seconds\n"
-            report += f"  Maximum Frame Time: {max_time:.6f} seconds\n"
-            report += f"  Minimum Frame Time: {min_time:.6f} seconds\n"
-            report += f"  Total Frames: {total_frames}\n"
+            report += f"  Average Frame Time: {frame_stats['mean']:.6f} seconds\n"
+            report += f"  Frame Time Std Dev: {frame_stats['std']:.6f} seconds\n"
+            report += (f"  Frame Time Percentiles: p50 {frame_stats['p50']:.6f}s, p95 {frame_stats['p95']:.6f}s, "
+                       f"p99 {frame_stats['p99']:.6f}s, p99.9 {frame_stats['p99.9']:.6f}s\n")
+            report += f"  Maximum Frame Time: {frame_stats['max']:.6f} seconds\n"
+            report += f"  Minimum Frame Time: {frame_stats['min']:.6f} seconds\n"
+            report += f"  Total Frames: {frame_stats['count']}\n"
+            
+            # Full-match simulation cost, when the match was recorded to an archive
+            step_times = getattr(player_movement_data[mode], "step_time", None)
+            if step_times is not None and len(step_times) and not np.isnan(step_times).all():
+                report += f"  Recorded Ticks: {len(step_times)} (full match)\n"
+                report += f"  Average Step Time: {np.nanmean(step_times):.6f} seconds\n"
+                report += f"  Maximum Step Time: {np.nanmax(step_times):.6f} seconds\n"
             
             # Game statistics
             stats = game_stats[mode]
@@ -129,23 +174,12 @@ def generate_comparison_report(time_data, game_stats, player_movement_data):
             report += f"  Match Duration: {stats['match_duration']:.2f} seconds\n"
             
             # Player movement analysis
-            if player_movement_data[mode]:
-                total_distance = 0
-                for i in range(1, len(player_movement_data[mode])):
-                    frame_data = player_movement_data[mode][i]
-                    prev_frame_data = player_movement_data[mode][i-1]
-                    
-                    for j in range(len(frame_data["blue_players"])):
-                        dx = frame_data["blue_players"][j][0] - prev_frame_data["blue_players"][j][0]
-                        dy = frame_data["blue_players"][j][1] - prev_frame_data["blue_players"][j][1]
-                        total_distance += math.sqrt(dx*dx + dy*dy)
-                    
-                    for j in range(len(frame_data["red_players"])):
-                        dx = frame_data["red_players"][j][0] - prev_frame_data["red_players"][j][0]
-                        dy = frame_data["red_players"][j][1] - prev_frame_data["red_players"][j][1]
-                        total_distance += math.sqrt(dx*dx + dy*dy)
-                
-                report += f"  Total Player Distance: {total_distance:.2f} pixels\n"
+            movement = analytics[mode]
+            if movement:
+                report += f"  Total Player Distance: {movement['total_distance']:.2f} pixels\n"
+                for team in ("blue", "red"):
+                    report += (f"  {team.title()} Distance: {movement['team_distance'][team]:.2f} pixels, "
+                               f"avg speed {movement['team_mean_speed'][team]:.1f} px/s\n")
             
             report += "\n"
     
@@ -156,14 +190,14 @@ def generate_comparison_report(time_data, game_stats, player_movement_data):
     modes_with_data = [mode for mode in time_data.keys() if time_data[mode]]
     if len(modes_with_data) > 1:
         # Find best performing mode (lowest average frame time)
-        best_mode = min(modes_with_data, key=lambda x: np.mean(time_data[x]))
+        best_mode = min(modes_with_data, key=lambda x: time_data[x].stats.mean)
         report += f"Most Efficient Mode: {best_mode.replace('_', ' ').title()}\n"
         
         # Compare frame times
         report += "Frame Time Comparison:\n"
         for mode in modes_with_data:
-            avg = np.mean(time_data[mode])
-            report += f"  {mode.replace('_', ' ').title()}: {avg:.6f}s\n"
+            stats = time_data[mode].stats
+            report += f"  {mode.replace('_', ' ').title()}: {stats.mean:.6f}s average, {stats.percentile(99):.6f}s p99\n"
         
         # Compare game activity
         report += "Game Activity Comparison:\n"
@@ -177,7 +211,7 @@ def generate_comparison_report(time_data, game_stats, player_movement_data):
     
     return report
 
-def export_comparison_report(time_data, game_stats, player_movement_data):
+def export_comparison_report(time_data, game_stats, player_movement_data, analytics=None):
     """Export the comparison report to a text file"""
     try:
         # Create directory if it doesn't exist
@@ -187,7 +221,7 @@ def export_comparison_report(time_data, game_stats, player_movement_data):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"reports/comparison_report_{timestamp}.txt"
         
-        report = generate_comparison_report(time_data, game_stats, player_movement_data)
+        report = generate_comparison_report(time_data, game_stats, player_movement_data, analytics)
         
         with open(filename, 'w') as f:
             f.write(report)
@@ -198,13 +232,28 @@ def export_comparison_report(time_data, game_stats, player_movement_data):
         print(f"Error exporting comparison report: {e}")
         return None
 
-def generate_performance_report(time_data, player_movement_data, ball_position_data):
-    """Generate a performance report with graphs for all modes"""
+def render_performance_report(time_data, player_movement_data, analytics=None):
+    """Draw the performance report graphs for all modes into an RGBA image.
+
+    Returns (rgba_bytes, (width, height)), or None without any frame times.
+    Needs no display, so it can run on the export worker; the result is
+    picklable and turned into a surface by performance_report_surface().
+    """
     if not any(time_data.values()):
         return None
+    if analytics is None:
+        analytics = analyze_all_modes(player_movement_data)
+
+    # matplotlib is the slowest import in the game by far, so it is only
+    # loaded once a report is actually drawn, not at startup. A bare Figure
+    # on the Agg canvas avoids pyplot's global figure state and GUI backends.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
     
     # Create a figure with subplots
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    fig = Figure(figsize=(12, 10))
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 2)
     fig.suptitle('Performance Analysis - All Modes', fontsize=16)
     
     colors = ['blue', 'red', 'green']
@@ -221,30 +270,10 @@ def generate_performance_report(time_data, player_movement_data, ball_position_d
     
     # Player movement analysis subplot
     for i, mode in enumerate(modes):
-        if player_movement_data[mode]:
-            # Calculate total distance traveled by all players
-            total_distances = []
-            for j in range(1, len(player_movement_data[mode])):
-                frame_data = player_movement_data[mode][j]
-                prev_frame_data = player_movement_data[mode][j-1]
-                frame_distance = 0
-                
-                # Calculate distance for blue players
-                for k in range(len(frame_data["blue_players"])):
-                    dx = frame_data["blue_players"][k][0] - prev_frame_data["blue_players"][k][0]
-                    dy = frame_data["blue_players"][k][1] - prev_frame_data["blue_players"][k][1]
-                    frame_distance += math.sqrt(dx*dx + dy*dy)
-                
-                # Calculate distance for red players
-                for k in range(len(frame_data["red_players"])):
-                    dx = frame_data["red_players"][k][0] - prev_frame_data["red_players"][k][0]
-                    dy = frame_data["red_players"][k][1] - prev_frame_data["red_players"][k][1]
-                    frame_distance += math.sqrt(dx*dx + dy*dy)
-                
-                total_distances.append(frame_distance)
-            
-            if total_distances:
-                axes[0, 1].plot(range(len(total_distances)), total_distances, color=colors[i], linewidth=2, label=mode)
+        if analytics[mode]:
+            # Total distance traveled by all players in each frame
+            total_distances = analytics[mode]["frame_distance"]
+            axes[0, 1].plot(range(len(total_distances)), total_distances, color=colors[i], linewidth=2, label=mode)
     
     axes[0, 1].set_title('Player Movement Analysis')
     axes[0, 1].set_ylabel('Distance per Frame (pixels)')
@@ -253,10 +282,9 @@ def generate_performance_report(time_data, player_movement_data, ball_position_d
     
     # Ball position heatmap subplot
     for i, mode in enumerate(modes):
-        if ball_position_data[mode]:
-            ball_x = [pos[0] for pos in ball_position_data[mode]]
-            ball_y = [pos[1] for pos in ball_position_data[mode]]
-            axes[1, 0].scatter(ball_x, ball_y, color=colors[i], alpha=0.5, label=mode, s=1)
+        telemetry = player_movement_data[mode]
+        if telemetry:
+            axes[1, 0].scatter(telemetry.ball_x, telemetry.ball_y, color=colors[i], alpha=0.5, label=mode, s=1)
     
     axes[1, 0].set_title('Ball Position Heatmap')
     axes[1, 0].set_xlabel('X Position')
@@ -268,14 +296,12 @@ def generate_performance_report(time_data, player_movement_data, ball_position_d
     stats_data = []
     for mode in modes:
         if time_data[mode]:
-            avg_time = np.mean(time_data[mode])
-            max_time = np.max(time_data[mode])
-            min_time = np.min(time_data[mode])
-            stats_data.append([mode, avg_time, max_time, min_time])
+            stats = time_data[mode].stats
+            stats_data.append([mode, stats.mean, stats.percentile(99)])
     
     if stats_data:
-        stats_labels = [f"{mode}\nAvg: {avg:.4f}s" for mode, avg, max_t, min_t in stats_data]
-        stats_values = [avg for mode, avg, max_t, min_t in stats_data]
+        stats_labels = [f"{mode}\nAvg: {avg:.4f}s\np99: {p99:.4f}s" for mode, avg, p99 in stats_data]
+        stats_values = [avg for mode, avg, p99 in stats_data]
         bars = axes[1, 1].bar(stats_labels, stats_values, color=colors[:len(stats_data)])
         axes[1, 1].set_title('Average Frame Time by Mode')
         axes[1, 1].set_ylabel('Time (s)')
@@ -286,23 +312,24 @@ def generate_performance_report(time_data, player_movement_data, ball_position_d
             axes[1, 1].text(bar.get_x() + bar.get_width()/2., height + 0.0001,
                            f'{val:.4f}s', ha='center', va='bottom', fontsize=8)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    # Convert the figure to a Pygame surface
-    canvas = FigureCanvasAgg(fig)
+    # Rasterize (tostring_rgb is gone from newer matplotlib; buffer_rgba is not)
     canvas.draw()
-    renderer = canvas.get_renderer()
-    raw_data = renderer.tostring_rgb()
-    
-    # Create Pygame surface
-    size = canvas.get_width_height()
-    surf = pygame.image.fromstring(raw_data, size, "RGB")
-    
-    plt.close(fig)
-    
-    return surf
+    return bytes(canvas.buffer_rgba()), canvas.get_width_height()
 
-def export_performance_data(time_data, player_movement_data, ball_position_data, game_stats):
+def performance_report_surface(image):
+    """Turn a render_performance_report() image into a Pygame surface (None stays None)"""
+    if image is None:
+        return None
+    raw_data, size = image
+    return pygame.image.fromstring(raw_data, size, "RGBA")
+
+def generate_performance_report(time_data, player_movement_data, analytics=None):
+    """Generate a performance report with graphs for all modes, as a Pygame surface"""
+    return performance_report_surface(render_performance_report(time_data, player_movement_data, analytics))
+
+def export_performance_data(time_data, player_movement_data, game_stats):
     """Export performance data to CSV files"""
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -311,7 +338,7 @@ def export_performance_data(time_data, player_movement_data, ball_position_data,
         if not os.path.exists("performance_data"):
             os.makedirs("performance_data")
         
-        # Export time complexity data
+        # Export time complexity data (recent frames) and the whole-match frame time histogram
         for mode, data in time_data.items():
             if data:
                 filename = f"performance_data/{mode}time{timestamp}.csv"
@@ -320,49 +347,61 @@ def export_performance_data(time_data, player_movement_data, ball_position_data,
                     writer.writerow(['Frame', 'Time (s)'])
                     for i, val in enumerate(data):
                         writer.writerow([i, val])
+
+                stats = data.stats
+                filename = f"performance_data/{mode}time_histogram{timestamp}.csv"
+                with open(filename, 'w', newline='') as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(['Lower (s)', 'Upper (s)', 'Frames'])
+                    writer.writerows((*stats.bucket_bounds(bucket), frames)
+                                     for bucket, frames in enumerate(stats.histogram) if frames)
         
         # Export player movement data
         for mode, data in player_movement_data.items():
             if data:
+                header = ['Frame', 'Time']
+                columns = [data.frame.tolist(), data.time.tolist()]
+                player_x, player_y = data.player_x, data.player_y
+                for k in range(data.n_players):
+                    team = "Blue" if k < data.team_size else "Red"
+                    number = k % data.team_size + 1
+                    header += [f'{team}{number}_X', f'{team}{number}_Y']
+                    columns += [player_x[k].tolist(), player_y[k].tolist()]
+                header += ['Ball_X', 'Ball_Y']
+                columns += [data.ball_x.tolist(), data.ball_y.tolist()]
+                
                 filename = f"performance_data/{mode}movement{timestamp}.csv"
                 with open(filename, 'w', newline='') as csvfile:
                     writer = csv.writer(csvfile)
-                    writer.writerow(['Frame', 'Time', 'Blue1_X', 'Blue1_Y', 'Blue2_X', 'Blue2_Y', 
-                                   'Red1_X', 'Red1_Y', 'Red2_X', 'Red2_Y', 'Ball_X', 'Ball_Y'])
-                    for frame_data in data:
-                        row = [frame_data["frame"], frame_data["time"]]
-                        for pos in frame_data["blue_players"]:
-                            row.extend(pos)
-                        for pos in frame_data["red_players"]:
-                            row.extend(pos)
-                        row.extend(frame_data["ball_position"])
-                        writer.writerow(row)
+                    writer.writerow(header)
+                    writer.writerows(zip(*columns))
         
-        # Export ball position data
-        for mode, data in ball_position_data.items():
+        # Export ball position and velocity data
+        for mode, data in player_movement_data.items():
             if data:
                 filename = f"performance_data/{mode}ball{timestamp}.csv"
                 with open(filename, 'w', newline='') as csvfile:
                     writer = csv.writer(csvfile)
-                    writer.writerow(['Frame', 'Ball_X', 'Ball_Y'])
-                    for i, pos in enumerate(data):
-                        writer.writerow([i, pos[0], pos[1]])
+                    writer.writerow(['Frame', 'Ball_X', 'Ball_Y', 'Ball_VX', 'Ball_VY'])
+                    writer.writerows(zip(data.frame.tolist(), data.ball_x.tolist(), data.ball_y.tolist(),
+                                         data.ball_vx.tolist(), data.ball_vy.tolist()))
         
         # Export summary statistics
         summary_filename = f"performance_data/summary_{timestamp}.csv"
         with open(summary_filename, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
-            writer.writerow(['Mode', 'Frames', 'Avg Time (s)', 'Max Time (s)', 'Min Time (s)', 'Total Goals', 'Blue Possession', 'Red Possession'])
+            writer.writerow(['Mode', 'Frames', 'Avg Time (s)', 'Max Time (s)', 'Min Time (s)', 'Total Goals', 'Blue Possession', 'Red Possession',
+                             'Std Time (s)', 'P50 Time (s)', 'P95 Time (s)', 'P99 Time (s)', 'P99.9 Time (s)'])
             
             for mode in time_data.keys():
                 if time_data[mode]:
-                    avg_time = np.mean(time_data[mode])
-                    max_time = np.max(time_data[mode])
-                    min_time = np.min(time_data[mode])
+                    frame_stats = time_data[mode].stats.summary()
                     total_goals = game_stats[mode]["goals"]
                     blue_possession = game_stats[mode]["possession_time"]["blue"]
                     red_possession = game_stats[mode]["possession_time"]["red"]
-                    writer.writerow([mode, len(time_data[mode]), avg_time, max_time, min_time, total_goals, blue_possession, red_possession])
+                    writer.writerow([mode, frame_stats["count"], frame_stats["mean"], frame_stats["max"], frame_stats["min"],
+                                     total_goals, blue_possession, red_possession, frame_stats["std"],
+                                     frame_stats["p50"], frame_stats["p95"], frame_stats["p99"], frame_stats["p99.9"]])
         
         print(f"Performance data exported to performance_data/ directory with timestamp {timestamp}")
         return timestamp
@@ -370,27 +409,26 @@ def export_performance_data(time_data, player_movement_data, ball_position_data,
         print(f"Error exporting performance data: {e}")
         return None
 
-def draw_performance_report(screen, report_surface, blue_score, red_score):
-    """Draw the performance report on screen"""
-    if report_surface:
-        # Draw semi-transparent background
-        s = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 200))
-        screen.blit(s, (0, 0))
-        
-        # Draw report
-        screen.blit(report_surface, (WIDTH//2 - report_surface.get_width()//2, 
-                                    HEIGHT//2 - report_surface.get_height()//2))
+def export_match_archives(player_movement_data, game_stats, timestamp=None):
+    """Export each mode's telemetry as a binary match archive (memory-mappable columns)"""
+    try:
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Draw close button
-        pygame.draw.rect(screen, RED, (WIDTH//2 - 50, HEIGHT - 100, 100, 40))
-        close_text = font.render("Close", True, WHITE)
-        screen.blit(close_text, (WIDTH//2 - close_text.get_width()//2, HEIGHT - 100 + 20 - close_text.get_height()//2))
+        # Create directory if it doesn't exist
+        if not os.path.exists("performance_data"):
+            os.makedirs("performance_data")
         
-        # Draw match stats
-        stats_text = font.render(f"Final Score: Blue {blue_score} - Red {red_score}", True, WHITE)
-        screen.blit(stats_text, (WIDTH//2 - stats_text.get_width()//2, 20))
+        for mode, data in player_movement_data.items():
+            if isinstance(data, MatchArchive):
+                print(f"{mode} is already recorded in full: {data.path}")
+            elif data:
+                path = f"performance_data/{mode}_{timestamp}.match"
+                with ArchiveWriter(path, data.team_size, {"mode": mode, "stats": game_stats[mode]}) as archive:
+                    # A snapshot holds at most one buffer of frames; archive all of them
+                    archive.append_all(data)
         
-        # Draw export message
-        export_text = small_font.render("Performance data and comparison report exported", True, YELLOW)
-        screen.blit(export_text, (WIDTH//2 - export_text.get_width()//2, HEIGHT - 130))
\ No newline at end of file
+        print(f"Match archives exported to performance_data/ directory with timestamp {timestamp}")
+        return timestamp
+    except Exception as e:
+        print(f"Error exporting match archives: {e}")
+        return None
@@ -0,0 +1,82 @@
+"""
+Export Worker Module
+Runs report and data exports in a background process so file I/O never stalls the game loop.
+"""
+
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+def _lower_priority():
+    """Worker initializer: let the game loop win any contention for the CPU"""
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+class ExportWorker:
+    """Single background process that runs export jobs, with a bounded backlog.
+
+    The game loop snapshots the data it wants exported and submits a job;
+    submit() never blocks. When ``max_pending`` jobs are already queued or
+    running, the new job is rejected rather than queued. Finished and failed
+    jobs are reported through poll() as (status, message) pairs, where status
+    is "done" or "error". Job functions and their arguments must be picklable.
+
+    A process (not a thread) keeps CSV formatting and matplotlib off the
+    game's GIL. It is started up front, at low priority, so the first export
+    does not pay the process start-up cost on the game loop.
+    """
+
+    def __init__(self, max_pending=2):
+        self.max_pending = max_pending
+        self._futures = set()
+        self._notifications = queue.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=1, initializer=_lower_priority,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._executor.submit(os.getpid)  # start the worker process now
+
+    def submit(self, description, func, *args, notify=True):
+        """Queue ``func(*args)`` for the worker and return its Future, or None if the backlog is full.
+
+        With ``notify=False`` only failures are reported through poll(); the
+        caller picks the result up from the Future (e.g. a rendered image).
+        """
+        self._futures = {future for future in self._futures if not future.done()}
+        if len(self._futures) >= self.max_pending:
+            self._notifications.put(("error", f"{description} skipped: exports already in progress"))
+            return None
+
+        future = self._executor.submit(func, *args)
+        self._futures.add(future)
+        future.add_done_callback(partial(self._finished, description, notify))
+        return future
+
+    def pending(self):
+        """Number of jobs queued or running"""
+        return sum(not future.done() for future in self._futures)
+
+    def poll(self):
+        """Return the notifications produced since the last call"""
+        notifications = []
+        while True:
+            try:
+                notifications.append(self._notifications.get_nowait())
+            except queue.Empty:
+                return notifications
+
+    def close(self):
+        """Finish the submitted jobs and stop the worker process"""
+        self._executor.shutdown(wait=True)
+
+    def _finished(self, description, notify, future):
+        """Done-callback: turn a job's outcome into a notification"""
+        try:
+            result = future.result()
+        except Exception as e:
+            self._notifications.put(("error", f"{description} failed: {e}"))
+            return
+        if not notify:
+            return
+        message = f"{description} done" if result is None else f"{description} done: {result}"
+        self._notifications.put(("done", message))
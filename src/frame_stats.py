@@ -0,0 +1,148 @@
+"""
+Frame Statistics Module
+Streaming frame-time statistics for a whole match in constant memory:
+Welford mean/variance plus a fixed-bucket logarithmic histogram for percentiles.
+"""
+
+import math
+from collections import deque
+
+# Percentiles shown by the reports and the on-screen graph
+PERCENTILES = (50, 95, 99, 99.9)
+
+class StreamingStats:
+    """Count, mean, variance, min and max (Welford's method) and a log-bucket histogram.
+
+    add() is O(1) and allocates nothing, and memory never grows: the
+    histogram has ``buckets_per_decade`` buckets per factor of ten between
+    ``low`` and ``high`` seconds, plus one underflow and one overflow bucket.
+    percentile() returns the geometric middle of the bucket holding the
+    requested rank, clamped to the observed min and max, so it is within half
+    a bucket width (about 2.3% with 50 buckets per decade) of the exact value.
+    """
+
+    def __init__(self, low=1e-6, high=10.0, buckets_per_decade=50):
+        self.low = low
+        self.high = high
+        self.buckets_per_decade = buckets_per_decade
+        self.n_buckets = math.ceil(math.log10(high / low) * buckets_per_decade)
+        self._log_low = math.log(low)
+        self._scale = buckets_per_decade / math.log(10)  # buckets per unit of natural log
+        self.clear()
+
+    def clear(self):
+        """Forget all samples"""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram = [0] * (self.n_buckets + 2)  # underflow, buckets, overflow
+
+    def add(self, value):
+        """Record one sample"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value < self.low:
+            bucket = 0
+        else:
+            bucket = int((math.log(value) - self._log_low) * self._scale) + 1
+            if bucket > self.n_buckets:
+                bucket = self.n_buckets + 1
+        self.histogram[bucket] += 1
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def variance(self):
+        """Sample variance (0 with fewer than two samples)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        """Sample standard deviation"""
+        return math.sqrt(self.variance)
+
+    def bucket_bounds(self, bucket):
+        """(lower, upper) value range of histogram bucket ``bucket``"""
+        if bucket == 0:
+            return (-math.inf, self.low)
+        if bucket > self.n_buckets:
+            return (self.high, math.inf)
+        return (self.low * math.exp((bucket - 1) / self._scale), self.low * math.exp(bucket / self._scale))
+
+    def percentiles(self, qs=PERCENTILES):
+        """Map each percentile in ``qs`` to its estimate, in one pass over the histogram"""
+        if not self.count:
+            return {q: math.nan for q in qs}
+        targets = sorted(qs)
+        ranks = [max(1, math.ceil(q / 100 * self.count)) for q in targets]  # 1-based sample ranks
+        results = {}
+        seen = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while len(results) < len(ranks) and seen >= ranks[len(results)]:
+                if bucket == 0:
+                    estimate = self.min
+                elif bucket > self.n_buckets:
+                    estimate = self.max
+                else:
+                    lower, upper = self.bucket_bounds(bucket)
+                    estimate = math.sqrt(lower * upper)
+                results[targets[len(results)]] = min(max(estimate, self.min), self.max)
+            if len(results) == len(ranks):
+                break
+        return {q: results[q] for q in qs}
+
+    def percentile(self, q):
+        """Estimate of the ``q``-th percentile (0-100)"""
+        return self.percentiles((q,))[q]
+
+    def summary(self):
+        """Dict of count, mean, std, min, max and the standard percentiles (p50 ... p99.9)"""
+        summary = {"count": self.count, "mean": self.mean, "std": self.std,
+                   "min": self.min if self.count else math.nan, "max": self.max if self.count else math.nan}
+        for q, value in self.percentiles().items():
+            summary[f"p{q:g}"] = value
+        return summary
+
+class FrameTimes:
+    """Frame times of one mode: the recent window for the graph, whole-match stats for the reports.
+
+    Drop-in for the deque(maxlen=200) it replaced: append(), clear(), len(),
+    iteration and indexing cover the ``window`` most recent samples, while
+    ``stats`` (a StreamingStats) covers every sample since the last clear().
+    """
+
+    def __init__(self, window=200):
+        self.recent = deque(maxlen=window)
+        self.stats = StreamingStats()
+
+    def append(self, value):
+        """Record one frame time"""
+        self.recent.append(value)
+        self.stats.add(value)
+
+    def clear(self):
+        """Forget all frame times"""
+        self.recent.clear()
+        self.stats.clear()
+
+    def __len__(self):
+        return len(self.recent)
+
+    def __iter__(self):
+        return iter(self.recent)
+
+    def __getitem__(self, index):
+        return self.recent[index]
@@ -0,0 +1,66 @@
+"""
+Game Constants Module
+Contains all display-independent game constants, color definitions and audience setup.
+Safe to import on machines without a display (no pygame initialization happens here).
+"""
+
+import random
+
+# Screen dimensions
+WIDTH, HEIGHT = 1000, 600
+
+# Colors
+WHITE = (255, 255, 255)
+BLUE = (50, 100, 255)
+RED = (255, 50, 50)
+GREEN = (50, 180, 50)
+BLACK = (0, 0, 0)
+YELLOW = (255, 255, 0)
+DARK_GREEN = (0, 150, 0)
+LIGHT_GREEN = (100, 200, 100)
+GRAY = (150, 150, 150)
+DARK_GRAY = (50, 50, 50)
+BROWN = (139, 69, 19)
+SKIN = (240, 200, 150)
+LIGHT_BLUE = (135, 206, 250)
+
+# Game objects dimensions
+BALL_RADIUS = 15
+PLAYER_RADIUS = 18
+PLAYER_SPEED = 4
+BALL_SPEED = 5
+FRICTION = 0.98
+
+# Stadium dimensions
+FIELD_WIDTH, FIELD_HEIGHT = 800, 450
+FIELD_X, FIELD_Y = (WIDTH - FIELD_WIDTH) // 2, (HEIGHT - FIELD_HEIGHT) // 2
+GOAL_TOP, GOAL_BOTTOM = FIELD_Y + 140, FIELD_Y + 310  # goal mouth on both goal lines (ball center)
+
+# Game timing
+FPS = 60  # simulation ticks per second of match time
+MATCH_DURATION = 180  # seconds
+goal_delay = 60  # frames to wait after goal
+
+# The AI plans its targets every AI_PLAN_INTERVAL ticks (10 Hz) and steers toward them every tick
+AI_PLAN_INTERVAL = FPS // 10
+
+# Most player contacts advance_ball follows in one step; a ball still moving after that stops for the step
+SWEEP_MAX_CONTACTS = 16
+
+# Audience setup
+def create_audience(rng=random):
+    """Create audience members around the stadium (``rng``: a match's random.Random)"""
+    audience = []
+    for i in range(150):
+        x = rng.randint(0, WIDTH)
+        y = rng.randint(0, FIELD_Y - 20)
+        color = rng.choice([RED, BLUE, WHITE, YELLOW, BROWN, SKIN, LIGHT_BLUE])
+        audience.append((x, y, color, rng.choice([0, 1, 2])))
+
+    for i in range(150):
+        x = rng.randint(0, WIDTH)
+        y = rng.randint(FIELD_Y + FIELD_HEIGHT + 10, HEIGHT)
+        color = rng.choice([RED, BLUE, WHITE, YELLOW, BROWN, SKIN, LIGHT_BLUE])
+        audience.append((x, y, color, rng.choice([0, 1, 2])))
+    
+    return audience
@@ -1,256 +1,187 @@
 """
 Game Rules Module
 Handles goals, set pieces, out-of-bounds logic, and game state management.
+All functions operate on a GameState (float center coordinates).
 """
 
-import pygame
-import random
 import sys
 import os
 
 # Import from the same directory
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from game_config import *
+from game_constants import *
 from physics import reset_positions, reset_team_positions
 
-def handle_out_of_bounds(ball, ball_vel, blue_team, red_team, blue_score, red_score, 
-                        last_touch, game_stats, current_mode, audience, cheer_sound):
-    """Handle when ball touches court border - trigger foul immediately"""
-    set_piece_timer = 0
-    set_piece_type = None
-    set_piece_team = None
-    goal_timer = 0
-    set_piece_start_positions = {"blue": [], "red": []}
+def cheer(state, probability, excitement, cheer_sound=None):
+    """Make a random share of the audience cheer (1) or get excited (2)"""
+    audience = state.audience
+    rng = state.rng
+    changed = False
+    for i in range(len(audience)):
+        if rng.random() < probability and audience[i][3] != excitement:
+            audience[i] = (audience[i][0], audience[i][1], audience[i][2], excitement)
+            changed = True
+    if changed:
+        # Only a real change invalidates the cached background and redraws the stands
+        state.audience_version += 1
+    if cheer_sound:
+        cheer_sound.play()
+
+def start_set_piece(state, set_piece_type, set_piece_team):
+    """Stop the ball and hand the restart to a team"""
+    state.set_piece_type = set_piece_type
+    state.set_piece_team = set_piece_team
+    state.ball.vx, state.ball.vy = 0, 0
+    state.replan()
+
+def handle_out_of_bounds(state, game_stats, cheer_sound=None):
+    """Handle when ball touches court border - trigger foul immediately.
+
+    Returns "goal", "set_piece" or "in_play" and updates the state in place.
+    """
+    ball = state.ball
+    blue_team, red_team = state.blue_team, state.red_team
 
     # Check if ball touches any border line (trigger foul immediately on contact)
-    if ball.left <= FIELD_X or ball.right >= FIELD_X + FIELD_WIDTH or \
-       ball.top <= FIELD_Y or ball.bottom >= FIELD_Y + FIELD_HEIGHT:
-        
-        # Store the current ball position for exact placement
-        out_x, out_y = ball.centerx, ball.centery
-        
-        # Determine what happened based on where ball went out
-        if ball.left <= FIELD_X:  # Out on left side
-            # Check for goal first - make goal area larger for better detection
-            if FIELD_Y + 140 < ball.centery < FIELD_Y + 310:  # Goal area (made larger)
+    left = ball.x - BALL_RADIUS <= FIELD_X
+    right = ball.x + BALL_RADIUS >= FIELD_X + FIELD_WIDTH
+    if not (left or right or ball.y - BALL_RADIUS <= FIELD_Y or ball.y + BALL_RADIUS >= FIELD_Y + FIELD_HEIGHT):
+        return "in_play"
+
+    # Store the current ball position for exact placement
+    out_x, out_y = ball.x, ball.y
+
+    # Determine what happened based on where ball went out
+    if left or right:
+        # Check for goal first - make goal area larger for better detection
+        if GOAL_TOP < ball.y < GOAL_BOTTOM:  # Goal area (made larger)
+            if left:
                 # GOAL for RED team! Ball went into blue's goal
-                red_score += 1
-                game_stats[current_mode]["goals"] += 1
-                goal_timer = goal_delay
-                print(f"GOAL! Red team scores! Score: Blue {blue_score} - Red {red_score}")
-                
-                # Goal celebration
-                for i in range(len(audience)):
-                    if random.random() < 0.7:  # 70% chance to cheer for goal
-                        audience[i] = (audience[i][0], audience[i][1], audience[i][2], 2)  # Excited state
-                if cheer_sound:
-                    cheer_sound.play()
-                
-                # Midfield restart - reset to center, blue team gets kick-off (team that conceded)
-                reset_positions(ball, ball_vel, blue_team, red_team)
-                set_piece_type = "kick_off"
-                set_piece_team = "blue"  # Blue team gets the kick-off after conceding
-                ball.centerx = WIDTH//2
-                ball.centery = HEIGHT//2
-                ball_vel[0], ball_vel[1] = 0, 0  # Stop ball completely for kick-off
-                
-                # Record starting positions for movement detection
-                set_piece_start_positions = {
-                    "blue": [(p.centerx, p.centery) for p in blue_team],
-                    "red": [(p.centerx, p.centery) for p in red_team]
-                }
-                return "goal", set_piece_type, set_piece_team, set_piece_timer, set_piece_start_positions, goal_timer, blue_score, red_score
+                state.red_score += 1
+                kick_off_team = "blue"  # Blue team gets the kick-off after conceding
+                print(f"GOAL! Red team scores! Score: Blue {state.blue_score} - Red {state.red_score}")
             else:
-                # Ball crossed blue's goal line (not in goal) - corner kick or goal kick
-                if last_touch == "red":
-                    # Red touched last - GOAL KICK for blue team
-                    set_piece_type = "goal_kick"
-                    set_piece_team = "blue"
-                    ball.centerx = FIELD_X + 30
-                    ball.centery = FIELD_Y + FIELD_HEIGHT // 2
-                    reset_team_positions(red_team, is_red_team=True)
-                    blue_team[0].centerx = ball.centerx
-                    blue_team[0].centery = ball.centery - 30
-                    print("Goal kick for Blue team!")
-                else:
-                    # Blue touched last - CORNER KICK for red team
-                    set_piece_type = "corner_kick"
-                    set_piece_team = "red"
-                    if out_y < FIELD_Y + FIELD_HEIGHT // 2:
-                        ball.centerx = FIELD_X + 15  # Top-left corner
-                        ball.centery = FIELD_Y + 15
-                    else:
-                        ball.centerx = FIELD_X + 15  # Bottom-left corner
-                        ball.centery = FIELD_Y + FIELD_HEIGHT - 15
-                    reset_team_positions(blue_team, is_red_team=False)
-                    red_team[0].centerx = ball.centerx + 20
-                    red_team[0].centery = ball.centery
-                    print("Corner kick for Red team!")
-                
-                set_piece_timer = 0
-                ball_vel[0], ball_vel[1] = 0, 0
-                set_piece_start_positions = {
-                    "blue": [(p.centerx, p.centery) for p in blue_team],
-                    "red": [(p.centerx, p.centery) for p in red_team]
-                }
-                return "set_piece", set_piece_type, set_piece_team, set_piece_timer, set_piece_start_positions, goal_timer, blue_score, red_score
-                    
-        elif ball.right >= FIELD_X + FIELD_WIDTH:  # Out on right side
-            # Check for goal first - make goal area larger for better detection
-            if FIELD_Y + 140 < ball.centery < FIELD_Y + 310:  # Goal area (made larger)
                 # GOAL for BLUE team! Ball went into red's goal
-                blue_score += 1
-                game_stats[current_mode]["goals"] += 1
-                goal_timer = goal_delay
-                print(f"GOAL! Blue team scores! Score: Blue {blue_score} - Red {red_score}")
-                
-                # Goal celebration
-                for i in range(len(audience)):
-                    if random.random() < 0.7:  # 70% chance to cheer for goal
-                        audience[i] = (audience[i][0], audience[i][1], audience[i][2], 2)  # Excited state
-                if cheer_sound:
-                    cheer_sound.play()
-                
-                # Midfield restart - reset to center, red team gets kick-off (team that conceded)
-                reset_positions(ball, ball_vel, blue_team, red_team)
-                set_piece_type = "kick_off"
-                set_piece_team = "red"  # Red team gets the kick-off after conceding
-                ball.centerx = WIDTH//2
-                ball.centery = HEIGHT//2
-                ball_vel[0], ball_vel[1] = 0, 0  # Stop ball completely for kick-off
-                
-                # Record starting positions for movement detection
-                set_piece_start_positions = {
-                    "blue": [(p.centerx, p.centery) for p in blue_team],
-                    "red": [(p.centerx, p.centery) for p in red_team]
-                }
-                return "goal", set_piece_type, set_piece_team, set_piece_timer, set_piece_start_positions, goal_timer, blue_score, red_score
+                state.blue_score += 1
+                kick_off_team = "red"  # Red team gets the kick-off after conceding
+                print(f"GOAL! Blue team scores! Score: Blue {state.blue_score} - Red {state.red_score}")
+            game_stats[state.mode]["goals"] += 1
+            state.goal_timer = goal_delay
+
+            # Goal celebration - 70% chance to cheer for goal
+            cheer(state, 0.7, 2, cheer_sound)
+
+            # Midfield restart - reset to center, team that conceded gets kick-off
+            reset_positions(state)
+            start_set_piece(state, "kick_off", kick_off_team)  # Stop ball completely for kick-off
+            return "goal"
+
+        if left:
+            # Ball crossed blue's goal line (not in goal) - corner kick or goal kick
+            if state.last_touch == "red":
+                # Red touched last - GOAL KICK for blue team
+                start_set_piece(state, "goal_kick", "blue")
+                ball.x = FIELD_X + 30
+                ball.y = FIELD_Y + FIELD_HEIGHT // 2
+                reset_team_positions(red_team, is_red_team=True)
+                blue_team[0].x = ball.x
+                blue_team[0].y = ball.y - 30
+                print("Goal kick for Blue team!")
             else:
-                # Ball crossed red's goal line (not in goal) - corner kick or goal kick
-                if last_touch == "blue":
-                    # Blue touched last - GOAL KICK for red team
-                    set_piece_type = "goal_kick"
-                    set_piece_team = "red"
-                    ball.centerx = FIELD_X + FIELD_WIDTH - 30
-                    ball.centery = FIELD_Y + FIELD_HEIGHT // 2
-                    reset_team_positions(blue_team, is_red_team=False)
-                    red_team[0].centerx = ball.centerx
-                    red_team[0].centery = ball.centery - 30
-                    print("Goal kick for Red team!")
-                else:
-                    # Red touched last - CORNER KICK for blue team
-                    set_piece_type = "corner_kick"
-                    set_piece_team = "blue"
-                    if out_y < FIELD_Y + FIELD_HEIGHT // 2:
-                        ball.centerx = FIELD_X + FIELD_WIDTH - 15  # Top-right corner
-                        ball.centery = FIELD_Y + 15
-                    else:
-                        ball.centerx = FIELD_X + FIELD_WIDTH - 15  # Bottom-right corner
-                        ball.centery = FIELD_Y + FIELD_HEIGHT - 15
-                    reset_team_positions(red_team, is_red_team=True)
-                    blue_team[0].centerx = ball.centerx - 20
-                    blue_team[0].centery = ball.centery
-                    print("Corner kick for Blue team!")
-                
-                set_piece_timer = 0
-                ball_vel[0], ball_vel[1] = 0, 0
-                set_piece_start_positions = {
-                    "blue": [(p.centerx, p.centery) for p in blue_team],
-                    "red": [(p.centerx, p.centery) for p in red_team]
-                }
-                return "set_piece", set_piece_type, set_piece_team, set_piece_timer, set_piece_start_positions, goal_timer, blue_score, red_score
-                    
-        elif ball.centery <= FIELD_Y:  # Out on top
-            # Place ball slightly inside field
-            ball.centerx = max(FIELD_X + BALL_RADIUS, min(FIELD_X + FIELD_WIDTH - BALL_RADIUS, out_x))
-            ball.centery = FIELD_Y + BALL_RADIUS + 15
-            set_piece_type = "throw_in"
-            # Opposite team of who last touched gets the ball
-            set_piece_team = "red" if last_touch == "blue" else "blue"
-            # Reset the team that caused the ball to go out
-            if last_touch == "blue":
+                # Blue touched last - CORNER KICK for red team
+                start_set_piece(state, "corner_kick", "red")
+                ball.x = FIELD_X + 15  # Left corner
+                ball.y = FIELD_Y + 15 if out_y < FIELD_Y + FIELD_HEIGHT // 2 else FIELD_Y + FIELD_HEIGHT - 15
                 reset_team_positions(blue_team, is_red_team=False)
-                # Bring red player to ball position
-                red_team[0].centerx = ball.centerx
-                red_team[0].centery = ball.centery - (PLAYER_RADIUS + BALL_RADIUS + 10)
-                print("Blue team sent back - Red player positioned at ball location")
-            else:
-                reset_team_positions(red_team, is_red_team=True)
-                # Bring blue player to ball position
-                blue_team[0].centerx = ball.centerx
-                blue_team[0].centery = ball.centery - (PLAYER_RADIUS + BALL_RADIUS + 10)
-                print("Red team sent back - Blue player positioned at ball location")
-            
-        elif ball.centery >= FIELD_Y + FIELD_HEIGHT:  # Out on bottom
-            # Place ball slightly inside field
-            ball.centerx = max(FIELD_X + BALL_RADIUS, min(FIELD_X + FIELD_WIDTH - BALL_RADIUS, out_x))
-            ball.centery = FIELD_Y + FIELD_HEIGHT - BALL_RADIUS - 15
-            set_piece_type = "throw_in"
-            # Opposite team of who last touched gets the ball
-            set_piece_team = "red" if last_touch == "blue" else "blue"
-            # Reset the team that caused the ball to go out
-            if last_touch == "blue":
+                red_team[0].x = ball.x + 20
+                red_team[0].y = ball.y
+                print("Corner kick for Red team!")
+        else:
+            # Ball crossed red's goal line (not in goal) - corner kick or goal kick
+            if state.last_touch == "blue":
+                # Blue touched last - GOAL KICK for red team
+                start_set_piece(state, "goal_kick", "red")
+                ball.x = FIELD_X + FIELD_WIDTH - 30
+                ball.y = FIELD_Y + FIELD_HEIGHT // 2
                 reset_team_positions(blue_team, is_red_team=False)
-                # Bring red player to ball position
-                red_team[0].centerx = ball.centerx
-                red_team[0].centery = ball.centery + (PLAYER_RADIUS + BALL_RADIUS + 10)
-                print("Blue team sent back - Red player positioned at ball location")
+                red_team[0].x = ball.x
+                red_team[0].y = ball.y - 30
+                print("Goal kick for Red team!")
             else:
+                # Red touched last - CORNER KICK for blue team
+                start_set_piece(state, "corner_kick", "blue")
+                ball.x = FIELD_X + FIELD_WIDTH - 15  # Right corner
+                ball.y = FIELD_Y + 15 if out_y < FIELD_Y + FIELD_HEIGHT // 2 else FIELD_Y + FIELD_HEIGHT - 15
                 reset_team_positions(red_team, is_red_team=True)
-                # Bring blue player to ball position
-                blue_team[0].centerx = ball.centerx
-                blue_team[0].centery = ball.centery + (PLAYER_RADIUS + BALL_RADIUS + 10)
-                print("Red team sent back - Blue player positioned at ball location")
-        
-        # Set timer for set piece and stop the ball
-        set_piece_timer = 0  # No timer - manual restart only
-        ball_vel[0], ball_vel[1] = 0, 0  # Stop the ball completely
-        
-        # Record starting positions for movement detection
-        set_piece_start_positions = {
-            "blue": [(p.centerx, p.centery) for p in blue_team],
-            "red": [(p.centerx, p.centery) for p in red_team]
-        }
-        
-        # Some audience members cheer
-        for i in range(len(audience)):
-            if random.random() < 0.3:  # 30% chance to cheer
-                audience[i] = (audience[i][0], audience[i][1], audience[i][2], 1)
-        
-        # Play cheer sound
-        if cheer_sound:
-            cheer_sound.play()
-        
-        return "set_piece", set_piece_type, set_piece_team, set_piece_timer, set_piece_start_positions, goal_timer, blue_score, red_score
-    
-    return "in_play", None, None, 0, {"blue": [], "red": []}, 0, blue_score, red_score
+                blue_team[0].x = ball.x - 20
+                blue_team[0].y = ball.y
+                print("Corner kick for Blue team!")
+        return "set_piece"
+
+    if ball.y <= FIELD_Y or ball.y >= FIELD_Y + FIELD_HEIGHT:
+        # Out on top or bottom - place ball slightly inside field
+        on_top = ball.y <= FIELD_Y
+        ball.x = max(FIELD_X + BALL_RADIUS, min(FIELD_X + FIELD_WIDTH - BALL_RADIUS, out_x))
+        if on_top:
+            ball.y = FIELD_Y + BALL_RADIUS + 15
+            taker_offset = -(PLAYER_RADIUS + BALL_RADIUS + 10)
+        else:
+            ball.y = FIELD_Y + FIELD_HEIGHT - BALL_RADIUS - 15
+            taker_offset = PLAYER_RADIUS + BALL_RADIUS + 10
+        # Opposite team of who last touched gets the ball
+        start_set_piece(state, "throw_in", "red" if state.last_touch == "blue" else "blue")
+        # Reset the team that caused the ball to go out
+        if state.last_touch == "blue":
+            reset_team_positions(blue_team, is_red_team=False)
+            # Bring red player to ball position
+            red_team[0].x = ball.x
+            red_team[0].y = ball.y + taker_offset
+            print("Blue team sent back - Red player positioned at ball location")
+        else:
+            reset_team_positions(red_team, is_red_team=True)
+            # Bring blue player to ball position
+            blue_team[0].x = ball.x
+            blue_team[0].y = ball.y + taker_offset
+            print("Red team sent back - Blue player positioned at ball location")
+
+    # Stop the ball completely - no timer, manual restart only
+    ball.vx, ball.vy = 0, 0
+
+    # Some audience members cheer - 30% chance to cheer
+    cheer(state, 0.3, 1, cheer_sound)
+
+    return "set_piece"
 
-def execute_set_piece(ball, ball_vel, blue_team, red_team, set_piece_team):
+def execute_set_piece(state):
     """Handle set piece - wait for team to touch the ball before restarting play"""
+    ball = state.ball
     # Ball stays completely stopped during set piece
-    ball_vel[0], ball_vel[1] = 0, 0
+    ball.vx, ball.vy = 0, 0
 
     # Only allow the team with possession to restart play by touching the ball
-    if set_piece_team == "blue":
-        allowed_players = blue_team
+    if state.set_piece_team == "blue":
+        allowed_players = state.blue_team
     else:
-        allowed_players = red_team
+        allowed_players = state.red_team
 
     # Check if any player from the possessing team has touched the ball
     for player in allowed_players:
         # Check collision between player and ball
-        if player.colliderect(ball):
+        if player.overlaps(ball):
             # Player touched ball - resume normal play
-            print(f"Set piece ended! {set_piece_team} team player touched ball - play resumed")
+            print(f"Set piece ended! {state.set_piece_team} team player touched ball - play resumed")
 
             # Give the ball a small initial movement to restart play
-            if set_piece_team == "blue":
-                ball_vel[0] = random.uniform(1, 3)
-                ball_vel[1] = random.uniform(-2, 2)
+            if state.set_piece_team == "blue":
+                ball.vx = state.rng.uniform(1, 3)
+                ball.vy = state.rng.uniform(-2, 2)
             else:
-                ball_vel[0] = random.uniform(-3, -1)
-                ball_vel[1] = random.uniform(-2, 2)
+                ball.vx = state.rng.uniform(-3, -1)
+                ball.vy = state.rng.uniform(-2, 2)
 
+            state.set_piece_type = None
+            state.set_piece_team = None
+            state.replan()
             return True
 
-    return False
\ No newline at end of file
+    return False
@@ -0,0 +1,150 @@
+"""
+Game State Module
+Compact, slotted containers for everything the simulation mutates each tick.
+Positions and velocities are floats (object centers), so nothing is truncated
+to integer pixels between ticks. Each match owns a seeded random.Random, so a
+match is fully determined by its seed and its human inputs.
+"""
+
+import hashlib
+import math
+import random
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+
+class Body:
+    """A round game object: center position, velocity and radius"""
+
+    __slots__ = ("x", "y", "vx", "vy", "radius")
+
+    def __init__(self, x, y, radius, vx=0.0, vy=0.0):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.radius = radius
+
+    @property
+    def center(self):
+        """Center as an (x, y) tuple, for drawing"""
+        return (self.x, self.y)
+
+    def overlaps(self, other):
+        """True when the bounding boxes overlap (the colliderect test the game has always used)"""
+        reach = self.radius + other.radius
+        return abs(self.x - other.x) < reach and abs(self.y - other.y) < reach
+
+    def copy(self):
+        """Return an independent copy of this body"""
+        return Body(self.x, self.y, self.radius, self.vx, self.vy)
+
+    def __repr__(self):
+        return f"Body(x={self.x:.2f}, y={self.y:.2f}, vx={self.vx:.2f}, vy={self.vy:.2f})"
+
+# Formation of teams larger than 2: vertical lines of players, the first one in front of the goal
+FORMATION_MAX_LINES = 4
+FORMATION_LINE_SIZE = 4  # players per line, until FORMATION_MAX_LINES lines are used
+FORMATION_LINE_SPACING = 90
+
+def team_start_position(index, is_red_team=False, team_size=2):
+    """Starting center of player ``index`` of a team of ``team_size`` players"""
+    x = FIELD_X + FIELD_WIDTH - 70 + PLAYER_RADIUS if is_red_team else FIELD_X + 50 + PLAYER_RADIUS
+    if team_size <= 2:
+        return x, FIELD_Y + 150 + index*150 + PLAYER_RADIUS
+
+    # Lines further up the field, players spread evenly down each line
+    lines = min(FORMATION_MAX_LINES, math.ceil(team_size / FORMATION_LINE_SIZE))
+    line_size = math.ceil(team_size / lines)
+    line, row = divmod(index, line_size)
+    players_in_line = min(line_size, team_size - line * line_size)
+    x += -line * FORMATION_LINE_SPACING if is_red_team else line * FORMATION_LINE_SPACING
+    return x, FIELD_Y + (row + 1) * FIELD_HEIGHT / (players_in_line + 1)
+
+def create_team(size, is_red_team=False):
+    """Create a team of players at their starting positions"""
+    return [Body(*team_start_position(i, is_red_team, size), PLAYER_RADIUS) for i in range(size)]
+
+class GameState:
+    """All mutable match state: ball, teams, scores, set pieces, possession and crowd.
+
+    ``players`` lists the bodies of both teams (blue first) and is built once,
+    so the per-tick code never concatenates the teams.
+    """
+
+    __slots__ = ("mode", "seed", "rng", "ball", "blue_team", "red_team", "players", "blue_score", "red_score",
+                 "goal_timer", "set_piece_type", "set_piece_team", "last_touch",
+                 "possession_timer", "last_possession", "frame_count",
+                 "ai_targets", "ai_plan_ticks", "red_pass",
+                 "audience", "audience_version")
+
+    def __init__(self, mode="bot_vs_bot", team_size=2, audience=None, seed=None):
+        self.mode = mode
+        # All randomness in a match (ball start, restarts, crowd) comes from this generator
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng = random.Random(self.seed)
+        self.audience = audience if audience is not None else create_audience(self.rng)
+        self.audience_version = 0  # bumped whenever the rules change audience states
+
+        self.ball = Body(WIDTH//2, HEIGHT//2, BALL_RADIUS,
+                         self.rng.choice([-BALL_SPEED, BALL_SPEED]), self.rng.choice([-BALL_SPEED, BALL_SPEED]))
+        self.blue_team = create_team(team_size, is_red_team=False)
+        self.red_team = create_team(team_size, is_red_team=True)
+        self.players = self.blue_team + self.red_team  # the same bodies, blue team first
+
+        self.blue_score = 0
+        self.red_score = 0
+        self.goal_timer = 0
+        self.set_piece_type = None  # 'kick_off', 'corner_kick', 'goal_kick', 'throw_in'
+        self.set_piece_team = None  # 'blue' or 'red'
+        self.last_touch = None  # Track which team last touched the ball
+
+        self.possession_timer = 0
+        self.last_possession = None
+        self.frame_count = 0
+
+        # AI plan (physics.plan_ai): a (x, y, follows_ball) target per player, the tick each
+        # team's last plan was due (blue, red; None: plan next tick) and the red striker's pass decision
+        self.ai_targets = [(0.0, 0.0, True)] * len(self.players)
+        self.ai_plan_ticks = [None, None]
+        self.red_pass = None  # None until the red AI has planned: decided on the spot
+
+    @property
+    def match_time(self):
+        """Simulated match time in seconds"""
+        return self.frame_count / FPS
+
+    def snapshot(self):
+        """Return an independent copy of this state (bodies copied, audience list copied)"""
+        copy = GameState.__new__(GameState)
+        for name in GameState.__slots__:
+            setattr(copy, name, getattr(self, name))
+        copy.ball = self.ball.copy()
+        copy.blue_team = [p.copy() for p in self.blue_team]
+        copy.red_team = [p.copy() for p in self.red_team]
+        copy.players = copy.blue_team + copy.red_team
+        copy.audience = list(self.audience)
+        copy.ai_targets = list(self.ai_targets)
+        copy.ai_plan_ticks = list(self.ai_plan_ticks)
+        copy.rng = random.Random()
+        copy.rng.setstate(self.rng.getstate())
+        return copy
+
+    def replan(self):
+        """Have both teams' AI plan again next tick (play restarts: the ball and players were placed)"""
+        self.ai_plan_ticks[0] = self.ai_plan_ticks[1] = None
+
+    def digest(self):
+        """Hash of the simulated state (bodies, scores, set piece, AI plan, crowd, clock and RNG).
+
+        Two runs of a match are bit-identical exactly when their digests match.
+        Possession bookkeeping is left out because finishing a match resets it.
+        """
+        bodies = [(body.x, body.y, body.vx, body.vy) for body in [self.ball] + self.players]
+        values = (bodies, self.blue_score, self.red_score, self.goal_timer, self.set_piece_type,
+                  self.set_piece_team, self.last_touch, self.frame_count, self.audience,
+                  self.ai_targets, self.ai_plan_ticks, self.red_pass, self.rng.getstate())
+        return hashlib.sha1(repr(values).encode()).hexdigest()
@@ -11,25 +11,34 @@ import os
 # Import from the same directory
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from game_config import *
+from text_cache import TextCache
+
+# Rendered text surfaces for strings that rarely or never change
+text_cache = TextCache(maxsize=256)
+
+def render_text(text_font, text, color):
+    """Render text through the shared LRU text cache"""
+    return text_cache.render(text_font, text, color)
 
 def draw_mode_selection(screen):
     """Draw the mode selection screen"""
     screen.fill(DARK_GRAY)
     
     # Title
-    title_text = large_font.render("ROBOSOCCER - SELECT MODE", True, YELLOW)
+    title_text = render_text(large_font, "ROBOSOCCER - SELECT MODE", YELLOW)
     screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 100))
     
     # Mode buttons
     modes = [
         ("MAN vs MAN", "man_vs_man", BLUE),
         ("MAN vs BOT", "bot_vs_man", GREEN),
-        ("BOT vs BOT", "bot_vs_bot", RED)
+        ("BOT vs BOT", "bot_vs_bot", RED),
+        ("REPLAYS", "replay", GRAY)
     ]
     
     buttons = []
     for i, (text, mode, color) in enumerate(modes):
-        button_rect = pygame.Rect(WIDTH//2 - 150, 200 + i*120, 300, 80)
+        button_rect = pygame.Rect(WIDTH//2 - 150, 180 + i*95, 300, 75)
         buttons.append((button_rect, mode))
         
         # Draw button
@@ -37,123 +46,162 @@ def draw_mode_selection(screen):
         pygame.draw.rect(screen, WHITE, button_rect, 3, border_radius=15)
         
         # Draw button text
-        mode_text = font.render(text, True, WHITE)
+        mode_text = render_text(font, text, WHITE)
         screen.blit(mode_text, (button_rect.centerx - mode_text.get_width()//2, 
                                button_rect.centery - mode_text.get_height()//2))
     
     # Instructions
-    instr_text = small_font.render("Click on a mode to start the game", True, WHITE)
+    instr_text = render_text(small_font, "Click on a mode to start the game, or REPLAYS to watch recorded matches", WHITE)
     screen.blit(instr_text, (WIDTH//2 - instr_text.get_width()//2, HEIGHT - 50))
     
     return buttons
 
-def draw_field(screen, audience):
-    """Draw the soccer field with markings"""
-    # Draw stadium background
-    screen.fill(GRAY)
-    
-    # Draw stands
-    pygame.draw.rect(screen, DARK_GRAY, (0, 0, WIDTH, FIELD_Y))
-    pygame.draw.rect(screen, DARK_GRAY, (0, FIELD_Y + FIELD_HEIGHT, WIDTH, HEIGHT - FIELD_Y - FIELD_HEIGHT))
-    
-    # Draw audience
+# Screen areas covered by the stands; the only part of the background the audience changes
+AUDIENCE_AREAS = [pygame.Rect(0, 0, WIDTH, FIELD_Y),
+                  pygame.Rect(0, FIELD_Y + FIELD_HEIGHT, WIDTH, HEIGHT - FIELD_Y - FIELD_HEIGHT)]
+
+# Cached render layers, built lazily because they need the display to exist
+_pitch_layer = None          # field, grass, lines and goals (never changes)
+_background_layer = None     # stands + audience + pitch, rebuilt when the audience changes
+_background_key = None       # audience version the background layer was built for
+
+def _draw_stands(surface):
+    """Draw the stadium background and stands"""
+    surface.fill(GRAY)
+    pygame.draw.rect(surface, DARK_GRAY, (0, 0, WIDTH, FIELD_Y))
+    pygame.draw.rect(surface, DARK_GRAY, (0, FIELD_Y + FIELD_HEIGHT, WIDTH, HEIGHT - FIELD_Y - FIELD_HEIGHT))
+
+def _draw_audience(surface, audience):
+    """Draw the audience members in the stands"""
     for x, y, color, state in audience:
         if y < FIELD_Y:  # Top audience
-            pygame.draw.circle(screen, color, (x, y), 5)
+            pygame.draw.circle(surface, color, (x, y), 5)
             if state == 1:  # Cheering
-                pygame.draw.circle(screen, YELLOW, (x, y-5), 2)
+                pygame.draw.circle(surface, YELLOW, (x, y-5), 2)
             elif state == 2:  # Excited
-                pygame.draw.circle(screen, YELLOW, (x, y-8), 3)
-                pygame.draw.circle(screen, YELLOW, (x-3, y-5), 2)
-                pygame.draw.circle(screen, YELLOW, (x+3, y-5), 2)
+                pygame.draw.circle(surface, YELLOW, (x, y-8), 3)
+                pygame.draw.circle(surface, YELLOW, (x-3, y-5), 2)
+                pygame.draw.circle(surface, YELLOW, (x+3, y-5), 2)
         else:  # Bottom audience
-            pygame.draw.circle(screen, color, (x, y), 5)
+            pygame.draw.circle(surface, color, (x, y), 5)
             if state == 1:  # Cheering
-                pygame.draw.circle(screen, YELLOW, (x, y+5), 2)
+                pygame.draw.circle(surface, YELLOW, (x, y+5), 2)
             elif state == 2:  # Excited
-                pygame.draw.circle(screen, YELLOW, (x, y+8), 3)
-                pygame.draw.circle(screen, YELLOW, (x-3, y+5), 2)
-                pygame.draw.circle(screen, YELLOW, (x+3, y+5), 2)
-    
+                pygame.draw.circle(surface, YELLOW, (x, y+8), 3)
+                pygame.draw.circle(surface, YELLOW, (x-3, y+5), 2)
+                pygame.draw.circle(surface, YELLOW, (x+3, y+5), 2)
+
+def _draw_pitch(surface):
+    """Draw the field, grass pattern, markings and goals"""
     # Draw field
-    pygame.draw.rect(screen, DARK_GREEN, (FIELD_X, FIELD_Y, FIELD_WIDTH, FIELD_HEIGHT))
+    pygame.draw.rect(surface, DARK_GREEN, (FIELD_X, FIELD_Y, FIELD_WIDTH, FIELD_HEIGHT))
     
     # Draw darker grass pattern
     for y in range(FIELD_Y, FIELD_Y + FIELD_HEIGHT, 20):
         for x in range(FIELD_X, FIELD_X + FIELD_WIDTH, 20):
             if (x + y) // 20 % 2 == 0:
-                pygame.draw.rect(screen, LIGHT_GREEN, (x, y, 20, 20))
+                pygame.draw.rect(surface, LIGHT_GREEN, (x, y, 20, 20))
     
     # Field outline
-    pygame.draw.rect(screen, WHITE, (FIELD_X, FIELD_Y, FIELD_WIDTH, FIELD_HEIGHT), 3)
+    pygame.draw.rect(surface, WHITE, (FIELD_X, FIELD_Y, FIELD_WIDTH, FIELD_HEIGHT), 3)
     
     # Midfield line & circle
-    pygame.draw.line(screen, WHITE, (WIDTH//2, FIELD_Y), (WIDTH//2, FIELD_Y + FIELD_HEIGHT), 2)
-    pygame.draw.circle(screen, WHITE, (WIDTH//2, FIELD_Y + FIELD_HEIGHT//2), 70, 2)
+    pygame.draw.line(surface, WHITE, (WIDTH//2, FIELD_Y), (WIDTH//2, FIELD_Y + FIELD_HEIGHT), 2)
+    pygame.draw.circle(surface, WHITE, (WIDTH//2, FIELD_Y + FIELD_HEIGHT//2), 70, 2)
     
     # Center spot
-    pygame.draw.circle(screen, WHITE, (WIDTH//2, FIELD_Y + FIELD_HEIGHT//2), 5)
+    pygame.draw.circle(surface, WHITE, (WIDTH//2, FIELD_Y + FIELD_HEIGHT//2), 5)
     
     # Goals (larger and more visible)
-    pygame.draw.rect(screen, WHITE, (FIELD_X - 2, FIELD_Y + 140, 12, 170), 3)      # Left goal (thicker)
-    pygame.draw.rect(screen, WHITE, (FIELD_X + FIELD_WIDTH - 10, FIELD_Y + 140, 12, 170), 3)  # Right goal (thicker)
+    pygame.draw.rect(surface, WHITE, (FIELD_X - 2, FIELD_Y + 140, 12, 170), 3)      # Left goal (thicker)
+    pygame.draw.rect(surface, WHITE, (FIELD_X + FIELD_WIDTH - 10, FIELD_Y + 140, 12, 170), 3)  # Right goal (thicker)
     
     # Goal areas (penalty boxes)
-    pygame.draw.rect(screen, WHITE, (FIELD_X, FIELD_Y + 100, 60, 250), 2)      # Left goal area
-    pygame.draw.rect(screen, WHITE, (FIELD_X + FIELD_WIDTH - 60, FIELD_Y + 100, 60, 250), 2)  # Right goal area
+    pygame.draw.rect(surface, WHITE, (FIELD_X, FIELD_Y + 100, 60, 250), 2)      # Left goal area
+    pygame.draw.rect(surface, WHITE, (FIELD_X + FIELD_WIDTH - 60, FIELD_Y + 100, 60, 250), 2)  # Right goal area
     
     # Goal posts (make them more visible)
-    pygame.draw.circle(screen, WHITE, (FIELD_X, FIELD_Y + 140), 5)  # Left top post
-    pygame.draw.circle(screen, WHITE, (FIELD_X, FIELD_Y + 310), 5)  # Left bottom post
-    pygame.draw.circle(screen, WHITE, (FIELD_X + FIELD_WIDTH, FIELD_Y + 140), 5)  # Right top post
-    pygame.draw.circle(screen, WHITE, (FIELD_X + FIELD_WIDTH, FIELD_Y + 310), 5)  # Right bottom post
+    pygame.draw.circle(surface, WHITE, (FIELD_X, FIELD_Y + 140), 5)  # Left top post
+    pygame.draw.circle(surface, WHITE, (FIELD_X, FIELD_Y + 310), 5)  # Left bottom post
+    pygame.draw.circle(surface, WHITE, (FIELD_X + FIELD_WIDTH, FIELD_Y + 140), 5)  # Right top post
+    pygame.draw.circle(surface, WHITE, (FIELD_X + FIELD_WIDTH, FIELD_Y + 310), 5)  # Right bottom post
     
     # Corner arcs
-    pygame.draw.arc(screen, WHITE, (FIELD_X - 20, FIELD_Y - 20, 40, 40), math.pi/2, math.pi, 2)
-    pygame.draw.arc(screen, WHITE, (FIELD_X + FIELD_WIDTH - 20, FIELD_Y - 20, 40, 40), 0, math.pi/2, 2)
-    pygame.draw.arc(screen, WHITE, (FIELD_X - 20, FIELD_Y + FIELD_HEIGHT - 20, 40, 40), math.pi, 3*math.pi/2, 2)
-    pygame.draw.arc(screen, WHITE, (FIELD_X + FIELD_WIDTH - 20, FIELD_Y + FIELD_HEIGHT - 20, 40, 40), 3*math.pi/2, 2*math.pi, 2)
+    pygame.draw.arc(surface, WHITE, (FIELD_X - 20, FIELD_Y - 20, 40, 40), math.pi/2, math.pi, 2)
+    pygame.draw.arc(surface, WHITE, (FIELD_X + FIELD_WIDTH - 20, FIELD_Y - 20, 40, 40), 0, math.pi/2, 2)
+    pygame.draw.arc(surface, WHITE, (FIELD_X - 20, FIELD_Y + FIELD_HEIGHT - 20, 40, 40), math.pi, 3*math.pi/2, 2)
+    pygame.draw.arc(surface, WHITE, (FIELD_X + FIELD_WIDTH - 20, FIELD_Y + FIELD_HEIGHT - 20, 40, 40), 3*math.pi/2, 2*math.pi, 2)
+
+def get_background_layer(audience, audience_version=None):
+    """Return the cached stands + audience + pitch surface, rebuilding it if the audience changed.
+
+    ``audience_version`` is bumped by the match whenever handle_out_of_bounds
+    changes audience states; without it the audience contents are compared.
+    """
+    global _pitch_layer, _background_layer, _background_key
+    if _pitch_layer is None:
+        _pitch_layer = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA).convert_alpha()
+        _pitch_layer.fill((0, 0, 0, 0))
+        _draw_pitch(_pitch_layer)
+
+    key = audience_version if audience_version is not None else hash(tuple(audience))
+    if _background_layer is None or key != _background_key:
+        if _background_layer is None:
+            _background_layer = pygame.Surface((WIDTH, HEIGHT)).convert()
+        _draw_stands(_background_layer)
+        _draw_audience(_background_layer, audience)
+        _background_layer.blit(_pitch_layer, (0, 0))
+        _background_key = key
+    return _background_layer
+
+def draw_field(screen, audience, audience_version=None):
+    """Draw the soccer field with markings from the cached background layer"""
+    screen.blit(get_background_layer(audience, audience_version), (0, 0))
 
-def draw_players_and_ball(screen, ball, blue_team, red_team):
-    """Draw players and ball with better visuals"""
+def draw_players_and_ball(screen, state):
+    """Draw players and ball with better visuals, return the screen areas touched"""
+    ball = state.ball
     # Ball with shadow effect
-    pygame.draw.circle(screen, (80, 80, 80), (ball.centerx+2, ball.centery+2), BALL_RADIUS)
-    pygame.draw.circle(screen, WHITE, ball.center, BALL_RADIUS)
+    ball_area = pygame.draw.circle(screen, (80, 80, 80), (ball.x+2, ball.y+2), BALL_RADIUS)
+    ball_area.union_ip(pygame.draw.circle(screen, WHITE, ball.center, BALL_RADIUS))
+    dirty_rects = [ball_area]
     pygame.draw.circle(screen, (200, 200, 200), ball.center, BALL_RADIUS-4)
     # Ball pattern
-    pygame.draw.line(screen, BLACK, (ball.centerx - 7, ball.centery), (ball.centerx + 7, ball.centery), 2)
-    pygame.draw.line(screen, BLACK, (ball.centerx, ball.centery - 7), (ball.centerx, ball.centery + 7), 2)
+    pygame.draw.line(screen, BLACK, (ball.x - 7, ball.y), (ball.x + 7, ball.y), 2)
+    pygame.draw.line(screen, BLACK, (ball.x, ball.y - 7), (ball.x, ball.y + 7), 2)
     pygame.draw.circle(screen, BLACK, ball.center, 5, 1)
     
     # Players with team colors and details
-    for i, p in enumerate(blue_team):
-        pygame.draw.circle(screen, BLUE, p.center, PLAYER_RADIUS)
+    for i, p in enumerate(state.blue_team):
+        dirty_rects.append(pygame.draw.circle(screen, BLUE, p.center, PLAYER_RADIUS))
         pygame.draw.circle(screen, (30, 70, 200), p.center, PLAYER_RADIUS-4)
         # Player number
-        num_text = small_font.render(str(i+1), True, WHITE)
-        screen.blit(num_text, (p.centerx-5, p.centery-8))
+        num_text = render_text(small_font, str(i+1), WHITE)
+        screen.blit(num_text, (p.x-5, p.y-8))
         
-    for i, p in enumerate(red_team):
-        pygame.draw.circle(screen, RED, p.center, PLAYER_RADIUS)
+    for i, p in enumerate(state.red_team):
+        dirty_rects.append(pygame.draw.circle(screen, RED, p.center, PLAYER_RADIUS))
         pygame.draw.circle(screen, (200, 30, 30), p.center, PLAYER_RADIUS-4)
         # Player number
-        num_text = small_font.render(str(i+1), True, WHITE)
-        screen.blit(num_text, (p.centerx-5, p.centery-8))
+        num_text = render_text(small_font, str(i+1), WHITE)
+        screen.blit(num_text, (p.x-5, p.y-8))
+    
+    return dirty_rects
 
 def draw_time_complexity_graph(screen, time_data, current_mode):
-    """Draw a graph showing time complexity analysis"""
+    """Draw the recent frame times with whole-match percentiles, return the screen areas touched"""
     if not time_data[current_mode]:
-        return
+        return []
     
     graph_width, graph_height = 250, 120
     graph_x, graph_y = WIDTH - graph_width - 10, 10
     
     # Draw graph background
-    pygame.draw.rect(screen, (50, 50, 50), (graph_x, graph_y, graph_width, graph_height))
+    graph_area = pygame.draw.rect(screen, (50, 50, 50), (graph_x, graph_y, graph_width, graph_height))
     pygame.draw.rect(screen, (100, 100, 100), (graph_x, graph_y, graph_width, graph_height), 1)
     
     # Draw title
-    mode_text = small_font.render(f"Mode: {current_mode}", True, WHITE)
+    mode_text = render_text(small_font, f"Mode: {current_mode}", WHITE)
     screen.blit(mode_text, (graph_x + 5, graph_y + 5))
     
     # Draw data
@@ -166,7 +214,7 @@ def draw_time_complexity_graph(screen, time_data, current_mode):
         points.append((x, y))
     
     if len(points) > 1:
-        pygame.draw.lines(screen, YELLOW, False, points, 2)
+        graph_area.union_ip(pygame.draw.lines(screen, YELLOW, False, points, 2))
     
     # Draw scale
     scale_text = small_font.render(f"Max: {max_val:.4f}s", True, WHITE)
@@ -176,111 +224,277 @@ def draw_time_complexity_graph(screen, time_data, current_mode):
     current_val = time_data[current_mode][-1] if time_data[current_mode] else 0
     current_text = small_font.render(f"Current: {current_val:.4f}s", True, WHITE)
     screen.blit(current_text, (graph_x + 5, graph_y + graph_height - 30))
+    
+    # Whole-match percentiles from the streaming statistics, p99 also as a line
+    percentiles = time_data[current_mode].stats.percentiles((50, 99))
+    percentile_text = small_font.render(f"p50 {percentiles[50]*1000:.2f}ms  p99 {percentiles[99]*1000:.2f}ms",
+                                        True, LIGHT_BLUE)
+    screen.blit(percentile_text, (graph_x + 5, graph_y + 22))
+    if percentiles[99] <= max_val:
+        p99_y = graph_y + graph_height - (percentiles[99] / max_val) * graph_height
+        pygame.draw.line(screen, LIGHT_BLUE, (graph_x, p99_y), (graph_x + graph_width, p99_y), 1)
+    
+    return [graph_area]
+
+# Subsystem colors of the profiler overlay, assigned in the order spans are first used
+PROFILER_COLORS = [(230, 90, 90), (90, 160, 240), (240, 200, 70), (110, 210, 110), (200, 120, 220),
+                   (240, 150, 60), (80, 210, 200), (230, 130, 170), (160, 140, 100), (170, 170, 170),
+                   (150, 110, 250), (190, 230, 90), (250, 240, 180), (40, 140, 130), (180, 60, 110),
+                   (120, 170, 255)]
+PROFILER_FRAME_BUDGET = 1 / 60  # seconds; marked on the bar
+
+def draw_profiler_overlay(screen, profiler):
+    """Draw the profiler's average per-subsystem frame breakdown as a stacked bar with a legend.
+
+    Return the screen areas touched.
+    """
+    averages = profiler.averages()
+    if not averages:
+        return []
+    total = sum(averages.values())
 
-def draw_set_piece_indicator(screen, set_piece_type, set_piece_team):
-    """Draw set piece indicator if active"""
+    panel_x, panel_y, panel_width = 10, 50, 250
+    bar_x, bar_y, bar_width, bar_height = panel_x + 5, panel_y + 24, panel_width - 10, 12
+    panel_height = 44 + 16 * len(averages)
+
+    panel = pygame.draw.rect(screen, (40, 40, 40), (panel_x, panel_y, panel_width, panel_height))
+    pygame.draw.rect(screen, (100, 100, 100), panel, 1)
+    title_text = small_font.render(f"Frame {total*1000:.2f}ms (F3: hide)", True, WHITE)
+    screen.blit(title_text, (panel_x + 5, panel_y + 4))
+
+    # Stacked bar: one segment per subsystem, scaled to the frame budget (or the frame, if longer)
+    scale = bar_width / max(total, PROFILER_FRAME_BUDGET)
+    x = bar_x
+    for i, seconds in enumerate(averages.values()):
+        segment = seconds * scale
+        pygame.draw.rect(screen, PROFILER_COLORS[i % len(PROFILER_COLORS)], (round(x), bar_y, max(1, round(segment)), bar_height))
+        x += segment
+    budget_x = bar_x + round(PROFILER_FRAME_BUDGET * scale)
+    pygame.draw.line(screen, WHITE, (budget_x, bar_y - 3), (budget_x, bar_y + bar_height + 2), 1)
+
+    # Legend, in the same order as the bar
+    for i, (name, seconds) in enumerate(averages.items()):
+        row_y = bar_y + bar_height + 6 + 16 * i
+        pygame.draw.rect(screen, PROFILER_COLORS[i % len(PROFILER_COLORS)], (bar_x, row_y + 3, 10, 10))
+        share = 100 * seconds / total if total else 0
+        row_text = small_font.render(f"{name} {seconds*1000:.3f}ms {share:.0f}%", True, WHITE)
+        screen.blit(row_text, (bar_x + 16, row_y))
+
+    return [panel]
+
+def draw_set_piece_indicator(screen, state):
+    """Draw set piece indicator if active, return the screen areas touched"""
+    set_piece_type, set_piece_team = state.set_piece_type, state.set_piece_team
+    dirty_rects = []
     if set_piece_type is not None and set_piece_team:
         team_color = BLUE if set_piece_team == "blue" else RED
         
         # Main message - specific to set piece type
         if set_piece_type == "kick_off":
-            set_piece_text = font.render(f"{set_piece_team.upper()} TEAM KICK OFF", True, team_color)
+            set_piece_text = render_text(font, f"{set_piece_team.upper()} TEAM KICK OFF", team_color)
         elif set_piece_type == "corner_kick":
-            set_piece_text = font.render(f"{set_piece_team.upper()} TEAM CORNER KICK", True, team_color)
+            set_piece_text = render_text(font, f"{set_piece_team.upper()} TEAM CORNER KICK", team_color)
         elif set_piece_type == "goal_kick":
-            set_piece_text = font.render(f"{set_piece_team.upper()} TEAM GOAL KICK", True, team_color)
+            set_piece_text = render_text(font, f"{set_piece_team.upper()} TEAM GOAL KICK", team_color)
         else:  # throw_in
-            set_piece_text = font.render(f"{set_piece_team.upper()} TEAM THROW-IN", True, team_color)
-        screen.blit(set_piece_text, (WIDTH//2 - set_piece_text.get_width()//2, FIELD_Y + 20))
+            set_piece_text = render_text(font, f"{set_piece_team.upper()} TEAM THROW-IN", team_color)
+        dirty_rects.append(screen.blit(set_piece_text, (WIDTH//2 - set_piece_text.get_width()//2, FIELD_Y + 20)))
         
         # Show that teams have been positioned automatically
         if set_piece_type == "kick_off":
-            reset_text = small_font.render("Midfield kick-off - all players reset to positions", True, YELLOW)
+            reset_text = render_text(small_font, "Midfield kick-off - all players reset to positions", YELLOW)
         elif set_piece_type == "corner_kick":
             opposite_team = "RED" if set_piece_team == "blue" else "BLUE"
-            reset_text = small_font.render(f"Corner kick - {opposite_team} team reset, {set_piece_team.upper()} at corner", True, YELLOW)
+            reset_text = render_text(small_font, f"Corner kick - {opposite_team} team reset, {set_piece_team.upper()} at corner", YELLOW)
         elif set_piece_type == "goal_kick":
             opposite_team = "RED" if set_piece_team == "blue" else "BLUE"
-            reset_text = small_font.render(f"Goal kick - {opposite_team} team reset, {set_piece_team.upper()} near goal", True, YELLOW)
+            reset_text = render_text(small_font, f"Goal kick - {opposite_team} team reset, {set_piece_team.upper()} near goal", YELLOW)
         else:
             opposite_team = "RED" if set_piece_team == "blue" else "BLUE"
-            reset_text = small_font.render(f"Throw-in - {opposite_team} team reset, {set_piece_team.upper()} at sideline", True, YELLOW)
-        screen.blit(reset_text, (WIDTH//2 - reset_text.get_width()//2, FIELD_Y + 50))
+            reset_text = render_text(small_font, f"Throw-in - {opposite_team} team reset, {set_piece_team.upper()} at sideline", YELLOW)
+        dirty_rects.append(screen.blit(reset_text, (WIDTH//2 - reset_text.get_width()//2, FIELD_Y + 50)))
         
         # Instructions - different for each set piece type
         if set_piece_type == "kick_off":
-            instruction_text = small_font.render("Player is ready - TOUCH BALL to restart kick-off", True, WHITE)
+            instruction_text = render_text(small_font, "Player is ready - TOUCH BALL to restart kick-off", WHITE)
         elif set_piece_type == "corner_kick":
-            instruction_text = small_font.render("Corner kick - TOUCH BALL to take corner", True, WHITE)
+            instruction_text = render_text(small_font, "Corner kick - TOUCH BALL to take corner", WHITE)
         elif set_piece_type == "goal_kick":
-            instruction_text = small_font.render("Goal kick - TOUCH BALL to clear from goal", True, WHITE)
+            instruction_text = render_text(small_font, "Goal kick - TOUCH BALL to clear from goal", WHITE)
         else:
-            instruction_text = small_font.render("Throw-in - TOUCH BALL to restart play", True, WHITE)
-        screen.blit(instruction_text, (WIDTH//2 - instruction_text.get_width()//2, FIELD_Y + 80))
+            instruction_text = render_text(small_font, "Throw-in - TOUCH BALL to restart play", WHITE)
+        dirty_rects.append(screen.blit(instruction_text, (WIDTH//2 - instruction_text.get_width()//2, FIELD_Y + 80)))
+    return dirty_rects
 
-def draw_ui_elements(screen, blue_score, red_score, match_start_time, frame_count, 
-                    player_movement_data, current_mode, time_data):
+def draw_ui_elements(screen, state, player_movement_data):
     """Draw all UI elements including scores, timer, controls, etc."""
-    import time
-    
+    return draw_hud(screen, state, player_movement_data) + draw_controls_help(screen, state.mode)
+
+def draw_hud(screen, state, player_movement_data):
+    """Draw the widgets that change during play (score, timer, frame counter), return their areas"""
+    current_mode = state.mode
+    match_time = state.match_time
     # Scores
-    score_text = font.render(f"{blue_score} : {red_score}", True, WHITE)
-    screen.blit(score_text, (WIDTH//2 - 40, 20))
+    score_text = render_text(font, f"{state.blue_score} : {state.red_score}", WHITE)
+    dirty_rects = [screen.blit(score_text, (WIDTH//2 - 40, 20))]
+    
+    # Match timer (simulated match time, not wall-clock time)
+    minutes = int(match_time // 60)
+    seconds = int(match_time % 60)
+    timer_text = render_text(small_font, f"Time: {minutes:02d}:{seconds:02d}", WHITE)
+    dirty_rects.append(screen.blit(timer_text, (WIDTH - timer_text.get_width() - 10, HEIGHT - 30)))
     
-    # Match timer
-    match_duration = time.time() - match_start_time
-    minutes = int(match_duration // 60)
-    seconds = int(match_duration % 60)
-    timer_text = small_font.render(f"Time: {minutes:02d}:{seconds:02d}", True, WHITE)
-    screen.blit(timer_text, (WIDTH - timer_text.get_width() - 10, HEIGHT - 30))
+    # Data collection info
+    data_text = small_font.render(f"Frames: {state.frame_count} | Data Points: {len(player_movement_data[current_mode])}", True, GREEN)
+    dirty_rects.append(screen.blit(data_text, (10, 10)))
+    return dirty_rects
+
+def draw_controls_help(screen, current_mode):
+    """Draw the control hints and mode description (constant for a mode), return their areas"""
+    static_rects = []
     
     # Controls help - make red team controls VERY clear
     if current_mode == "man_vs_man":
         # Blue team controls
-        blue_controls = small_font.render("BLUE TEAM: WASD (Player 1) | Arrow Keys (Player 2)", True, BLUE)
-        screen.blit(blue_controls, (10, HEIGHT - 60))
+        blue_controls = render_text(small_font, "BLUE TEAM: WASD (Player 1) | Arrow Keys (Player 2)", BLUE)
+        static_rects.append(screen.blit(blue_controls, (10, HEIGHT - 60)))
         
         # Red team controls - make them stand out
-        red_controls = small_font.render("RED TEAM: IJKL (Player 1) | YUOP (Player 2)", True, RED)
-        screen.blit(red_controls, (10, HEIGHT - 40))
+        red_controls = render_text(small_font, "RED TEAM: IJKL (Player 1) | YUOP (Player 2)", RED)
+        static_rects.append(screen.blit(red_controls, (10, HEIGHT - 40)))
         
         # Game controls
-        game_controls = small_font.render("SPACE: Pause | R: Reset | E: Export Report | ESC: Mode Select", True, WHITE)
-        screen.blit(game_controls, (10, HEIGHT - 20))
+        game_controls = render_text(small_font, "SPACE: Pause | R: Reset | E: Export Report | ESC: Mode Select", WHITE)
+        static_rects.append(screen.blit(game_controls, (10, HEIGHT - 20)))
         
     elif current_mode == "bot_vs_man":
-        controls_text = small_font.render("BLUE TEAM (YOU): WASD (Player 1) | Arrow Keys (Player 2) | Red Team = AI", True, WHITE)
-        screen.blit(controls_text, (10, HEIGHT - 40))
-        game_controls = small_font.render("SPACE: Pause | R: Reset | E: Export Report | ESC: Mode Select", True, WHITE)
-        screen.blit(game_controls, (10, HEIGHT - 20))
+        controls_text = render_text(small_font, "BLUE TEAM (YOU): WASD (Player 1) | Arrow Keys (Player 2) | Red Team = AI", WHITE)
+        static_rects.append(screen.blit(controls_text, (10, HEIGHT - 40)))
+        game_controls = render_text(small_font, "SPACE: Pause | R: Reset | E: Export Report | ESC: Mode Select", WHITE)
+        static_rects.append(screen.blit(game_controls, (10, HEIGHT - 20)))
     else:
-        controls_text = small_font.render("Both teams AI | SPACE: Pause | R: Reset | E: Export Report | ESC: Menu", True, WHITE)
-        screen.blit(controls_text, (10, HEIGHT - 30))
+        controls_text = render_text(small_font, "Both teams AI | SPACE: Pause | R: Reset | E: Export Report | ESC: Menu", WHITE)
+        static_rects.append(screen.blit(controls_text, (10, HEIGHT - 30)))
     
     # Current mode display and description
     if current_mode == "man_vs_man":
-        mode_text = small_font.render("Mode: MAN vs MAN - Both teams controlled by humans", True, YELLOW)
-        screen.blit(mode_text, (WIDTH - mode_text.get_width() - 10, HEIGHT - 80))
+        mode_text = render_text(small_font, "Mode: MAN vs MAN - Both teams controlled by humans", YELLOW)
+        static_rects.append(screen.blit(mode_text, (WIDTH - mode_text.get_width() - 10, HEIGHT - 80)))
         
         # Show player assignments
-        blue_assign = small_font.render("Blue Team: You control both players", True, BLUE)
-        screen.blit(blue_assign, (WIDTH - blue_assign.get_width() - 10, HEIGHT - 100))
+        blue_assign = render_text(small_font, "Blue Team: You control both players", BLUE)
+        static_rects.append(screen.blit(blue_assign, (WIDTH - blue_assign.get_width() - 10, HEIGHT - 100)))
         
-        red_assign = small_font.render("Red Team: Friend controls both players", True, RED)
-        screen.blit(red_assign, (WIDTH - red_assign.get_width() - 10, HEIGHT - 120))
+        red_assign = render_text(small_font, "Red Team: Friend controls both players", RED)
+        static_rects.append(screen.blit(red_assign, (WIDTH - red_assign.get_width() - 10, HEIGHT - 120)))
         
     elif current_mode == "bot_vs_man":
-        mode_text = small_font.render("Mode: HUMAN vs AI - You are Blue Team", True, YELLOW)
-        screen.blit(mode_text, (WIDTH - mode_text.get_width() - 10, HEIGHT - 80))
+        mode_text = render_text(small_font, "Mode: HUMAN vs AI - You are Blue Team", YELLOW)
+        static_rects.append(screen.blit(mode_text, (WIDTH - mode_text.get_width() - 10, HEIGHT - 80)))
     else:
-        mode_text = small_font.render("Mode: AI vs AI - Watch the robots play!", True, YELLOW)
-        screen.blit(mode_text, (WIDTH - mode_text.get_width() - 10, HEIGHT - 80))
+        mode_text = render_text(small_font, "Mode: AI vs AI - Watch the robots play!", YELLOW)
+        static_rects.append(screen.blit(mode_text, (WIDTH - mode_text.get_width() - 10, HEIGHT - 80)))
     
-    # Data collection info
-    data_text = small_font.render(f"Frames: {frame_count} | Data Points: {len(player_movement_data[current_mode])}", True, GREEN)
-    screen.blit(data_text, (10, 10))
+    return static_rects
+
+def draw_speed_indicator(screen, speed_label):
+    """Show the fast-forward speed when the simulation runs faster than real time"""
+    speed_text = render_text(small_font, f"FAST FORWARD {speed_label} (F: change speed)", YELLOW)
+    return [screen.blit(speed_text, (10, 30))]
+
+def draw_export_status(screen, status, message):
+    """Show the state of background exports ("pending", "done" or "error") above the field"""
+    color = {"pending": YELLOW, "done": GREEN}.get(status, RED)
+    status_text = render_text(small_font, message, color)
+    return [screen.blit(status_text, (WIDTH//2 - status_text.get_width()//2, FIELD_Y - 22))]
+
+# Replay viewer timeline bar, in the stands below the field
+REPLAY_BAR = pygame.Rect(FIELD_X, HEIGHT - 38, FIELD_WIDTH, 10)
+
+def replay_bar_tick(x, ticks):
+    """Replay tick under screen x coordinate ``x`` on the timeline bar"""
+    return round((x - REPLAY_BAR.x) / REPLAY_BAR.width * ticks)
+
+def draw_replay_viewer(screen, timeline, title, playing, speed):
+    """Draw a replay frame: field, players, score, clock and the playback controls"""
+    state = timeline.state
+    draw_field(screen, state.audience, state.audience_version)
+    draw_set_piece_indicator(screen, state)
+    draw_players_and_ball(screen, state)
+
+    # Header: recording name and score
+    pygame.draw.rect(screen, DARK_GRAY, (0, 0, WIDTH, 40))
+    title_text = render_text(small_font, title, WHITE)
+    screen.blit(title_text, (10, 12))
+    score_text = render_text(font, f"{state.blue_score} : {state.red_score}", WHITE)
+    screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, 4))
+
+    # Playback status and timeline bar
+    pygame.draw.rect(screen, DARK_GRAY, (0, FIELD_Y + FIELD_HEIGHT + 5, WIDTH, HEIGHT - FIELD_Y - FIELD_HEIGHT - 5))
+    minutes, seconds = divmod(int(state.match_time), 60)
+    status = "PLAYING" if playing else "PAUSED"
+    status_text = small_font.render(f"{status} {speed:g}x | Tick {timeline.tick}/{timeline.ticks} | "
+                                    f"Match time {minutes:02d}:{seconds:02d}", True, YELLOW)
+    screen.blit(status_text, (FIELD_X, HEIGHT - 64))
+
+    pygame.draw.rect(screen, GRAY, REPLAY_BAR)
+    if timeline.ticks:
+        # Part of the match covered by keyframes (instant seeking), then the playhead
+        indexed = min(1, (len(timeline.keyframes) - 1) * timeline.keyframe_interval / timeline.ticks)
+        pygame.draw.rect(screen, LIGHT_BLUE, (REPLAY_BAR.x, REPLAY_BAR.y, REPLAY_BAR.width * indexed, REPLAY_BAR.height))
+        head_x = REPLAY_BAR.x + REPLAY_BAR.width * timeline.tick / timeline.ticks
+        pygame.draw.circle(screen, WHITE, (head_x, REPLAY_BAR.centery), 8)
+
+    help_text = render_text(small_font, "SPACE: Play | UP/DOWN: Speed | LEFT/RIGHT: 5s | , .: Step | "
+                                        "[ ]: Other replay | Drag bar: Seek | ESC: Menu", WHITE)
+    screen.blit(help_text, (WIDTH//2 - help_text.get_width()//2, HEIGHT - 22))
+
+def draw_replay_message(screen, message):
+    """Full-screen message for the replay viewer (e.g. no recordings yet)"""
+    screen.fill(DARK_GRAY)
+    message_text = render_text(font, message, WHITE)
+    screen.blit(message_text, (WIDTH//2 - message_text.get_width()//2, HEIGHT//2 - 24))
+    hint_text = render_text(small_font, "ESC: Back to mode selection", YELLOW)
+    screen.blit(hint_text, (WIDTH//2 - hint_text.get_width()//2, HEIGHT//2 + 30))
 
 def draw_pause_screen(screen):
     """Display pause message"""
-    pause_text = font.render("PAUSED - Press SPACE to continue", True, WHITE)
-    screen.blit(pause_text, (WIDTH//2 - pause_text.get_width()//2, HEIGHT//2 - 24))
\ No newline at end of file
+    pause_text = render_text(font, "PAUSED - Press SPACE to continue", WHITE)
+    screen.blit(pause_text, (WIDTH//2 - pause_text.get_width()//2, HEIGHT//2 - 24))
+
+# Where the performance report graphs go on the results screen (reports are scaled to fit)
+REPORT_AREA = pygame.Rect(20, 60, WIDTH - 40, HEIGHT - 170)
+
+def draw_performance_report(screen, report_surface, state, generating=False):
+    """Draw the performance report on screen, or a placeholder while it is being generated or when there is none"""
+    # Draw semi-transparent background
+    s = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    s.fill((0, 0, 0, 200))
+    screen.blit(s, (0, 0))
+
+    # Draw report
+    if report_surface:
+        screen.blit(report_surface, report_surface.get_rect(center=REPORT_AREA.center))
+    else:
+        if generating:
+            title, hint = "Generating report...", "Graphs are drawn in the background"
+        else:
+            title, hint = "Report unavailable", "No graphs could be drawn for this match"
+        pygame.draw.rect(screen, DARK_GRAY, (WIDTH//2 - 250, HEIGHT//2 - 60, 500, 120), border_radius=15)
+        placeholder_text = render_text(font, title, WHITE)
+        screen.blit(placeholder_text, (WIDTH//2 - placeholder_text.get_width()//2, HEIGHT//2 - 35))
+        hint_text = render_text(small_font, hint, YELLOW)
+        screen.blit(hint_text, (WIDTH//2 - hint_text.get_width()//2, HEIGHT//2 + 15))
+
+    # Draw close button
+    pygame.draw.rect(screen, RED, (WIDTH//2 - 50, HEIGHT - 100, 100, 40))
+    close_text = render_text(font, "Close", WHITE)
+    screen.blit(close_text, (WIDTH//2 - close_text.get_width()//2, HEIGHT - 100 + 20 - close_text.get_height()//2))
+
+    # Draw match stats
+    stats_text = render_text(font, f"Final Score: Blue {state.blue_score} - Red {state.red_score}", WHITE)
+    screen.blit(stats_text, (WIDTH//2 - stats_text.get_width()//2, 20))
+
+    # Draw export message
+    export_text = render_text(small_font, "Performance data and comparison report exported", YELLOW)
+    screen.blit(export_text, (WIDTH//2 - export_text.get_width()//2, HEIGHT - 50))
@@ -0,0 +1,273 @@
+"""
+Headless Simulation Module
+Runs complete matches without a display, fonts or frame-rate clock.
+Built from the same physics and rules functions the windowed game uses.
+"""
+
+import contextlib
+import json
+import sys
+import os
+import time
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+from game_state import GameState
+from physics import (reset_positions, move_ai, advance_ball,
+                     keep_players_in_bounds, separate_players, handle_player_input,
+                     PLAYER_GRID_CELL, GRID_REBUILD_TICKS, GRID_SLACK, BROADPHASE_MIN_PLAYERS, AI_PLAN_INTERVAL)
+from game_rules import handle_out_of_bounds, execute_set_piece
+from data_analysis import initialize_data_structures, track_possession
+from match_archive import ArchiveWriter
+from profiler import FrameProfiler
+from spatial_hash import SpatialHash
+from telemetry import TelemetryBuffer
+
+MATCH_TICKS = MATCH_DURATION * FPS  # 3 minutes of simulated play
+# Version written into replays; bumped whenever the same seed and inputs would play out differently
+REPLAY_VERSION = 5
+
+class Match:
+    """A single match that advances ``ticks_per_step`` simulation ticks (default 1) per step() call.
+
+    Never touches the display, fonts or clock. Match time is counted in ticks
+    (FPS per simulated second). Human-controlled teams move only when an input
+    mask (physics.read_input_mask) is passed to step().
+
+    - ``seed``: seeds all of the match's randomness (a fresh seed when None).
+      The same seed, inputs and resets play out bit for bit the same, at any
+      ``ticks_per_step``; replay() returns them (see replay.py).
+    - ``data``: (time_data, player_movement_data, game_stats) shared across
+      matches; this mode's entries are cleared.
+    - ``archive_path``: record every step into a binary match archive
+      (see match_archive.py).
+    - ``replay_path``: save the replay there on close().
+    - ``profiler``: a profiler.FrameProfiler timing each subsystem (none by default).
+    - ``team_size``: players per team.
+    - ``ai_plan_interval``: ticks between AI plans (default AI_PLAN_INTERVAL).
+
+    ticks_played counts steps. finish() finalizes the stats and calls
+    close(), which ends the archive and writes the replay; a match stepped
+    or reset after finish() plays on without an archive.
+    """
+
+    def __init__(self, mode="bot_vs_bot", duration_ticks=MATCH_TICKS, data=None,
+                 record_step_times=True, archive_path=None, seed=None, replay_path=None,
+                 profiler=None, team_size=2, ticks_per_step=1, ai_plan_interval=AI_PLAN_INTERVAL):
+        self.mode = mode
+        self.duration_ticks = duration_ticks
+        self.record_step_times = record_step_times
+        self.replay_path = replay_path
+        self.ticks_per_step = ticks_per_step
+        self.ai_plan_interval = ai_plan_interval
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+
+        # Ball, players (team_size per team), scores, set pieces, possession, crowd and RNG
+        self.state = GameState(mode, team_size=team_size, seed=seed)
+        self.player_grid = SpatialHash(PLAYER_GRID_CELL) if 2 * team_size >= BROADPHASE_MIN_PLAYERS else None
+        self._grid_tick = None  # frame_count when player_grid was built; None when players were moved since
+
+        # Replay log: steps taken, [step, inputs] whenever the inputs change, resets
+        self.ticks_played = 0  # steps, of ticks_per_step ticks each
+        self.input_log = []
+        self.resets = []
+        self._last_inputs = 0
+
+        # Data collection
+        if data is None:
+            data = initialize_data_structures(team_size)
+        self.time_data, self.player_movement_data, self.game_stats = data
+        self.time_data[mode].clear()
+        self.player_movement_data[mode].clear()
+        if self.player_movement_data[mode].team_size != team_size:
+            self.player_movement_data[mode] = TelemetryBuffer(self.player_movement_data[mode].capacity, team_size)
+
+        self.archive = None
+        if archive_path is not None:
+            self.archive = ArchiveWriter(archive_path, len(self.state.blue_team), {"mode": mode})
+
+    @property
+    def frame_count(self):
+        """Ticks simulated so far"""
+        return self.state.frame_count
+
+    @property
+    def match_time(self):
+        """Simulated match time in seconds"""
+        return self.state.match_time
+
+    @property
+    def finished(self):
+        """True once the match has played its full duration"""
+        return self.state.frame_count >= self.duration_ticks
+
+    def reset(self):
+        """Reset scores, positions and the match clock (collected data is kept).
+
+        After finish() the archive is closed and holds the finished match;
+        the restarted match is then no longer archived.
+        """
+        state = self.state
+        if self.archive is not None and self.archive.closed:
+            self.archive = None
+        state.blue_score = 0
+        state.red_score = 0
+        state.goal_timer = 0
+        state.set_piece_type = None
+        state.set_piece_team = None
+        reset_positions(state)
+        state.frame_count = 0
+        self.resets.append(self.ticks_played)
+        self._grid_tick = None
+
+    def restore(self, state, ticks_played):
+        """Continue from a GameState snapshot taken after ``ticks_played`` steps.
+
+        Used to seek within a replay; the replay log restarts from that point.
+        """
+        self.state = state
+        self.ticks_played = ticks_played
+        self.input_log = []
+        self.resets = []
+        self._last_inputs = 0
+        self._grid_tick = None
+
+    def step(self, inputs=None):
+        """Advance the match by one step (ticks_per_step ticks) with the given human input mask"""
+        step_start_time = time.perf_counter()
+        state = self.state
+        if self.archive is not None and self.archive.closed:
+            # Played on after finish(): the archive holds the finished match, this is no longer recorded
+            self.archive = None
+        # The last step of a match only plays the ticks left
+        ticks = max(1, min(self.ticks_per_step, self.duration_ticks - state.frame_count))
+
+        inputs = inputs or 0
+        if inputs != self._last_inputs:
+            self.input_log.append([self.ticks_played, inputs])
+            self._last_inputs = inputs
+
+        for _ in range(ticks):
+            self._tick(inputs)
+        with self.profiler.span("data"):
+            self.player_movement_data[self.mode].record(state)
+
+        step_time = time.perf_counter() - step_start_time
+        if self.archive is not None:
+            with self.profiler.span("archive"):
+                self.archive.record(state, step_time)
+        if self.record_step_times:
+            self.time_data[self.mode].append(step_time)
+        self.ticks_played += 1
+
+    def _tick(self, inputs):
+        """Simulate one tick: rules, player movement, physics and possession"""
+        state = self.state
+        span = self.profiler.span
+
+        with span("rules"):
+            if state.goal_timer > 0:
+                state.goal_timer -= 1
+
+            # Handle set pieces and out of bounds (including goals)
+            if state.set_piece_type is not None:
+                execute_set_piece(state)
+            else:
+                handle_out_of_bounds(state, self.game_stats)
+                if state.set_piece_type is not None:
+                    self._grid_tick = None  # goals and restarts move players anywhere
+
+        # Move players according to the game mode
+        if inputs:
+            with span("input"):
+                handle_player_input(inputs, state)
+        with span("ai"):
+            if self.mode == "bot_vs_bot":
+                move_ai(state, state.blue_team, is_red=False, plan_interval=self.ai_plan_interval)
+            if self.mode in ("bot_vs_bot", "bot_vs_man"):
+                move_ai(state, state.red_team, is_red=True, plan_interval=self.ai_plan_interval)
+
+        with span("physics"):
+            keep_players_in_bounds(state.blue_team)
+            keep_players_in_bounds(state.red_team)
+            if separate_players(state, self._players_grid()):
+                self._grid_tick = None  # pushes apart may exceed the grid's slack
+
+            # Ball movement with friction and collisions (only if not in set piece)
+            if state.set_piece_type is None:
+                state.last_touch = advance_ball(state, grid=self._players_grid()) or state.last_touch
+            else:
+                state.ball.vx, state.ball.vy = 0, 0
+
+        with span("data"):
+            track_possession(state, self.game_stats)
+        state.frame_count += 1
+
+    def _players_grid(self):
+        """The player spatial hash, rebuilt if players may have moved beyond its slack; None for small teams"""
+        grid = self.player_grid
+        if grid is not None and (self._grid_tick is None
+                                 or self.state.frame_count - self._grid_tick >= GRID_REBUILD_TICKS):
+            grid.rebuild(self.state.players, GRID_SLACK)
+            self._grid_tick = self.state.frame_count
+        return grid
+
+    def finish(self):
+        """Finalize possession tracking and match duration, return this mode's stats.
+
+        Closes the archive; a match stepped on afterwards is no longer archived.
+        """
+        state = self.state
+        stats = self.game_stats[self.mode]
+        if state.last_possession:
+            stats["possession_time"][state.last_possession] += state.possession_timer
+            state.possession_timer = 0
+        stats["match_duration"] = state.match_time
+        self.close()
+        return stats
+
+    def close(self):
+        """Write the rest of the archive and the replay (if recording) with the final score"""
+        state = self.state
+        if self.archive is not None:
+            self.archive.close({"seed": state.seed, "blue_score": state.blue_score,
+                                "red_score": state.red_score, "stats": self.game_stats[self.mode]})
+        if self.replay_path is not None:
+            directory = os.path.dirname(self.replay_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.replay_path, "w") as f:
+                json.dump(self.replay(), f)
+
+    def replay(self):
+        """Everything needed to re-simulate this match so far: seed, inputs and resets"""
+        state = self.state
+        return {
+            "format": "robosoccer-replay",
+            "version": REPLAY_VERSION,
+            "mode": self.mode,
+            "seed": state.seed,
+            "team_size": len(state.blue_team),
+            "ticks_per_step": self.ticks_per_step,
+            "ai_plan_interval": self.ai_plan_interval,
+            "duration_ticks": self.duration_ticks,
+            "ticks": self.ticks_played,
+            "inputs": [list(change) for change in self.input_log],
+            "resets": list(self.resets),
+            "final": {"blue_score": state.blue_score, "red_score": state.red_score,
+                      "digest": state.digest()},
+        }
+
+    def run(self, quiet=True):
+        """Step until the match is over and return its stats.
+
+        With ``quiet`` the per-event console messages from the rules are discarded.
+        Each tick is one profiler frame.
+        """
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+                while not self.finished:
+                    self.step()
+                    self.profiler.end_frame()
+        return self.finish()
@@ -3,276 +3,287 @@ Main Game Controller
 Orchestrates the entire soccer game using modular components.
 """
 
-"""
-Main Game Controller
-Orchestrates the entire soccer game using modular components.
-"""
-
 import pygame
 import sys
 import time
-import random
 import os
+from datetime import datetime
 
 # Import from the same directory
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from game_config import *
-from physics import (reset_positions, move_ai, handle_ball_collision, 
-                     keep_players_in_bounds, handle_player_input)
-from game_rules import handle_out_of_bounds, execute_set_piece
-from graphics import (draw_mode_selection, draw_field, draw_players_and_ball, 
+from headless import Match
+from physics import read_input_mask
+from graphics import (AUDIENCE_AREAS, draw_mode_selection, get_background_layer, draw_players_and_ball, 
                       draw_time_complexity_graph, draw_set_piece_indicator, 
-                      draw_ui_elements, draw_pause_screen, draw_performance_report)
-from data_analysis import (initialize_data_structures, collect_research_data,
-                           export_performance_data, export_comparison_report,
-                           generate_performance_report)
+                      draw_hud, draw_controls_help, draw_pause_screen, draw_performance_report,
+                      draw_speed_indicator, draw_export_status, draw_profiler_overlay, text_cache, REPORT_AREA)
+from renderer import DirtyRectRenderer
+from data_analysis import initialize_data_structures, snapshot_data, export_all, data_version
+from analytics import analyze_all_modes
+from export_worker import ExportWorker
+from report_cache import ReportCache
+from replay_viewer import run_replay_viewer
+from profiler import FrameProfiler
 
-def initialize_game():
-    """Initialize all game objects and data structures"""
-    # Initialize ball
-    ball = pygame.Rect(WIDTH//2 - BALL_RADIUS, HEIGHT//2 - BALL_RADIUS, BALL_RADIUS*2, BALL_RADIUS*2)
-    ball_vel = [random.choice([-BALL_SPEED, BALL_SPEED]), random.choice([-BALL_SPEED, BALL_SPEED])]
+# Simulation ticks per rendered frame; None means uncapped fast-forward
+SIM_SPEEDS = [1, 2, 4, 8, 16, None]
+# Wall-clock budget for simulation per rendered frame when uncapped
+FAST_FORWARD_FRAME_BUDGET = 1 / 30
+# How long an export notification stays in the HUD
+EXPORT_NOTICE_MS = 4000
+# Every match played is recorded here in full (match archive) and as a replay
+RECORDINGS_DIR = os.path.join("performance_data", "recordings")
 
-    # Create players (2 per team for all modes)
-    blue_team = [pygame.Rect(FIELD_X + 50, FIELD_Y + 150 + i*150, PLAYER_RADIUS*2, PLAYER_RADIUS*2) for i in range(2)]
-    red_team = [pygame.Rect(FIELD_X + FIELD_WIDTH - 70, FIELD_Y + 150 + i*150, PLAYER_RADIUS*2, PLAYER_RADIUS*2) for i in range(2)]
+def initialize_game(team_size=2):
+    """Initialize the data structures shared by every match played this session"""
+    time_data, player_movement_data, game_stats = initialize_data_structures(team_size)
+    return time_data, player_movement_data, game_stats
 
-    # Scores
-    blue_score = 0
-    red_score = 0
+def change_mode(new_mode, data, profiler=None, team_size=2):
+    """Start a fresh match in the given mode, clearing that mode's data and recording it to disk"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    recording = os.path.join(RECORDINGS_DIR, f"{new_mode}_{timestamp}")
+    return Match(new_mode, data=data, record_step_times=False,
+                 archive_path=recording + ".match", replay_path=recording + ".replay.json",
+                 profiler=profiler, team_size=team_size)
 
-    # Game state
-    game_paused = False
-    goal_timer = 0
-    set_piece_timer = 0
-    set_piece_type = None  # 'corner', 'throw_in', 'goal_kick'
-    set_piece_team = None  # 'blue' or 'red'
-    set_piece_start_positions = {"blue": [], "red": []}  # Track starting positions for movement detection
-    last_touch = None  # Track which team last touched the ball
+def run_simulation(match, inputs, sim_speed):
+    """Advance the match for one rendered frame and return the number of ticks run.
 
-    # Initialize data structures
-    time_data, player_movement_data, ball_position_data, game_stats = initialize_data_structures()
+    With a numeric speed, exactly that many fixed-size ticks run per frame.
+    With an uncapped speed (None), ticks run until the frame budget is used up.
+    """
+    ticks = 0
+    if sim_speed is None:
+        budget_end = time.perf_counter() + FAST_FORWARD_FRAME_BUDGET
+        while not match.finished and time.perf_counter() < budget_end:
+            match.step(inputs)
+            ticks += 1
+    else:
+        while ticks < sim_speed and not match.finished:
+            match.step(inputs)
+            ticks += 1
+    return ticks
 
-    current_mode = None  # Start with no mode selected
-    analysis_start_time = 0
-    match_start_time = 0
-    match_duration = 0
-    show_results = False
-    frame_count = 0
-    possession_timer = 0
-    last_possession = None
+def submit_export(export_worker, snapshot, analytics=None):
+    """Export a snapshot of the collected data on the background worker, return True if queued"""
+    if export_worker.submit("Report export", export_all, *snapshot, analytics):
+        print("📊 Exporting reports in the background...")
+        return True
+    return False
 
-    # Create audience
-    audience = create_audience()
+def speed_label(sim_speed):
+    """Human-readable label for a simulation speed"""
+    return "MAX" if sim_speed is None else f"{sim_speed}x"
 
-    return (ball, ball_vel, blue_team, red_team, blue_score, red_score, game_paused, goal_timer,
-            set_piece_timer, set_piece_type, set_piece_team, set_piece_start_positions, last_touch,
-            time_data, player_movement_data, ball_position_data, game_stats, current_mode,
-            analysis_start_time, match_start_time, match_duration, show_results, frame_count,
-            possession_timer, last_possession, audience)
+def main(sim_speed=1, profile=False, team_size=2):
+    """Main game loop.
 
-def change_mode(new_mode, time_data, player_movement_data, ball_position_data, 
-                blue_team, red_team, ball, ball_vel):
-    """Change the current game mode"""
-    current_mode = new_mode
-    analysis_start_time = time.time()
-    match_start_time = time.time()
-    frame_count = 0
-    
-    # Clear data for the new mode
-    time_data[current_mode].clear()
-    player_movement_data[current_mode].clear()
-    ball_position_data[current_mode].clear()
-    
-    # Reset to 2 players per team for all modes
-    blue_team = [pygame.Rect(FIELD_X + 50, FIELD_Y + 150 + i*150, PLAYER_RADIUS*2, PLAYER_RADIUS*2) for i in range(2)]
-    red_team = [pygame.Rect(FIELD_X + FIELD_WIDTH - 70, FIELD_Y + 150 + i*150, PLAYER_RADIUS*2, PLAYER_RADIUS*2) for i in range(2)]
-    
-    reset_positions(ball, ball_vel, blue_team, red_team)
-    
-    return current_mode, analysis_start_time, match_start_time, frame_count, blue_team, red_team
+    The simulation runs on a fixed timestep measured in ticks; ``sim_speed``
+    ticks are simulated per rendered frame (None for uncapped fast-forward).
+    Press F in game to cycle through the speeds.
 
-def main():
-    """Main game loop"""
+    F3 (or ``profile``) switches the frame profiler on: every subsystem of the
+    frame is timed and the breakdown is drawn over the field.
+
+    Every match has ``team_size`` players per team; humans control the first two.
+    """
+    title = f"RoboSoccer - {team_size}v{team_size}"
+    pygame.display.set_caption(title)
     print("Starting main game loop...")
     print("=== ROBOSOCCER GAME STARTED ===")
-    print("Look for the game window titled 'RoboSoccer - 2v2'")
+    print(f"Look for the game window titled '{title}'")
     print("If you can't see it, try Alt+Tab to find it")
     print("===============================")
     
     # Initialize everything
-    (ball, ball_vel, blue_team, red_team, blue_score, red_score, game_paused, goal_timer,
-     set_piece_timer, set_piece_type, set_piece_team, set_piece_start_positions, last_touch,
-     time_data, player_movement_data, ball_position_data, game_stats, current_mode,
-     analysis_start_time, match_start_time, match_duration, show_results, frame_count,
-     possession_timer, last_possession, audience) = initialize_game()
+    data = initialize_game(team_size)
+    time_data, player_movement_data, game_stats = data
+    match = None
+    recordings = {}  # mode -> ArchiveWriter of the latest match played in it
+    current_mode = None
+    game_paused = False
+    show_results = False
     
     running = True
-    match_start_time = time.time()
     data_exported = False
     mode_selection = True
-    report_surface = None
+    report_version = None    # data version shown on the results screen
+    exported_version = None  # data version of the last export
+    renderer = DirtyRectRenderer(screen)
+    export_worker = ExportWorker()
+    report_cache = ReportCache(export_worker, fit=REPORT_AREA.size)
+    export_notice = None  # (status, message) of the last finished export
+    export_notice_until = 0
+    profiler = FrameProfiler(enabled=profile)
+    span = profiler.span
 
     while running:
+        profiler.end_frame()
         frame_start_time = time.time()
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE and not mode_selection:
-                    # Return to mode selection
-                    mode_selection = True
-                    current_mode = None
-                    show_results = False
-                elif event.key == pygame.K_SPACE and not mode_selection:
-                    game_paused = not game_paused
-                elif event.key == pygame.K_r and not mode_selection:
-                    blue_score = 0
-                    red_score = 0
-                    reset_positions(ball, ball_vel, blue_team, red_team)
-                    data_exported = False
-                    match_start_time = time.time()
-                    frame_count = 0
-                elif event.key == pygame.K_e and not mode_selection:
-                    # Export report immediately (E key)
-                    print("\n" + "="*60)
-                    print("📊 EXPORTING REPORTS NOW...")
-                    print("="*60)
-                    export_performance_data(time_data, player_movement_data, ball_position_data, game_stats)
-                    export_comparison_report(time_data, game_stats, player_movement_data)
-                    print("✅ Reports exported successfully!")
-                    print("="*60 + "\n")
-                elif event.key == pygame.K_p and show_results:
-                    # Check if click is on close button
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    if WIDTH//2 - 50 <= mouse_x <= WIDTH//2 + 50 and HEIGHT - 100 <= mouse_y <= HEIGHT - 60:
-                        show_results = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if mode_selection:
-                    # Mode selection screen
-                    buttons = draw_mode_selection(screen)
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    for button_rect, mode in buttons:
-                        if button_rect.collidepoint(mouse_x, mouse_y):
-                            (current_mode, analysis_start_time, match_start_time, frame_count, 
-                             blue_team, red_team) = change_mode(mode, time_data, player_movement_data, 
-                                                              ball_position_data, blue_team, red_team, 
-                                                              ball, ball_vel)
-                            mode_selection = False
-                elif show_results:
-                    # Check if click is on close button
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    if WIDTH//2 - 50 <= mouse_x <= WIDTH//2 + 50 and HEIGHT - 100 <= mouse_y <= HEIGHT - 60:
+        with span("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE and not mode_selection:
+                        # Return to mode selection
+                        mode_selection = True
+                        current_mode = None
                         show_results = False
+                    elif event.key == pygame.K_SPACE and not mode_selection:
+                        game_paused = not game_paused
+                    elif event.key == pygame.K_r and not mode_selection and not show_results:
+                        # Not on the results screen: the finished match is already saved
+                        match.reset()
+                        data_exported = False
+                    elif event.key == pygame.K_f and not mode_selection:
+                        # Cycle fast-forward speed
+                        sim_speed = SIM_SPEEDS[(SIM_SPEEDS.index(sim_speed) + 1) % len(SIM_SPEEDS)]
+                        print(f"Simulation speed: {speed_label(sim_speed)}")
+                    elif event.key == pygame.K_e and not mode_selection:
+                        # Export report (E key) without stalling the game loop
+                        snapshot = snapshot_data(*data, recordings)
+                        version = data_version(*snapshot)
+                        if version == exported_version:
+                            print("📊 Nothing new to export since the last export")
+                        elif submit_export(export_worker, snapshot):
+                            exported_version = version
+                    elif event.key == pygame.K_F3:
+                        # Frame profiler on / off
+                        print(f"⏱️ Frame profiler {'on' if profiler.toggle() else 'off'}")
+                    elif event.key == pygame.K_p and show_results:
+                        # Check if click is on close button
+                        mouse_x, mouse_y = pygame.mouse.get_pos()
+                        if WIDTH//2 - 50 <= mouse_x <= WIDTH//2 + 50 and HEIGHT - 100 <= mouse_y <= HEIGHT - 60:
+                            show_results = False
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if mode_selection:
+                        # Mode selection screen
+                        buttons = draw_mode_selection(screen)
+                        mouse_x, mouse_y = pygame.mouse.get_pos()
+                        for button_rect, mode in buttons:
+                            if button_rect.collidepoint(mouse_x, mouse_y) and mode == "replay":
+                                # Save the match in progress so it can be watched too
+                                if match:
+                                    match.close()
+                                running = run_replay_viewer(RECORDINGS_DIR)
+                            elif button_rect.collidepoint(mouse_x, mouse_y):
+                                current_mode = mode
+                                if match:
+                                    match.close()
+                                match = change_mode(mode, data, profiler, team_size)
+                                recordings[mode] = match.archive
+                                mode_selection = False
+                    elif show_results:
+                        # Check if click is on close button
+                        mouse_x, mouse_y = pygame.mouse.get_pos()
+                        if WIDTH//2 - 50 <= mouse_x <= WIDTH//2 + 50 and HEIGHT - 100 <= mouse_y <= HEIGHT - 60:
+                            show_results = False
+
+            # Pick up finished background exports
+            for status, message in export_worker.poll():
+                print(("✅ " if status == "done" else "❌ ") + message)
+                export_notice = (status, message)
+                export_notice_until = pygame.time.get_ticks() + EXPORT_NOTICE_MS
+            if export_worker.pending():
+                export_status = ("pending", "Exporting reports...")
+            elif export_notice and pygame.time.get_ticks() < export_notice_until:
+                export_status = export_notice
+            else:
+                export_status = None
 
         if mode_selection:
             buttons = draw_mode_selection(screen)
             pygame.display.flip()
+            renderer.invalidate()
+            clock.tick(60)
             continue
 
         if show_results:
             if not data_exported:
-                export_performance_data(time_data, player_movement_data, ball_position_data, game_stats)
-                export_comparison_report(time_data, game_stats, player_movement_data)
-                report_surface = generate_performance_report(time_data, player_movement_data, ball_position_data)
+                # Export and draw the report in the background; unchanged data
+                # (e.g. reopening the results screen) is neither exported nor drawn again
+                snapshot = snapshot_data(*data, recordings)
+                report_version = data_version(*snapshot)
+                changed = report_version != exported_version
+                analytics = analyze_all_modes(snapshot[1]) if changed else None
+                report_cache.request(report_version, snapshot[0], snapshot[1], analytics)
+                if changed and submit_export(export_worker, snapshot, analytics):
+                    exported_version = report_version
                 data_exported = True
                 
-            draw_performance_report(screen, report_surface, blue_score, red_score)
+            draw_performance_report(screen, report_cache.get(report_version), match.state,
+                                    generating=report_cache.pending(report_version))
+            if export_status:
+                draw_export_status(screen, *export_status)
             pygame.display.flip()
+            renderer.invalidate()
+            clock.tick(60)
             continue
 
         if game_paused:
             draw_pause_screen(screen)
             pygame.display.flip()
+            renderer.invalidate()
+            clock.tick(60)
             continue
 
-        if goal_timer > 0:
-            goal_timer -= 1
-
-        # Handle set pieces and out of bounds (including goals)
-        if set_piece_type is not None:
-            set_piece_completed = execute_set_piece(ball, ball_vel, blue_team, red_team, set_piece_team)
-            if set_piece_completed:
-                set_piece_type = None
-                set_piece_team = None
-                set_piece_timer = 0
-                set_piece_start_positions = {"blue": [], "red": []}
-        else:
-            # Normal play - check for out of bounds and goals
-            bounds_result = handle_out_of_bounds(ball, ball_vel, blue_team, red_team, blue_score, red_score, 
-                                               last_touch, game_stats, current_mode, audience, cheer_sound)
-            
-            if bounds_result[0] != "in_play":
-                (result_type, set_piece_type, set_piece_team, set_piece_timer, 
-                 set_piece_start_positions, goal_timer, blue_score, red_score) = bounds_result
-
         keys = pygame.key.get_pressed()
-        
-        # Handle different game modes
-        if current_mode == "bot_vs_bot":
-            # All players are AI
-            move_ai(blue_team, ball, is_red=False, set_piece_type=set_piece_type, set_piece_team=set_piece_team)
-            move_ai(red_team, ball, is_red=True, set_piece_type=set_piece_type, set_piece_team=set_piece_team)
-        elif current_mode == "bot_vs_man":
-            # Handle manual controls for blue team
-            handle_player_input(keys, current_mode, blue_team, red_team)
-            # Red team is AI
-            move_ai(red_team, ball, is_red=True, set_piece_type=set_piece_type, set_piece_team=set_piece_team)
-        elif current_mode == "man_vs_man":
-            # Handle manual controls for both teams
-            handle_player_input(keys, current_mode, blue_team, red_team)
-
-        # Keep players within field bounds
-        keep_players_in_bounds(blue_team + red_team)
-
-        # Ball movement with friction (only if not in set piece)
-        if set_piece_type is None:
-            ball.x += ball_vel[0]
-            ball.y += ball_vel[1]
-            ball_vel[0] *= FRICTION
-            ball_vel[1] *= FRICTION
 
-            # Handle collisions only during normal play
-            last_touch = handle_ball_collision(ball, ball_vel, blue_team, red_team) or last_touch
-        else:
-            # During set piece, ball is completely stopped
-            ball_vel[0], ball_vel[1] = 0, 0
+        # Advance the simulation on its fixed timestep
+        run_simulation(match, read_input_mask(keys), sim_speed)
 
-        # Collect research data
-        possession_timer, last_possession = collect_research_data(
-            ball, blue_team, red_team, current_mode, frame_count, match_start_time,
-            player_movement_data, ball_position_data, game_stats, last_touch, 
-            possession_timer, last_possession
-        )
+        # Draw everything (only changed regions are pushed to the display)
+        state = match.state
+        with span("draw_field"):
+            renderer.begin_frame(get_background_layer(state.audience, state.audience_version),
+                                 state.audience_version, AUDIENCE_AREAS)
+        with span("draw_set_piece"):
+            renderer.add_dynamic(draw_set_piece_indicator(screen, state))
+        with span("draw_players"):
+            renderer.add_dynamic(draw_players_and_ball(screen, state))
+        with span("draw_hud"):
+            renderer.add_dynamic(draw_hud(screen, state, player_movement_data))
+            renderer.add_static(draw_controls_help(screen, current_mode))
+            if sim_speed != 1:
+                renderer.add_dynamic(draw_speed_indicator(screen, speed_label(sim_speed)))
+            if export_status:
+                renderer.add_dynamic(draw_export_status(screen, *export_status))
 
-        # Draw everything
-        draw_field(screen, audience)
-        draw_set_piece_indicator(screen, set_piece_type, set_piece_team)
-        draw_players_and_ball(screen, ball, blue_team, red_team)
-        draw_ui_elements(screen, blue_score, red_score, match_start_time, frame_count, 
-                        player_movement_data, current_mode, time_data)
-
-        # Calculate and store frame time for complexity analysis
-        frame_time = time.time() - frame_start_time
-        time_data[current_mode].append(frame_time)
-        
         # Draw time complexity graph
-        draw_time_complexity_graph(screen, time_data, current_mode)
+        with span("draw_graph"):
+            renderer.add_dynamic(draw_time_complexity_graph(screen, time_data, current_mode))
+        if profiler.enabled:
+            with span("draw_profiler"):
+                renderer.add_dynamic(draw_profiler_overlay(screen, profiler))
         
-        # End match after 3 minutes or when Q is pressed
-        match_duration = time.time() - match_start_time
-        if (match_duration >= 180 or keys[pygame.K_q]) and not show_results:
-            # Finalize possession tracking
-            if last_possession:
-                game_stats[current_mode]["possession_time"][last_possession] += possession_timer
-            game_stats[current_mode]["match_duration"] = match_duration
+        # End match after 3 minutes of match time or when Q is pressed
+        if (match.finished or keys[pygame.K_q]) and not show_results:
+            match.finish()
             show_results = True
+            print(f"🖼️ Pixels pushed per frame: {renderer.average_pixels_pushed():.0f} on average "
+                  f"({100 * renderer.average_pixels_pushed() / (WIDTH * HEIGHT):.1f}% of a full flip)")
+            cache_stats = text_cache.stats()
+            print(f"🔤 Text cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({100 * cache_stats['hit_rate']:.1f}% hit rate)")
 
-        frame_count += 1
-        pygame.display.flip()
-        clock.tick(60)
+        with span("flip"):
+            renderer.end_frame()
+        # Calculate and store frame time for complexity analysis (overlays and flip included)
+        frame_time = time.time() - frame_start_time
+        time_data[current_mode].append(frame_time)
+        # Fixed speeds stay locked to 60 rendered frames per second;
+        # uncapped fast-forward renders as often as the frame budget allows
+        with span("tick"):
+            clock.tick(0 if sim_speed is None else 60)
 
+    # Let queued exports finish writing before exiting
+    if match:
+        match.close()
+    export_worker.close()
     pygame.quit()
     sys.exit()
 
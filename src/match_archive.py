@@ -0,0 +1,313 @@
+"""
+Match Archive Module
+Binary columnar archive of match telemetry: one raw little-endian file per
+column, a small JSON header and a chunk index. Recorded in fixed-size chunks
+while the match runs (constant memory, whole match) and read back as
+np.memmap views without any parsing.
+"""
+
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+from telemetry import TelemetryBuffer
+
+ARCHIVE_FORMAT = "robosoccer-match"
+ARCHIVE_VERSION = 2
+HEADER_FILE = "header.json"
+INDEX_FILE = "chunks.jsonl"
+CHUNK_FRAMES = 1024  # frames held in memory before a chunk is written
+
+# Column name -> dtype; player columns hold one value per player per frame
+COLUMNS = {
+    "frame": "<i4",
+    "time": "<f4",
+    "player_x": "<f4",
+    "player_y": "<f4",
+    "ball_x": "<f4",
+    "ball_y": "<f4",
+    "ball_vx": "<f4",
+    "ball_vy": "<f4",
+    "step_time": "<f4",
+}
+PLAYER_COLUMNS = ("player_x", "player_y")
+
+class ArchiveWriter:
+    """Records a match into an archive directory (conventionally ``*.match``).
+
+    record() is called once per tick and only writes into a preallocated
+    TelemetryBuffer of ``chunk_frames`` frames; whenever it fills up, the
+    chunk is appended to the column files and listed in the chunk index
+    (``chunks.jsonl``: chunk number, first row, frame count, frame range).
+    Memory use is therefore constant however long the match runs.
+    flush() writes a partial chunk early, e.g. before exporting mid-match.
+    close() flushes and stores the final metadata (scores, stats) in the header;
+    recording or appending into a closed archive raises ValueError.
+    """
+
+    def __init__(self, path, team_size=2, metadata=None, chunk_frames=CHUNK_FRAMES):
+        self.path = path
+        self.team_size = team_size
+        self.chunk_frames = chunk_frames
+        self.n_frames = 0
+        self.n_chunks = 0
+        self.metadata = dict(metadata or {})
+        self.closed = False
+
+        self._buffer = TelemetryBuffer(chunk_frames, team_size)
+        self._step_times = np.zeros(chunk_frames, dtype=np.float32)
+
+        os.makedirs(path, exist_ok=True)
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name in COLUMNS}
+        self._index = open(os.path.join(path, INDEX_FILE), "w")
+        self._write_header()
+
+    def _write_header(self):
+        header = {
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_VERSION,
+            "team_size": self.team_size,
+            "fps": FPS,
+            "chunk_frames": self.chunk_frames,
+            "n_frames": self.n_frames,
+            "columns": COLUMNS,
+            "metadata": self.metadata,
+        }
+        with open(os.path.join(self.path, HEADER_FILE), "w") as f:
+            json.dump(header, f, indent=2)
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError(f"archive {self.path} is closed")
+
+    def record(self, state, step_time=0.0):
+        """Record one tick of the given GameState (and how long it took to simulate)"""
+        self._check_open()
+        self._step_times[len(self._buffer)] = step_time
+        self._buffer.record(state)
+        if len(self._buffer) == self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered frames as a chunk so readers can see them (nothing left once closed)"""
+        buffer = self._buffer
+        if self.closed or not buffer:
+            return
+        self._write_chunk(buffer, self._step_times[:len(buffer)])
+        buffer.clear()
+
+    def append_all(self, telemetry):
+        """Write every sample currently held by ``telemetry`` (for one-off exports)"""
+        self._check_open()
+        self.flush()
+        step_times = np.full(len(telemetry), np.nan, dtype=np.float32)  # not measured
+        for start in range(0, len(telemetry), self.chunk_frames):
+            self._write_chunk(_TelemetrySlice(telemetry, start, start + self.chunk_frames),
+                              step_times[start:start + self.chunk_frames])
+        return len(telemetry)
+
+    def _write_chunk(self, telemetry, step_times):
+        """Append all samples of ``telemetry`` to the column files and index them"""
+        n = len(telemetry)
+        for name in COLUMNS:
+            f = self._files[name]
+            column = step_times if name == "step_time" else getattr(telemetry, name)
+            if name in PLAYER_COLUMNS:
+                # (n_players, n) -> frame-major rows of n_players values
+                np.ascontiguousarray(column.T, dtype=COLUMNS[name]).tofile(f)
+            else:
+                column.astype(COLUMNS[name], copy=False).tofile(f)
+            f.flush()
+
+        frames = telemetry.frame
+        self._index.write(json.dumps({"chunk": self.n_chunks, "row": self.n_frames, "n_frames": n,
+                                      "first_frame": int(frames[0]), "last_frame": int(frames[-1])}) + "\n")
+        self._index.flush()
+        self.n_chunks += 1
+        self.n_frames += n
+
+    def close(self, metadata=None):
+        """Write the last chunk and the final header"""
+        if self.closed:
+            return
+        if metadata:
+            self.metadata.update(metadata)
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._index.close()
+        self._write_header()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class _TelemetrySlice:
+    """Rows [start, stop) of a TelemetryBuffer's column views"""
+
+    def __init__(self, telemetry, start, stop):
+        self.telemetry = telemetry
+        self.rows = slice(start, min(stop, len(telemetry)))
+
+    def __len__(self):
+        return self.rows.stop - self.rows.start
+
+    def __getattr__(self, name):
+        column = getattr(self.telemetry, name)
+        return column[:, self.rows] if name in PLAYER_COLUMNS else column[self.rows]
+
+class ArchiveView:
+    """Rows [start, stop) of a MatchArchive, as memory-mapped column views.
+
+    Exposes the same column names as TelemetryBuffer (player_x / player_y with
+    shape (n_players, n_frames), blue team first), so the analytics functions
+    accept any view. Slicing a view never reads the data itself.
+    """
+
+    def __init__(self, archive, start, stop):
+        self.archive = archive
+        self.start = start
+        self.stop = stop
+        self.team_size = archive.team_size
+        self.n_players = 2 * archive.team_size
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def column(self, name):
+        """Memory-mapped column; player columns have shape (n_frames, n_players)"""
+        return self.archive.full_column(name)[self.start:self.stop]
+
+    def rows(self, start, stop):
+        """View of rows [start, stop) relative to this view"""
+        start = self.start + max(0, min(start, len(self)))
+        stop = self.start + max(0, min(stop, len(self)))
+        return ArchiveView(self.archive, start, max(start, stop))
+
+    @property
+    def frame(self):
+        return self.column("frame")
+
+    @property
+    def time(self):
+        return self.column("time")
+
+    @property
+    def player_x(self):
+        """Player x positions, shape (n_players, n_frames), blue team first"""
+        return self.column("player_x").T
+
+    @property
+    def player_y(self):
+        """Player y positions, shape (n_players, n_frames), blue team first"""
+        return self.column("player_y").T
+
+    @property
+    def ball_x(self):
+        return self.column("ball_x")
+
+    @property
+    def ball_y(self):
+        return self.column("ball_y")
+
+    @property
+    def ball_vx(self):
+        return self.column("ball_vx")
+
+    @property
+    def ball_vy(self):
+        return self.column("ball_vy")
+
+    @property
+    def step_time(self):
+        """Seconds spent simulating each tick (NaN where it was not measured)"""
+        return self.column("step_time")
+
+class MatchArchive(ArchiveView):
+    """Read-only archive: every column is an np.memmap, nothing is parsed.
+
+    The frame count comes from the chunk index, so an archive that is still
+    being recorded can be read up to its last complete chunk. ``n_frames``
+    pins the archive to a known length; it is what gets pickled, so another
+    process reopens the files instead of receiving their contents.
+    """
+
+    def __init__(self, path, n_frames=None):
+        self.path = path
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            self.header = json.load(f)
+        if self.header.get("format") != ARCHIVE_FORMAT:
+            raise ValueError(f"{path} is not a match archive")
+        self.metadata = self.header["metadata"]
+
+        self.chunks = []
+        with open(os.path.join(path, INDEX_FILE)) as f:
+            for line in f:
+                if line.endswith("\n"):  # skip a line still being written
+                    self.chunks.append(json.loads(line))
+        recorded = self.chunks[-1]["row"] + self.chunks[-1]["n_frames"] if self.chunks else 0
+        if n_frames is not None:
+            recorded = min(recorded, n_frames)
+
+        self.team_size = self.header["team_size"]
+        self._columns = {}
+        super().__init__(self, 0, recorded)
+
+    def full_column(self, name):
+        """Memory map of a whole column (opened on first use)"""
+        if name not in self._columns:
+            dtype = self.header["columns"][name]
+            shape = (self.stop, self.n_players) if name in PLAYER_COLUMNS else (self.stop,)
+            if self.stop == 0:
+                self._columns[name] = np.empty(shape, dtype=dtype)
+            else:
+                self._columns[name] = np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype,
+                                                mode="r", shape=shape)
+        return self._columns[name]
+
+    def chunk(self, index):
+        """View of one recorded chunk"""
+        entry = self.chunks[index]
+        return self.rows(entry["row"], entry["row"] + entry["n_frames"])
+
+    def iter_chunks(self):
+        """Yield every chunk view in order (constant memory for any archive size)"""
+        for index, entry in enumerate(self.chunks):
+            if entry["row"] >= self.stop:
+                return
+            yield self.chunk(index)
+
+    def find_frame(self, frame):
+        """Row of the first sample with the given frame number, or None.
+
+        The chunk index narrows the search to the chunks whose frame range
+        holds ``frame``, so only those pages are read.
+        """
+        for index, entry in enumerate(self.chunks):
+            if entry["row"] >= self.stop:
+                break
+            if entry["first_frame"] <= frame <= entry["last_frame"]:
+                hits = np.flatnonzero(self.chunk(index).frame == frame)
+                if len(hits):
+                    return entry["row"] + int(hits[0])
+        return None
+
+    def __getstate__(self):
+        return {"path": self.path, "n_frames": self.stop}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["n_frames"])
+
+def iter_archives(directory):
+    """Yield the archives in ``directory`` (e.g. a tournament's recordings), sorted by name"""
+    for path in sorted(glob.glob(os.path.join(directory, "*.match"))):
+        yield MatchArchive(path)
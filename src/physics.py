@@ -1,207 +1,438 @@
 """
 Physics Module
 Handles player movement, ball physics, collisions, and AI behavior.
+All functions operate on a GameState (float center coordinates).
 """
 
 import pygame
 import math
-import random
+import numpy as np
 import sys
 import os
 
 # Import from the same directory
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from game_config import *
+from game_constants import *
+from game_state import team_start_position
+from ball_predictor import predict
+from collision import all_pairs, all_pair_indices, separate_circles, separate_bodies, PLAYER_MIN, PLAYER_MAX
+
+# Manual controls: (key, player index, dx, dy)
+BLUE_CONTROLS = [
+    # Player 1: WASD
+    (pygame.K_w, 0, 0, -PLAYER_SPEED), (pygame.K_s, 0, 0, PLAYER_SPEED),
+    (pygame.K_a, 0, -PLAYER_SPEED, 0), (pygame.K_d, 0, PLAYER_SPEED, 0),
+    # Player 2: arrow keys
+    (pygame.K_UP, 1, 0, -PLAYER_SPEED), (pygame.K_DOWN, 1, 0, PLAYER_SPEED),
+    (pygame.K_LEFT, 1, -PLAYER_SPEED, 0), (pygame.K_RIGHT, 1, PLAYER_SPEED, 0),
+]
+RED_CONTROLS = [
+    # Player 1: IJKL
+    (pygame.K_i, 0, 0, -PLAYER_SPEED), (pygame.K_k, 0, 0, PLAYER_SPEED),
+    (pygame.K_j, 0, -PLAYER_SPEED, 0), (pygame.K_l, 0, PLAYER_SPEED, 0),
+    # Player 2: UYOP
+    (pygame.K_u, 1, 0, -PLAYER_SPEED), (pygame.K_o, 1, 0, PLAYER_SPEED),
+    (pygame.K_y, 1, -PLAYER_SPEED, 0), (pygame.K_p, 1, PLAYER_SPEED, 0),
+]
+# Bit i of a tick's input mask is set while CONTROL_KEYS[i] is held
+CONTROL_KEYS = [key for key, index, dx, dy in BLUE_CONTROLS + RED_CONTROLS]
+
+# Player broadphase: a grid rebuilt every GRID_REBUILD_TICKS ticks, with room
+# for the players to move PLAYER_SPEED per tick meanwhile; its cells are wide
+# enough for two players to touch after both moved that far. Used from
+# BROADPHASE_MIN_PLAYERS players on; with fewer players testing every player
+# is cheaper than keeping the grid
+GRID_REBUILD_TICKS = 4
+GRID_SLACK = GRID_REBUILD_TICKS * PLAYER_SPEED
+PLAYER_GRID_CELL = 2 * PLAYER_RADIUS + 2 * GRID_SLACK
+BROADPHASE_MIN_PLAYERS = 32
+
+# Player-player separation runs the batched NumPy solver from this many players on
+BATCHED_SEPARATION_MIN_PLAYERS = 12
 
 def reset_team_positions(team, is_red_team=False):
     """Reset a team to their original starting positions"""
-    if is_red_team:
-        # Red team starting positions (right side)
-        for i, player in enumerate(team):
-            player.x = FIELD_X + FIELD_WIDTH - 70
-            player.y = FIELD_Y + 150 + i*150
-    else:
-        # Blue team starting positions (left side)
-        for i, player in enumerate(team):
-            player.x = FIELD_X + 50
-            player.y = FIELD_Y + 150 + i*150
+    for i, player in enumerate(team):
+        player.x, player.y = team_start_position(i, is_red_team, len(team))
 
-def reset_positions(ball, ball_vel, blue_team, red_team):
+def reset_positions(state):
     """Reset ball and players after goal"""
-    ball.x = WIDTH//2 - BALL_RADIUS
-    ball.y = HEIGHT//2 - BALL_RADIUS
-    ball_vel[0] = random.choice([-BALL_SPEED, BALL_SPEED])
-    ball_vel[1] = random.choice([-BALL_SPEED, BALL_SPEED])
-    
+    ball = state.ball
+    ball.x = WIDTH//2
+    ball.y = HEIGHT//2
+    ball.vx = state.rng.choice([-BALL_SPEED, BALL_SPEED])
+    ball.vy = state.rng.choice([-BALL_SPEED, BALL_SPEED])
+    state.replan()
+
     # Reset player positions
-    reset_team_positions(blue_team, is_red_team=False)
-    reset_team_positions(red_team, is_red_team=True)
+    reset_team_positions(state.blue_team, is_red_team=False)
+    reset_team_positions(state.red_team, is_red_team=True)
+
+def move_ai(state, players, is_red=False, plan_interval=AI_PLAN_INTERVAL):
+    """Simple but effective AI: run to where the ball can be intercepted and push towards opponent's goal.
 
-def move_ai(players, ball, is_red=False, set_piece_type=None, set_piece_team=None):
-    """Simple but effective AI: chase ball and push towards opponent's goal"""
+    Plans the team's targets (plan_ai) when due, then steers every player
+    toward its target (steer_ai). A team plans every ``plan_interval``
+    ticks, and the tick after play restarts (GameState.replan).
+    """
     # During set pieces, only allow AI to move if it's their team's turn
-    if set_piece_type is not None:
+    if state.set_piece_type is not None:
         # Allow AI to move only during their own team's set piece (kick-off)
-        if is_red and set_piece_team != "red":
+        if is_red and state.set_piece_team != "red":
             return  # Red AI stops if it's not their set piece
-        elif not is_red and set_piece_team != "blue":
+        elif not is_red and state.set_piece_team != "blue":
             return  # Blue AI stops if it's not their set piece
         # If it's their team's set piece, AI will move towards ball to restart
-    
-    for p in players:
+
+    team = 1 if is_red else 0
+    planned = state.ai_plan_ticks[team]
+    if planned is None or state.frame_count - planned >= plan_interval:
+        plan_ai(state, players, is_red)
+        state.ai_plan_ticks[team] = state.frame_count
+    steer_ai(state, players, is_red)
+
+def plan_ai(state, players, is_red=False):
+    """Choose the team's targets (state.ai_targets) and, for red, whether the striker passes.
+
+    Players close to the ball follow it, a little behind it, to push it
+    towards the opponent's goal. The others aim at the point where they can
+    first meet it on its predicted path (ball_predictor.predict), which
+    ends where the ball touches a line and play stops.
+    """
+    ball = state.ball
+    prediction = predict(ball)
+    targets = state.ai_targets
+    first = len(state.blue_team) if is_red else 0
+    step = PLAYER_SPEED - 1
+
+    for i, p in enumerate(players, first):
         # Simple AI: go towards ball with some goal bias
-        ball_distance = abs(p.centerx - ball.centerx) + abs(p.centery - ball.centery)
-        
-        # If close to ball, push it towards opponent's goal
+        ball_distance = abs(p.x - ball.x) + abs(p.y - ball.y)
+
+        # If close to ball, push it towards opponent's goal: red towards left (blue's goal), blue towards right
         if ball_distance < 50:
-            if is_red:
-                # Red team pushes ball towards left (blue's goal)
-                target_x = ball.x - 30
-                target_y = ball.y
-            else:
-                # Blue team pushes ball towards right (red's goal)
-                target_x = ball.x + 30
-                target_y = ball.y
+            targets[i] = (-30 if is_red else 30, 0, True)
+        elif prediction.stop_tick:
+            # If far from ball, head for where its path can be cut off (one iteration:
+            # re-aiming at every plan converges on the meeting point)
+            _, meet_x, meet_y = prediction.intercept(p.x, p.y, step, prediction.line_tick, 1)
+            targets[i] = (meet_x - BALL_RADIUS, meet_y - BALL_RADIUS, False)
         else:
-            # If far from ball, chase it directly
-            target_x = ball.x + random.randint(-20, 20)
-            target_y = ball.y + random.randint(-20, 20)
-        
+            # The ball is (nearly) at rest: chase it directly
+            targets[i] = (0, 0, True)
+
+    if is_red:
+        # Red team passing logic: the striker passes when the midfielder is in good
+        # position (ahead and not too far in y)
+        red_team = state.red_team
+        state.red_pass = (len(red_team) > 1 and red_team[1].x > ball.x + 50
+                          and abs(red_team[1].y - ball.y) < 100)
+
+def steer_ai(state, players, is_red=False):
+    """Move every player of the team toward its planned target, then keep the team within bounds"""
+    ball = state.ball
+    # Targets are aimed at the ball's top-left corner, as the AI always has
+    ball_left = ball.x - BALL_RADIUS
+    ball_top = ball.y - BALL_RADIUS
+    targets = state.ai_targets
+    first = len(state.blue_team) if is_red else 0
+    step = PLAYER_SPEED - 1
+
+    for i, p in enumerate(players, first):
+        target_x, target_y, follows_ball = targets[i]
+        if follows_ball:
+            target_x += ball_left
+            target_y += ball_top
+
         # Move toward target with simple logic
-        if p.centerx < target_x:
-            p.x += PLAYER_SPEED - 1
-        elif p.centerx > target_x:
-            p.x -= PLAYER_SPEED - 1
-            
-        if p.centery < target_y:
-            p.y += PLAYER_SPEED - 1
-        elif p.centery > target_y:
-            p.y -= PLAYER_SPEED - 1
-            
-        # Keep within field bounds
-        if p.left < FIELD_X:
-            p.left = FIELD_X
-        if p.right > FIELD_X + FIELD_WIDTH:
-            p.right = FIELD_X + FIELD_WIDTH
-        if p.top < FIELD_Y:
-            p.top = FIELD_Y
-        if p.bottom > FIELD_Y + FIELD_HEIGHT:
-            p.bottom = FIELD_Y + FIELD_HEIGHT
-
-def handle_ball_collision(ball, ball_vel, blue_team, red_team):
-    """Handle ball collision with players and walls"""
+        if p.x < target_x:
+            p.x += step
+        elif p.x > target_x:
+            p.x -= step
+
+        if p.y < target_y:
+            p.y += step
+        elif p.y > target_y:
+            p.y -= step
+
+    # Keep within field bounds
+    keep_players_in_bounds(players)
+
+def handle_ball_collision(state, grid=None):
+    """Handle ball collision with players and walls, return the team that touched the ball.
+
+    ``grid`` is an optional SpatialHash of ``state.players`` built this tick:
+    with it only the players around the ball are tested, with the same result
+    as testing every player in order.
+    """
+    ball = state.ball
     last_touch = None
-    
+
     # Bounce off walls with friction
-    if ball.top <= FIELD_Y:
-        ball.top = FIELD_Y
-        ball_vel[1] = abs(ball_vel[1]) * FRICTION
-    elif ball.bottom >= FIELD_Y + FIELD_HEIGHT:
-        ball.bottom = FIELD_Y + FIELD_HEIGHT
-        ball_vel[1] = -abs(ball_vel[1]) * FRICTION
-        
-    if ball.left <= FIELD_X:
-        ball.left = FIELD_X
-        ball_vel[0] = abs(ball_vel[0]) * FRICTION
-    elif ball.right >= FIELD_X + FIELD_WIDTH:
-        ball.right = FIELD_X + FIELD_WIDTH
-        ball_vel[0] = -abs(ball_vel[0]) * FRICTION
+    if ball.y - BALL_RADIUS <= FIELD_Y:
+        ball.y = FIELD_Y + BALL_RADIUS
+        ball.vy = abs(ball.vy) * FRICTION
+    elif ball.y + BALL_RADIUS >= FIELD_Y + FIELD_HEIGHT:
+        ball.y = FIELD_Y + FIELD_HEIGHT - BALL_RADIUS
+        ball.vy = -abs(ball.vy) * FRICTION
+
+    if ball.x - BALL_RADIUS <= FIELD_X:
+        ball.x = FIELD_X + BALL_RADIUS
+        ball.vx = abs(ball.vx) * FRICTION
+    elif ball.x + BALL_RADIUS >= FIELD_X + FIELD_WIDTH:
+        ball.x = FIELD_X + FIELD_WIDTH - BALL_RADIUS
+        ball.vx = -abs(ball.vx) * FRICTION
 
     # Collision with players - improved physics
-    for i, player in enumerate(blue_team + red_team):
-        if player.colliderect(ball):
+    blue_team = state.blue_team
+    players = state.players
+    reach = PLAYER_RADIUS + BALL_RADIUS
+
+    def nearby(after):
+        """Players after index ``after`` that may touch the ball where it is now"""
+        if grid is None:
+            return range(after + 1, len(players))
+        return [i for i in grid.query(ball.x, ball.y, reach) if i > after]
+
+    candidates = range(len(players)) if grid is None else grid.query(ball.x, ball.y, reach)
+    position = 0
+    while position < len(candidates):
+        i = candidates[position]
+        position += 1
+        player = players[i]
+        if player.overlaps(ball):
             # Track which team last touched the ball
             last_touch = "blue" if i < len(blue_team) else "red"
-            
-            # Red team passing logic
-            if i >= len(blue_team):  # red player
-                red_index = i - len(blue_team)
-                if red_index == 0 and len(red_team) > 1:  # striker has ball
-                    midfielder = red_team[1]
-                    # Check if midfielder is in good position to pass (ahead and not too far in y)
-                    if midfielder.centerx > ball.centerx + 50 and abs(midfielder.centery - ball.centery) < 100:
-                        # Pass to midfielder
-                        dx = midfielder.centerx - ball.centerx
-                        dy = midfielder.centery - ball.centery
-                        dist = math.sqrt(dx*dx + dy*dy)
-                        if dist > 0:
-                            dx /= dist
-                            dy /= dist
-                            ball_vel[0] = dx * BALL_SPEED * 1.2
-                            ball_vel[1] = dy * BALL_SPEED * 1.2
-                            print("Red team pass!")
-                            continue  # Skip normal collision
-            
-            # Normal collision
-            # Calculate direction from player to ball
-            dx = ball.centerx - player.centerx
-            dy = ball.centery - player.centery
-            distance = max(1, math.sqrt(dx*dx + dy*dy))
-            
-            # Normalize direction
-            dx /= distance
-            dy /= distance
-            
-            # Apply force based on direction
-            force = 1.5
-            ball_vel[0] = dx * BALL_SPEED * force
-            ball_vel[1] = dy * BALL_SPEED * force
-            
-            # Move ball outside player to prevent sticking
-            overlap = PLAYER_RADIUS + BALL_RADIUS - distance
-            if overlap > 0:
-                ball.x += dx * overlap
-                ball.y += dy * overlap
-    
+            if touch_ball(state, i) and grid is not None:
+                # The ball moved: look again around it for the players still to test
+                candidates = nearby(i)
+                position = 0
+
     return last_touch
 
+def touch_ball(state, i):
+    """Player ``i`` of ``state.players`` touches the ball: the red striker may pass, anyone else kicks.
+
+    The striker passes as the red AI planned (state.red_pass); when red has
+    no AI plan the position of the midfielder is checked on the spot.
+    Returns True when the ball was also pushed clear of the player (it moved).
+    """
+    ball = state.ball
+    blue_team, red_team = state.blue_team, state.red_team
+    player = state.players[i]
+
+    # Red team passing logic
+    if i >= len(blue_team):  # red player
+        red_index = i - len(blue_team)
+        if red_index == 0 and len(red_team) > 1:  # striker has ball
+            midfielder = red_team[1]
+            passes = state.red_pass
+            if passes is None:
+                # Check if midfielder is in good position to pass (ahead and not too far in y)
+                passes = midfielder.x > ball.x + 50 and abs(midfielder.y - ball.y) < 100
+            if passes:
+                # Pass to midfielder
+                dx = midfielder.x - ball.x
+                dy = midfielder.y - ball.y
+                dist = math.sqrt(dx*dx + dy*dy)
+                if dist > 0:
+                    dx /= dist
+                    dy /= dist
+                    ball.vx = dx * BALL_SPEED * 1.2
+                    ball.vy = dy * BALL_SPEED * 1.2
+                    print("Red team pass!")
+                    return False  # Skip normal collision
+
+    # Normal collision
+    # Calculate direction from player to ball
+    dx = ball.x - player.x
+    dy = ball.y - player.y
+    distance = max(1, math.sqrt(dx*dx + dy*dy))
+
+    # Normalize direction
+    dx /= distance
+    dy /= distance
+
+    # Apply force based on direction
+    force = 1.5
+    ball.vx = dx * BALL_SPEED * force
+    ball.vy = dy * BALL_SPEED * force
+
+    # Move ball outside player to prevent sticking
+    overlap = PLAYER_RADIUS + BALL_RADIUS - distance
+    if overlap > 0:
+        ball.x += dx * overlap
+        ball.y += dy * overlap
+        return True
+    return False
+
+def separate_players(state, grid=None):
+    """Push touching players apart, return how many pairs were touching.
+
+    Solves every contact at once with collision.separate_circles (batched
+    NumPy) and keeps everyone inside the field; below
+    BATCHED_SEPARATION_MIN_PLAYERS players the plain Python solver is used,
+    as NumPy's per-call overhead outweighs the work. ``grid`` is an optional
+    SpatialHash of ``state.players``: with it only players in neighbouring
+    cells are paired instead of every pair. Two players both on the ball may
+    overlap, so a ball trapped between them stays playable.
+    """
+    players = state.players
+    ball = state.ball
+    reach = PLAYER_RADIUS + BALL_RADIUS
+    if len(players) < BATCHED_SEPARATION_MIN_PLAYERS:
+        on_ball = [abs(p.x - ball.x) < reach and abs(p.y - ball.y) < reach for p in players]
+        pairs = all_pairs(len(players))
+        if any(on_ball):
+            pairs = [(i, j) for i, j in pairs if not (on_ball[i] and on_ball[j])]
+        return separate_bodies(players, pairs, low=PLAYER_MIN, high=PLAYER_MAX)
+
+    if grid is None:
+        first, second = all_pair_indices(len(players))
+    else:
+        pairs = grid.near_pairs()
+        if not pairs:
+            return 0
+        first, second = np.array(pairs, dtype=np.intp).T
+    positions = np.array([(p.x, p.y) for p in players], dtype=np.float64)
+    on_ball = (np.abs(positions[:, 0] - ball.x) < reach) & (np.abs(positions[:, 1] - ball.y) < reach)
+    skip = on_ball[first] & on_ball[second] if on_ball.any() else None
+    contacts = separate_circles(positions, first, second, low=PLAYER_MIN, high=PLAYER_MAX, skip=skip)
+    if contacts:
+        for player, (x, y) in zip(players, positions.tolist()):
+            player.x = x
+            player.y = y
+    return contacts
+
+def advance_ball(state, ticks=1, grid=None):
+    """Move the ball ``ticks`` ticks with continuous collision, return the team that touched it.
+
+    Between contacts the ball travels in a straight line, its velocity added
+    and then multiplied by FRICTION every tick (in closed form, which also
+    covers fractions of a tick). It stops where its edge first reaches a
+    border line, exactly touching it, so the rules see it there: a goal is
+    decided by where it crossed the goal line, however fast it was. It is kicked by the first player circle
+    (PLAYER_RADIUS + BALL_RADIUS) it runs into and carries on for the rest
+    of the step. Nothing is passed through, so one step may cover several
+    ticks. handle_ball_collision then bounces the ball off the border and
+    resolves whatever still overlaps it, such as players that ran into it.
+
+    ``grid`` is an optional SpatialHash of ``state.players`` built this tick.
+    """
+    ball = state.ball
+    players = state.players
+    blue_count = len(state.blue_team)
+    reach = PLAYER_RADIUS + BALL_RADIUS
+    last_touch = None
+    remaining = ticks
+
+    for _ in range(SWEEP_MAX_CONTACTS):
+        speed = math.hypot(ball.vx, ball.vy)
+        if speed == 0:
+            break
+        decay = FRICTION ** remaining
+        length = speed * (1 - decay) / (1 - FRICTION)  # distance left to travel this step
+        ux, uy = ball.vx / speed, ball.vy / speed
+
+        # First border line the ball's edge reaches
+        hit, travel = None, length
+        if ux < 0 and (ball.x - BALL_RADIUS - FIELD_X) / -ux < travel:
+            hit, travel = "left", (ball.x - BALL_RADIUS - FIELD_X) / -ux
+        elif ux > 0 and (FIELD_X + FIELD_WIDTH - BALL_RADIUS - ball.x) / ux < travel:
+            hit, travel = "right", (FIELD_X + FIELD_WIDTH - BALL_RADIUS - ball.x) / ux
+        if uy < 0 and (ball.y - BALL_RADIUS - FIELD_Y) / -uy < travel:
+            hit, travel = "top", (ball.y - BALL_RADIUS - FIELD_Y) / -uy
+        elif uy > 0 and (FIELD_Y + FIELD_HEIGHT - BALL_RADIUS - ball.y) / uy < travel:
+            hit, travel = "bottom", (FIELD_Y + FIELD_HEIGHT - BALL_RADIUS - ball.y) / uy
+        travel = max(travel, 0.0)
+
+        # First player circle on the way (one the ball already overlaps counts if it moves further in)
+        if grid is None:
+            candidates = range(len(players))
+        else:
+            half_x, half_y = ux * travel / 2, uy * travel / 2
+            candidates = grid.query(ball.x + half_x, ball.y + half_y, max(abs(half_x), abs(half_y)) + reach)
+        for i in candidates:
+            player = players[i]
+            mx, my = ball.x - player.x, ball.y - player.y
+            approach = mx * ux + my * uy
+            if approach >= 0:
+                continue  # moving away from this player
+            gap = mx * mx + my * my - reach * reach
+            if gap <= 0:
+                contact = 0.0
+            else:
+                disc = approach * approach - gap
+                if disc < 0:
+                    continue  # passes by
+                contact = -approach - math.sqrt(disc)
+            if contact < travel:
+                hit, travel = i, contact
+
+        ball.x += ux * travel
+        ball.y += uy * travel
+        if hit is None:
+            ball.vx *= decay
+            ball.vy *= decay
+            break
+
+        # Slow down for the distance covered (speed drops linearly with distance)
+        slowed = max(speed - travel * (1 - FRICTION), 0.0)
+        if slowed > 0:
+            remaining -= math.log(slowed / speed) / math.log(FRICTION)
+        ball.vx *= slowed / speed
+        ball.vy *= slowed / speed
+        if isinstance(hit, str):
+            # Exactly touching the line, for handle_ball_collision and the rules
+            if hit == "left":
+                ball.x = FIELD_X + BALL_RADIUS
+            elif hit == "right":
+                ball.x = FIELD_X + FIELD_WIDTH - BALL_RADIUS
+            elif hit == "top":
+                ball.y = FIELD_Y + BALL_RADIUS
+            else:
+                ball.y = FIELD_Y + FIELD_HEIGHT - BALL_RADIUS
+            break
+        last_touch = "blue" if hit < blue_count else "red"
+        touch_ball(state, hit)
+        if remaining <= 0:
+            break
+
+    return handle_ball_collision(state, grid) or last_touch
+
 def keep_players_in_bounds(players):
     """Keep players within field bounds"""
+    min_x, max_x = FIELD_X + PLAYER_RADIUS, FIELD_X + FIELD_WIDTH - PLAYER_RADIUS
+    min_y, max_y = FIELD_Y + PLAYER_RADIUS, FIELD_Y + FIELD_HEIGHT - PLAYER_RADIUS
     for player in players:
-        if player.left < FIELD_X:
-            player.left = FIELD_X
-        if player.right > FIELD_X + FIELD_WIDTH:
-            player.right = FIELD_X + FIELD_WIDTH
-        if player.top < FIELD_Y:
-            player.top = FIELD_Y
-        if player.bottom > FIELD_Y + FIELD_HEIGHT:
-            player.bottom = FIELD_Y + FIELD_HEIGHT
-
-def handle_player_input(keys, current_mode, blue_team, red_team):
-    """Handle player input based on game mode"""
-    if current_mode == "man_vs_man":
-        # Manual control for blue players
-        if keys[pygame.K_w]: blue_team[0].y -= PLAYER_SPEED
-        if keys[pygame.K_s]: blue_team[0].y += PLAYER_SPEED
-        if keys[pygame.K_a]: blue_team[0].x -= PLAYER_SPEED
-        if keys[pygame.K_d]: blue_team[0].x += PLAYER_SPEED
-        
-        # Control for blue player 2
-        if keys[pygame.K_UP]: blue_team[1].y -= PLAYER_SPEED
-        if keys[pygame.K_DOWN]: blue_team[1].y += PLAYER_SPEED
-        if keys[pygame.K_LEFT]: blue_team[1].x -= PLAYER_SPEED
-        if keys[pygame.K_RIGHT]: blue_team[1].x += PLAYER_SPEED
-        
-        # Manual control for red players
-        if keys[pygame.K_i]: red_team[0].y -= PLAYER_SPEED
-        if keys[pygame.K_k]: red_team[0].y += PLAYER_SPEED
-        if keys[pygame.K_j]: red_team[0].x -= PLAYER_SPEED
-        if keys[pygame.K_l]: red_team[0].x += PLAYER_SPEED
-        
-        if keys[pygame.K_u]: red_team[1].y -= PLAYER_SPEED
-        if keys[pygame.K_o]: red_team[1].y += PLAYER_SPEED
-        if keys[pygame.K_y]: red_team[1].x -= PLAYER_SPEED
-        if keys[pygame.K_p]: red_team[1].x += PLAYER_SPEED
-        
-    elif current_mode == "bot_vs_man":
-        # Manual control for blue players
-        if keys[pygame.K_w]: blue_team[0].y -= PLAYER_SPEED
-        if keys[pygame.K_s]: blue_team[0].y += PLAYER_SPEED
-        if keys[pygame.K_a]: blue_team[0].x -= PLAYER_SPEED
-        if keys[pygame.K_d]: blue_team[0].x += PLAYER_SPEED
-        
-        # Control for second blue player with arrow keys
-        if keys[pygame.K_UP]: blue_team[1].y -= PLAYER_SPEED
-        if keys[pygame.K_DOWN]: blue_team[1].y += PLAYER_SPEED
-        if keys[pygame.K_LEFT]: blue_team[1].x -= PLAYER_SPEED
-        if keys[pygame.K_RIGHT]: blue_team[1].x += PLAYER_SPEED
\ No newline at end of file
+        if player.x < min_x:
+            player.x = min_x
+        elif player.x > max_x:
+            player.x = max_x
+        if player.y < min_y:
+            player.y = min_y
+        elif player.y > max_y:
+            player.y = max_y
+
+def read_input_mask(keys):
+    """Pack the held control keys (a pygame key state) into one int, see CONTROL_KEYS"""
+    mask = 0
+    for bit, key in enumerate(CONTROL_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+def handle_player_input(inputs, state):
+    """Handle player input based on game mode (``inputs`` is a read_input_mask() bitmask)"""
+    if state.mode == "man_vs_man":
+        controls = ((state.blue_team, BLUE_CONTROLS, 0), (state.red_team, RED_CONTROLS, len(BLUE_CONTROLS)))
+    elif state.mode == "bot_vs_man":
+        controls = ((state.blue_team, BLUE_CONTROLS, 0),)
+    else:
+        return
+
+    for team, team_controls, first_bit in controls:
+        for bit, (key, index, dx, dy) in enumerate(team_controls, first_bit):
+            if inputs >> bit & 1 and index < len(team):
+                team[index].x += dx
+                team[index].y += dy
@@ -0,0 +1,104 @@
+"""
+Renderer Module
+Dirty-rectangle frame presentation: only screen regions that changed are pushed
+to the display with pygame.display.update(rects) instead of a full flip.
+"""
+
+import pygame
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+
+class DirtyRectRenderer:
+    """Tracks what was drawn each frame and pushes only the regions that changed.
+
+    Usage per frame:
+        renderer.begin_frame(background, background_key)
+        renderer.add_dynamic(draw_players_and_ball(...))   # moving sprites, HUD widgets
+        renderer.add_static(draw_controls_help(...))        # drawn every frame, never changes
+        renderer.end_frame()
+
+    begin_frame restores the background under everything drawn last frame, so
+    every widget is redrawn over clean pixels. Only dynamic regions (last frame's
+    and this frame's) are pushed; static widgets repaint identical pixels.
+    When the background itself changes (audience reactions), only the areas it
+    reports as changed are repainted and pushed.
+    Call invalidate() after anything that draws outside this pipeline (mode
+    selection, pause and results screens) to force the next frame to be a full redraw.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.full_redraw = True
+        self.background_key = None
+        self.drawn_rects = []        # everything drawn in the current frame
+        self.dynamic_rects = []      # regions that must be pushed in the current frame
+        self.prev_drawn_rects = []
+        self.prev_dynamic_rects = []
+
+        # Pixels pushed to the display, for measuring the savings
+        self.pixels_pushed = 0
+        self.total_pixels_pushed = 0
+        self.frames = 0
+        self.full_frames = 0
+
+    def invalidate(self):
+        """Force the next frame to redraw and push the whole screen"""
+        self.full_redraw = True
+
+    def begin_frame(self, background, background_key=None, changed_areas=None):
+        """Restore the background where the last frame drew, or everywhere after a change.
+
+        ``changed_areas`` lists the regions that may differ when ``background_key``
+        changes; without it any background change forces a full redraw.
+        """
+        self.drawn_rects = []
+        self.dynamic_rects = []
+
+        if background_key != self.background_key:
+            self.background_key = background_key
+            if changed_areas is None:
+                self.full_redraw = True
+            elif not self.full_redraw:
+                for rect in changed_areas:
+                    self.screen.blit(background, rect, rect)
+                self.dynamic_rects.extend(changed_areas)
+
+        if self.full_redraw:
+            self.screen.blit(background, (0, 0))
+        else:
+            for rect in self.prev_drawn_rects:
+                self.screen.blit(background, rect, rect)
+
+    def add_dynamic(self, rects):
+        """Register regions whose content can change from frame to frame"""
+        self.drawn_rects.extend(rects)
+        self.dynamic_rects.extend(rects)
+
+    def add_static(self, rects):
+        """Register regions redrawn every frame with identical content"""
+        self.drawn_rects.extend(rects)
+
+    def end_frame(self):
+        """Push the changed regions (or the whole screen) to the display"""
+        if self.full_redraw:
+            pygame.display.flip()
+            self.pixels_pushed = WIDTH * HEIGHT
+            self.full_frames += 1
+            self.full_redraw = False
+        else:
+            update_rects = self.prev_dynamic_rects + self.dynamic_rects
+            pygame.display.update(update_rects)
+            self.pixels_pushed = sum(rect.width * rect.height for rect in update_rects)
+
+        self.total_pixels_pushed += self.pixels_pushed
+        self.frames += 1
+        self.prev_drawn_rects = self.drawn_rects
+        self.prev_dynamic_rects = self.dynamic_rects
+
+    def average_pixels_pushed(self):
+        """Mean pixels pushed per frame since the renderer was created"""
+        return self.total_pixels_pushed / self.frames if self.frames else 0.0
@@ -0,0 +1,181 @@
+"""
+Replay Module
+Re-simulates recorded matches from their seed and human input log.
+A replay file holds only the seed, the input-mask changes and the resets
+(a few hundred bytes); any telemetry can be regenerated from it on demand.
+"""
+
+import bisect
+import contextlib
+import json
+from collections import Counter
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+from headless import Match, REPLAY_VERSION
+
+KEYFRAME_INTERVAL = FPS  # ticks between full state snapshots when seeking a replay
+
+def load_replay(path):
+    """Read a replay file written by Match.close().
+
+    Raises ValueError unless it was recorded by this version of the
+    simulation: an older replay would silently play out differently.
+    """
+    with open(path) as f:
+        replay = json.load(f)
+    if replay.get("format") != "robosoccer-replay":
+        raise ValueError(f"{path} is not a replay file")
+    if replay.get("version") != REPLAY_VERSION:
+        raise ValueError(f"{path} was recorded by replay version {replay.get('version')}; "
+                         f"this game plays version {REPLAY_VERSION} and would not reproduce it")
+    return replay
+
+def save_replay(replay, path):
+    """Write a replay (as returned by Match.replay()) to ``path``"""
+    with open(path, "w") as f:
+        json.dump(replay, f)
+
+def replay_inputs(replay):
+    """Yield (resets, inputs) for every recorded tick, in order.
+
+    ``resets`` is how many times the match was reset (R key) before that tick.
+    """
+    changes = iter(replay["inputs"])
+    next_change = next(changes, None)
+    resets = Counter(replay["resets"])
+    inputs = 0
+    for tick in range(replay["ticks"]):
+        while next_change is not None and next_change[0] == tick:
+            inputs = next_change[1]
+            next_change = next(changes, None)
+        yield resets[tick], inputs
+
+def replay_match(replay, data=None, archive_path=None, quiet=True):
+    """Re-simulate a replay headlessly at full speed and return the Match.
+
+    ``data`` and ``archive_path`` are passed to Match, so the replay can
+    regenerate telemetry, reports or a full match archive. The returned
+    match's state is bit-identical to the recorded one (see verify_replay).
+    """
+    match = Match(replay["mode"], duration_ticks=replay["duration_ticks"], data=data,
+                  record_step_times=False, archive_path=archive_path, seed=replay["seed"],
+                  team_size=replay.get("team_size", 2),
+                  ticks_per_step=replay.get("ticks_per_step", 1),
+                  ai_plan_interval=replay.get("ai_plan_interval", AI_PLAN_INTERVAL))
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+            for resets, inputs in replay_inputs(replay):
+                for _ in range(resets):
+                    match.reset()
+                match.step(inputs)
+            # Resets after the last tick
+            for _ in range(replay["resets"].count(replay["ticks"])):
+                match.reset()
+    match.close()
+    return match
+
+def verify_replay(replay, match):
+    """True when ``match`` ended in exactly the recorded state"""
+    return match.state.digest() == replay["final"]["digest"]
+
+class ReplayTimeline:
+    """Seekable playback of a replay, for the replay viewer.
+
+    A full state snapshot (keyframe) is kept every ``keyframe_interval``
+    ticks; between keyframes only the deltas are stored, i.e. the recorded
+    input changes and resets. seek() restores the nearest keyframe at or
+    before the target and re-simulates from there, so reaching any tick of
+    any length match costs at most ``keyframe_interval`` steps. Keyframes
+    are taken whenever playback first passes them, and build_index() takes
+    the rest a few at a time (e.g. once per rendered frame), so loading a
+    replay is instant and scrubbing soon is instant everywhere.
+
+    ``tick`` is the number of steps simulated (it keeps counting across
+    resets, unlike the match clock) and runs from 0 to ``ticks``.
+    """
+
+    def __init__(self, replay, keyframe_interval=KEYFRAME_INTERVAL):
+        self.replay = replay
+        self.ticks = replay["ticks"]
+        self.keyframe_interval = keyframe_interval
+        self._change_ticks = [tick for tick, inputs in replay["inputs"]]
+        self._resets = Counter(replay["resets"])
+
+        self.match = self._new_match()
+        self.tick = 0
+        self._ended = False  # resets recorded after the last tick applied
+        self.keyframes = [self.match.state.snapshot()]
+        self._indexer = None  # second match that runs ahead taking keyframes
+
+    def _new_match(self):
+        replay = self.replay
+        return Match(replay["mode"], duration_ticks=replay["duration_ticks"],
+                     record_step_times=False, seed=replay["seed"], team_size=replay.get("team_size", 2),
+                     ticks_per_step=replay.get("ticks_per_step", 1),
+                     ai_plan_interval=replay.get("ai_plan_interval", AI_PLAN_INTERVAL))
+
+    @property
+    def state(self):
+        """GameState at the current tick (only read it, the timeline owns it)"""
+        return self.match.state
+
+    @property
+    def indexed(self):
+        """True once every keyframe of the replay has been taken"""
+        return len(self.keyframes) > self.ticks // self.keyframe_interval
+
+    def inputs_at(self, tick):
+        """Human input mask recorded for ``tick``"""
+        change = bisect.bisect_right(self._change_ticks, tick) - 1
+        return self.replay["inputs"][change][1] if change >= 0 else 0
+
+    def seek(self, tick):
+        """Move to ``tick`` (clamped to the replay) and return the tick reached"""
+        tick = max(0, min(int(tick), self.ticks))
+        keyframe = min(tick // self.keyframe_interval, len(self.keyframes) - 1)
+        if tick < self.tick or keyframe > self.tick // self.keyframe_interval:
+            self.match.restore(self.keyframes[keyframe].snapshot(), keyframe * self.keyframe_interval)
+            self.tick = keyframe * self.keyframe_interval
+            self._ended = False
+
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                while self.tick < tick:
+                    self._advance(self.match, self.tick)
+                    self.tick += 1
+                    self._ended = False
+                if self.tick == self.ticks and not self._ended:
+                    # Resets after the last tick, as replay_match applies them
+                    for _ in range(self._resets[self.ticks]):
+                        self.match.reset()
+                    self._ended = True
+        return self.tick
+
+    def build_index(self, max_ticks):
+        """Simulate up to ``max_ticks`` ticks beyond the furthest keyframe, taking keyframes"""
+        if self.indexed:
+            return
+        furthest = (len(self.keyframes) - 1) * self.keyframe_interval
+        if self._indexer is None:
+            self._indexer = self._new_match()
+        if self._indexer.ticks_played < furthest:
+            # Playback got further; continue from its keyframe
+            self._indexer.restore(self.keyframes[-1].snapshot(), furthest)
+
+        start = self._indexer.ticks_played
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                for tick in range(start, min(start + max_ticks, self.ticks)):
+                    self._advance(self._indexer, tick)
+
+    def _advance(self, match, tick):
+        """Simulate recorded tick ``tick`` on ``match``, taking the keyframe after it when due"""
+        for _ in range(self._resets[tick]):
+            match.reset()
+        match.step(self.inputs_at(tick))
+        if tick + 1 == len(self.keyframes) * self.keyframe_interval:
+            self.keyframes.append(match.state.snapshot())
@@ -0,0 +1,113 @@
+"""
+Replay Viewer Module
+Plays recorded matches back in the game window: play/pause, 0.25x-16x speed
+and scrubbing to any tick, using the keyframe index of replay.ReplayTimeline.
+"""
+
+import glob
+import pygame
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_config import *
+from graphics import REPLAY_BAR, replay_bar_tick, draw_replay_viewer, draw_replay_message
+from replay import load_replay, ReplayTimeline
+
+# Replay ticks shown per rendered frame
+REPLAY_SPEEDS = [0.25, 0.5, 1, 2, 4, 8, 16]
+SKIP_TICKS = 5 * FPS  # LEFT / RIGHT jump
+INDEX_TICKS_PER_FRAME = 2 * FPS  # keyframe indexing done alongside each rendered frame
+
+def find_replays(directory):
+    """Replay files in ``directory``, newest first"""
+    return sorted(glob.glob(os.path.join(directory, "*.replay.json")), key=os.path.getmtime, reverse=True)
+
+def open_replay(path):
+    """Load a replay file, return (seekable timeline, title); the timeline is None if unreadable"""
+    try:
+        replay = load_replay(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Cannot open replay {path}: {e}")
+        return None, ""
+    title = os.path.basename(path)[:-len(".replay.json")]
+    return ReplayTimeline(replay), title
+
+def run_replay_viewer(directory):
+    """Watch the recorded matches in ``directory`` until ESC.
+
+    Returns False when the window was closed, True to go back to mode selection.
+    """
+    paths = find_replays(directory)
+    index = 0
+    timeline, title = open_replay(paths[index]) if paths else (None, "")
+    position = 0.0  # fractional tick, so slow speeds advance every few frames
+    playing = True
+    speed_index = REPLAY_SPEEDS.index(1)
+    scrubbing = False
+    print(f"🎞️ Replay viewer: {len(paths)} recorded matches in {directory}")
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return True
+                elif event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET) and paths:
+                    # Previous (older) / next (newer) recording
+                    index = (index + (1 if event.key == pygame.K_LEFTBRACKET else -1)) % len(paths)
+                    timeline, title = open_replay(paths[index])
+                    position = 0.0
+                    playing = True
+                elif timeline is None:
+                    continue
+                elif event.key == pygame.K_SPACE:
+                    if not playing and position >= timeline.ticks:
+                        position = 0.0  # play again from the start
+                    playing = not playing
+                elif event.key == pygame.K_UP:
+                    speed_index = min(speed_index + 1, len(REPLAY_SPEEDS) - 1)
+                elif event.key == pygame.K_DOWN:
+                    speed_index = max(speed_index - 1, 0)
+                elif event.key == pygame.K_LEFT:
+                    position -= SKIP_TICKS
+                elif event.key == pygame.K_RIGHT:
+                    position += SKIP_TICKS
+                elif event.key in (pygame.K_COMMA, pygame.K_PERIOD):
+                    # Single-step one tick
+                    playing = False
+                    position = int(position) + (1 if event.key == pygame.K_PERIOD else -1)
+                elif event.key == pygame.K_HOME:
+                    position = 0.0
+                elif event.key == pygame.K_END:
+                    position = timeline.ticks
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and timeline is not None:
+                if REPLAY_BAR.inflate(0, 20).collidepoint(event.pos):
+                    scrubbing = True
+                    position = replay_bar_tick(event.pos[0], timeline.ticks)
+            elif event.type == pygame.MOUSEMOTION and scrubbing:
+                position = replay_bar_tick(event.pos[0], timeline.ticks)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                scrubbing = False
+
+        if timeline is None:
+            draw_replay_message(screen, "No recorded matches yet - play a match first" if not paths
+                                else "This replay cannot be opened - press [ or ] for another")
+            pygame.display.flip()
+            clock.tick(60)
+            continue
+
+        speed = REPLAY_SPEEDS[speed_index]
+        if playing and not scrubbing:
+            position += speed
+        position = max(0.0, min(position, timeline.ticks))
+        if position >= timeline.ticks:
+            playing = False
+        timeline.seek(position)
+        timeline.build_index(INDEX_TICKS_PER_FRAME)
+
+        draw_replay_viewer(screen, timeline, title, playing, speed)
+        pygame.display.flip()
+        clock.tick(60)
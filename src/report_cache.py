@@ -0,0 +1,98 @@
+"""
+Report Cache Module
+Performance report surfaces rendered on the export worker, memoized by data version.
+"""
+
+from collections import OrderedDict
+import pygame
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from data_analysis import render_performance_report, performance_report_surface
+
+class ReportCache:
+    """Renders matplotlib performance reports off the game loop and keeps the results.
+
+    request() hands the figure to the export worker (a separate process) and
+    returns at once; get() returns the surface once the image has come back,
+    and None while it is still being drawn (show a placeholder meanwhile).
+    Reports are keyed by data version (data_analysis.data_version), so asking
+    again for unchanged data, e.g. reopening the results screen, neither
+    redraws nor re-renders anything. The least recently used report is evicted
+    once ``maxsize`` are cached. With ``fit`` (width, height) reports are
+    scaled down once, when they arrive, to fit that size.
+
+    When the worker's backlog is full the request is kept and submitted on
+    a later call, once the worker has room; it counts as pending meanwhile.
+    """
+
+    def __init__(self, worker, maxsize=4, fit=None):
+        self.worker = worker
+        self.maxsize = maxsize
+        self.fit = fit
+        self._surfaces = OrderedDict()  # version -> surface (None when there was nothing to plot)
+        self._pending = {}              # version -> Future of the rendered image
+        self._deferred = {}             # version -> render arguments waiting for room on the worker
+        self.hits = 0
+        self.misses = 0
+
+    def request(self, version, time_data, player_movement_data, analytics=None):
+        """Start rendering the report for ``version`` unless it is cached or already being rendered"""
+        if version in self._surfaces or version in self._pending or version in self._deferred:
+            self.hits += 1
+            return
+        self.misses += 1
+        self._deferred[version] = (time_data, player_movement_data, analytics)
+        self._submit_deferred()
+
+    def _submit_deferred(self):
+        """Hand waiting requests to the worker while its backlog has room"""
+        for version, args in list(self._deferred.items()):
+            if self.worker.pending() >= self.worker.max_pending:
+                return
+            future = self.worker.submit("Performance report", render_performance_report, *args, notify=False)
+            if future is None:
+                return
+            del self._deferred[version]
+            self._pending[version] = future
+
+    def pending(self, version):
+        """True while the report for ``version`` is being rendered or waiting for the worker"""
+        self._collect()
+        return version in self._pending or version in self._deferred
+
+    def get(self, version):
+        """The report surface for ``version``, or None if not rendered (yet)"""
+        self._collect()
+        if version not in self._surfaces:
+            return None
+        self._surfaces.move_to_end(version)
+        return self._surfaces[version]
+
+    def _collect(self):
+        """Turn finished renders into surfaces (failures are reported by the worker)"""
+        for version, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[version]
+            if future.exception() is not None:
+                continue
+            surface = performance_report_surface(future.result())
+            if surface is not None:
+                surface = self._fit(surface.convert())
+            self._surfaces[version] = surface
+            if len(self._surfaces) > self.maxsize:
+                self._surfaces.popitem(last=False)
+        self._submit_deferred()
+
+    def _fit(self, surface):
+        """Scale ``surface`` down to fit ``self.fit``, keeping its aspect ratio"""
+        if self.fit is None:
+            return surface
+        scale = min(self.fit[0] / surface.get_width(), self.fit[1] / surface.get_height())
+        if scale >= 1:
+            return surface
+        size = (round(surface.get_width() * scale), round(surface.get_height() * scale))
+        return pygame.transform.smoothscale(surface, size)
@@ -0,0 +1,113 @@
+"""
+Spatial Hash Module
+Uniform-grid broadphase over the field for ball-player and player-player proximity queries.
+"""
+
+import math
+import sys
+import os
+
+# Import from the same directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from game_constants import *
+
+class SpatialHash:
+    """Uniform grid of square cells over the field, bucketing bodies by their center.
+
+    rebuild() files every body under its cell in O(n). query() returns the
+    bodies whose centers lie in the cells overlapping a square around a point,
+    and near_pairs() every pair of bodies in the same or neighbouring cells,
+    so callers only run their exact overlap test on nearby bodies instead of
+    on all of them. With ``cell_size`` at least the interaction distance no
+    interacting body or pair is ever missed. Bodies outside the grid are
+    filed under the nearest edge cell, which keeps that guarantee.
+
+    Bodies are identified by their index in the list given to rebuild(), and
+    results come sorted by index, so callers can keep processing bodies in
+    their usual order (the simulation stays deterministic).
+
+    A grid rebuilt with ``slack`` stays valid while no body has moved more
+    than ``slack`` along either axis since: queries widen their reach by it,
+    so the grid need not be rebuilt every tick. near_pairs() then needs
+    ``cell_size`` of at least the interaction distance plus twice the slack.
+    """
+
+    def __init__(self, cell_size, x=FIELD_X, y=FIELD_Y, width=FIELD_WIDTH, height=FIELD_HEIGHT):
+        self.cell_size = cell_size
+        self.x = x
+        self.y = y
+        self.columns = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.cells = [[] for _ in range(self.columns * self.rows)]  # row-major lists of body indices
+        self._occupied = []  # cells holding bodies, emptied by the next rebuild()
+        self.bodies = []
+        self.slack = 0.0
+
+    def _column(self, x):
+        column = int((x - self.x) // self.cell_size)
+        return 0 if column < 0 else self.columns - 1 if column >= self.columns else column
+
+    def _row(self, y):
+        row = int((y - self.y) // self.cell_size)
+        return 0 if row < 0 else self.rows - 1 if row >= self.rows else row
+
+    def rebuild(self, bodies, slack=0.0):
+        """File every body of ``bodies`` (objects with x and y) under its cell.
+
+        ``slack``: how far bodies may move (per axis) before the next rebuild.
+        """
+        cells = self.cells
+        for cell in self._occupied:
+            cells[cell].clear()
+        occupied = self._occupied = []
+        x0, y0, size = self.x, self.y, self.cell_size
+        last_column, last_row, columns = self.columns - 1, self.rows - 1, self.columns
+        for i, body in enumerate(bodies):
+            # Inlined _column / _row: this runs for every body every tick
+            column = int((body.x - x0) // size)
+            column = 0 if column < 0 else last_column if column > last_column else column
+            row = int((body.y - y0) // size)
+            row = 0 if row < 0 else last_row if row > last_row else row
+            members = cells[row * columns + column]
+            if not members:
+                occupied.append(row * columns + column)
+            members.append(i)
+        self.bodies = bodies
+        self.slack = slack
+
+    def query(self, x, y, reach):
+        """Sorted indices of the bodies that may lie within ``reach`` of (x, y) on either axis"""
+        cells, columns = self.cells, self.columns
+        reach += self.slack
+        first_column, last_column = self._column(x - reach), self._column(x + reach)
+        found = []
+        for row in range(self._row(y - reach), self._row(y + reach) + 1):
+            start = row * columns
+            for cell in range(start + first_column, start + last_column + 1):
+                found.extend(cells[cell])
+        found.sort()
+        return found
+
+    def near_pairs(self):
+        """Sorted (i, j) index pairs, i < j, of bodies in the same or neighbouring cells"""
+        cells, columns, rows = self.cells, self.columns, self.rows
+        pairs = []
+        for cell in self._occupied:
+            here = cells[cell]
+            row, column = divmod(cell, columns)
+            for a, i in enumerate(here):
+                for j in here[a + 1:]:
+                    pairs.append((i, j))
+            # Each neighbouring pair of cells once: east, and the three cells of the next row
+            first = cell - 1 if column > 0 else cell
+            last = cell + 1 if column + 1 < columns else cell
+            neighbours = cells[cell + 1] if last > cell else []
+            if row + 1 < rows:
+                for below in cells[first + columns:last + columns + 1]:
+                    if below:
+                        neighbours = neighbours + below
+            for j in neighbours:
+                for i in here:
+                    pairs.append((i, j) if i < j else (j, i))
+        pairs.sort()
+        return pairs
@@ -0,0 +1,134 @@
+"""
+Telemetry Module
+Preallocated columnar ring buffer for per-frame match telemetry.
+"""
+
+import numpy as np
+
+class TelemetryBuffer:
+    """Fixed-capacity ring buffer of per-frame telemetry stored as NumPy columns.
+
+    Every column is preallocated once; record() only writes scalars at the
+    write cursor, so no dicts, lists or tuples are built per frame. Each sample
+    is written twice (at ``cursor`` and ``cursor + capacity``), which keeps the
+    most recent ``len(buffer)`` samples contiguous and in chronological order:
+    the column properties return array views, never copies.
+
+    Columns: frame, time, player_x / player_y (one row per player, blue team
+    first), ball_x, ball_y, ball_vx, ball_vy.
+    """
+
+    def __init__(self, capacity=1000, team_size=2):
+        self.capacity = capacity
+        self.team_size = team_size
+        self.n_players = 2 * team_size
+        self.cursor = 0   # next slot to write, in [0, capacity)
+        self.count = 0    # number of valid samples, at most capacity
+        self.total = 0    # samples recorded since the last clear(), including overwritten ones
+
+        size = 2 * capacity
+        self._frame = np.zeros(size, dtype=np.int64)
+        self._time = np.zeros(size)
+        self._player_x = np.zeros((self.n_players, size))
+        self._player_y = np.zeros((self.n_players, size))
+        self._ball_x = np.zeros(size)
+        self._ball_y = np.zeros(size)
+        self._ball_vx = np.zeros(size)
+        self._ball_vy = np.zeros(size)
+
+        # One contiguous row per player, so record() indexes with plain ints
+        self._player_x_rows = list(self._player_x)
+        self._player_y_rows = list(self._player_y)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Forget all samples (the arrays are reused)"""
+        self.cursor = 0
+        self.count = 0
+        self.total = 0
+
+    def copy(self):
+        """Return an independent copy (for handing to a background worker)"""
+        copy = TelemetryBuffer.__new__(TelemetryBuffer)
+        copy.__setstate__({name: value.copy() if isinstance(value, np.ndarray) else value
+                           for name, value in self.__getstate__().items()})
+        return copy
+
+    def __getstate__(self):
+        # The per-player row views are rebuilt on unpickling instead of copied
+        state = dict(self.__dict__)
+        del state["_player_x_rows"], state["_player_y_rows"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._player_x_rows = list(self._player_x)
+        self._player_y_rows = list(self._player_y)
+
+    def record(self, state):
+        """Append one frame of the given GameState"""
+        i = self.cursor
+        j = i + self.capacity
+        ball = state.ball
+
+        self._frame[i] = self._frame[j] = state.frame_count
+        self._time[i] = self._time[j] = state.match_time
+        self._ball_x[i] = self._ball_x[j] = ball.x
+        self._ball_y[i] = self._ball_y[j] = ball.y
+        self._ball_vx[i] = self._ball_vx[j] = ball.vx
+        self._ball_vy[i] = self._ball_vy[j] = ball.vy
+
+        xs, ys = self._player_x_rows, self._player_y_rows
+        for k, p in enumerate(state.players):
+            xs[k][i] = xs[k][j] = p.x
+            ys[k][i] = ys[k][j] = p.y
+
+        self.cursor = i + 1 if i + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+        self.total += 1
+
+    def _window(self):
+        """Slice covering the valid samples, oldest first"""
+        start = (self.cursor - self.count) % self.capacity
+        return slice(start, start + self.count)
+
+    @property
+    def frame(self):
+        return self._frame[self._window()]
+
+    @property
+    def time(self):
+        return self._time[self._window()]
+
+    @property
+    def player_x(self):
+        """Player x positions, shape (n_players, len(self)), blue team first"""
+        return self._player_x[:, self._window()]
+
+    @property
+    def player_y(self):
+        """Player y positions, shape (n_players, len(self)), blue team first"""
+        return self._player_y[:, self._window()]
+
+    @property
+    def ball_x(self):
+        return self._ball_x[self._window()]
+
+    @property
+    def ball_y(self):
+        return self._ball_y[self._window()]
+
+    @property
+    def ball_vx(self):
+        return self._ball_vx[self._window()]
+
+    @property
+    def ball_vy(self):
+        return self._ball_vy[self._window()]
+
+    def team_rows(self, team):
+        """Rows of player_x / player_y belonging to ``team`` ("blue" or "red")"""
+        return slice(0, self.team_size) if team == "blue" else slice(self.team_size, self.n_players)
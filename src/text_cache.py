@@ -0,0 +1,53 @@
+"""
+Text Cache Module
+LRU-bounded cache of rendered text surfaces for HUD and overlay rendering.
+"""
+
+from collections import OrderedDict
+
+class TextCache:
+    """Caches font.render() results keyed by (font, text, color).
+
+    Most HUD strings (control hints, mode descriptions, labels) never change,
+    so rendering them once and reusing the surface avoids a font rasterization
+    per string per frame. The least recently used entry is evicted once
+    ``maxsize`` surfaces are cached.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Return the rendered surface for ``text``, rendering it only on a cache miss"""
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces and reset the counters"""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current cache size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._surfaces),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,24 @@
+"""Regression tests for the headless Match"""
+
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from headless import Match
+from match_archive import MatchArchive
+
+def test_step_after_finish_keeps_the_finished_archive(tmp_path):
+    path = str(tmp_path / "match.match")
+    match = Match(seed=1, archive_path=path, record_step_times=False)
+    for _ in range(10):
+        match.step()
+    match.finish()
+
+    # Closing the results screen goes back to stepping the same match
+    for _ in range(10):
+        match.step()
+    assert match.archive is None
+    assert match.ticks_played == 20
+    assert len(MatchArchive(path)) == 10